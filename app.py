@@ -10,12 +10,14 @@ This is the main entry point that handles navigation and page routing.
 """
 
 import streamlit as st
-import ppt_generator
-import chatbot
-import jiit_info
-import jiit_live
+import threading
 import time
 
+# Feature pages (chatbot, ppt_generator, jiit_info, jiit_live) are imported in
+# show_feature_page, when first routed to: between them they pull in faiss,
+# torch, LLM clients, reportlab, python-docx, sklearn, textblob and plotly,
+# none of which the homepage needs.
+
 # Configure Streamlit page settings
 st.set_page_config(
     page_title="JIIT Assistant",
@@ -674,16 +676,39 @@ particlesJS('particles-js', {
 # MAIN APPLICATION
 # ============================================================================
 
+@st.cache_resource(show_spinner=False)
+def start_chatbot_warmup():
+    """
+    Starts warming up the chatbot once per server process, in the background.
+    
+    The thread imports chatbot itself (and with it faiss, torch and the
+    embedding model), so the homepage renders without waiting, and the
+    chatbot is usually ready by the time anyone opens it.
+    """
+    def warm_up():
+        try:
+            import chatbot
+        except ImportError:
+            return  # The chatbot page reports it when opened
+        if chatbot.Config.WARMUP_ON_START:
+            chatbot.start_warmup()
+
+    thread = threading.Thread(target=warm_up, name="chatbot-warmup", daemon=True)
+    thread.start()
+    return thread
+
 def main():
     """
     Main application controller that handles routing and page rendering.
     
     This function:
+    - Starts the chatbot warm-up on the first run in this server process
     - Initializes session state variables for page navigation
     - Renders the main header and subtitle
-    - Loads the chatbot sidebar (available on all pages)
     - Routes to appropriate page based on session state
     """
+    start_chatbot_warmup()
+
     # Initialize session state variables for tracking current and previous pages
     if 'page' not in st.session_state:
         st.session_state.page = 'home'
@@ -696,13 +721,6 @@ def main():
     <p class="subtitle animated-content">Your Comprehensive Assistant for JIIT Projects and Information</p>
     """, unsafe_allow_html=True)
     
-    # Render chatbot sidebar on all pages for easy access
-    # Wrapped in try-except to prevent app crashes if sidebar fails
-    try:
-        chatbot.render_sidebar()
-    except Exception:
-        pass
-    
     # Handle smooth page transitions with a small delay
     if st.session_state.page != st.session_state.prev_page:
         st.session_state.prev_page = st.session_state.page
@@ -917,14 +935,18 @@ def show_feature_page():
     st.markdown('</div>', unsafe_allow_html=True)
     st.markdown("<hr>", unsafe_allow_html=True)
     
-    # Display feature pages
+    # Display feature pages, importing each one's module (and its heavy dependencies) on first use
     if st.session_state.page == 'ppt_generator':
+        import ppt_generator
         ppt_generator.show()
     elif st.session_state.page == 'chatbot':
+        import chatbot
         chatbot.show()
     elif st.session_state.page == 'jiit_info':
+        import jiit_info
         jiit_info.show()
     elif st.session_state.page == 'jiit_live':
+        import jiit_live
         jiit_live.main()
     
 # Enhanced JavaScript for smooth animations
@@ -0,0 +1,110 @@
+"""
+Vector Index Benchmark
+======================
+
+Compares the FAISS backends built by ``chatbot.create_vector_index`` (exact
+flat, HNSW and IVF-PQ) on synthetic clustered unit vectors shaped like
+sentence embeddings. Exact flat search provides the ground truth.
+
+For each backend and search setting the benchmark reports:
+
+- build time (training + adding all vectors)
+- serialized index size in MB
+- mean latency per query in ms (single-query searches, as in the chatbot)
+- recall@k against exact search
+
+HNSW is swept over ``efSearch`` and IVF-PQ over ``nprobe``.
+
+Usage:
+    python benchmarks/bench_ann.py
+    python benchmarks/bench_ann.py --vectors 500000 --queries 200 --ef 32 64 128 --nprobe 8 16 64
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chatbot  # noqa: E402
+
+np = chatbot.np
+faiss = chatbot.faiss
+
+
+def make_vectors(count: int, dim: int, clusters: int, seed: int = 0):
+    """Unit vectors scattered around random centroids (embeddings are far from uniform)."""
+    rng = np.random.default_rng(seed)
+    centroids = rng.standard_normal((clusters, dim), dtype=np.float32)
+    assignment = rng.integers(0, clusters, count)
+    vectors = centroids[assignment] + 0.6 * rng.standard_normal((count, dim), dtype=np.float32)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def build(kind: str, vectors):
+    class BenchConfig(chatbot.Config):
+        VECTOR_INDEX_TYPE = kind
+
+    start = time.perf_counter()
+    index, built_kind = chatbot.create_vector_index(BenchConfig, vectors)
+    index.add_with_ids(vectors, np.arange(len(vectors), dtype=np.int64))
+    build_time = time.perf_counter() - start
+    size_mb = faiss.serialize_index(index).nbytes / 1e6
+    return index, built_kind, build_time, size_mb
+
+
+def run_queries(index, queries, k: int, params=None):
+    ids = np.empty((len(queries), k), dtype=np.int64)
+    start = time.perf_counter()
+    for i in range(len(queries)):
+        _, ids[i:i + 1] = index.search(queries[i:i + 1], k, params=params)
+    latency_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    return ids, latency_ms
+
+
+def recall(found, truth) -> float:
+    return float(np.mean([len(set(f) & set(t)) / len(t) for f, t in zip(found.tolist(), truth.tolist())]))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384, help="embedding dimension (all-MiniLM-L6-v2: 384)")
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--k", type=int, default=60, help="neighbours per query (top_k * PASSAGE_OVERSAMPLE)")
+    parser.add_argument("--ef", type=int, nargs="+", default=[16, 32, 64, 128, 256])
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[4, 8, 16, 32, 64])
+    args = parser.parse_args()
+
+    vectors = make_vectors(args.vectors + args.queries, args.dim, args.clusters)
+    vectors, queries = vectors[:args.vectors], np.ascontiguousarray(vectors[args.vectors:])
+    print(f"{args.vectors} vectors x {args.dim} dims, {args.queries} queries, recall@{args.k}")
+    print(f"{'index':>8} {'setting':>12} {'build s':>8} {'MB':>8} {'ms/query':>9} {'recall':>7}")
+
+    flat, _, build_time, size_mb = build("flat", vectors)
+    truth, latency = run_queries(flat, queries, args.k)
+    print(f"{'flat':>8} {'exact':>12} {build_time:>8.2f} {size_mb:>8.1f} {latency:>9.3f} {1.0:>7.3f}")
+    del flat
+
+    hnsw, _, build_time, size_mb = build("hnsw", vectors)
+    for ef in args.ef:
+        found, latency = run_queries(hnsw, queries, args.k, faiss.SearchParametersHNSW(efSearch=max(ef, args.k)))
+        print(f"{'hnsw':>8} {f'ef={ef}':>12} {build_time:>8.2f} {size_mb:>8.1f} {latency:>9.3f} "
+              f"{recall(found, truth):>7.3f}")
+    del hnsw
+
+    ivf, kind, build_time, size_mb = build("ivfpq", vectors)
+    if kind != "ivfpq":
+        print(f"{'ivfpq':>8} skipped: too few vectors to train (fell back to {kind})")
+        return
+    for nprobe in args.nprobe:
+        found, latency = run_queries(ivf, queries, args.k, faiss.SearchParametersIVF(nprobe=nprobe))
+        print(f"{'ivfpq':>8} {f'nprobe={nprobe}':>12} {build_time:>8.2f} {size_mb:>8.1f} {latency:>9.3f} "
+              f"{recall(found, truth):>7.3f}")
+
+
+if __name__ == "__main__":
+    main()
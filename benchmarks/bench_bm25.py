@@ -0,0 +1,113 @@
+"""
+Keyword Search Benchmark
+========================
+
+Compares query latency of ``rank_bm25.BM25Okapi`` (``get_scores`` over
+every document, then a full ``argsort``) against ``chatbot.BM25Index``
+(postings of the query terms only, partial top-k selection), with and
+without MaxScore pruning, on synthetic corpora of increasing size. For the
+BM25Index engines it also reports postings evaluated per query.
+
+Documents draw words from a Zipf-distributed vocabulary, and most of them
+also mention a few site-wide words ("jiit", "student", "campus"), as the
+real crawl does. Queries are chatbot-style questions. For every query the
+benchmark checks that both engines return the same documents with the same
+scores, and that the pruned engine returns the same as the exhaustive one.
+
+Usage:
+    python benchmarks/bench_bm25.py
+    python benchmarks/bench_bm25.py --docs 1000 10000 --doc-len 400 --top-k 15
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chatbot  # noqa: E402
+from rank_bm25 import BM25Okapi  # noqa: E402
+
+np = chatbot.np
+
+COMMON_WORDS = ["jiit", "student", "campus", "university", "noida"]
+QUESTIONS = [
+    "What is the fee structure for btech students at jiit noida campus?",
+    "How do I apply for hostel accommodation as a first year student?",
+    "Which companies visited the campus for placements last year?",
+    "What are the eligibility criteria for admission to the mtech program?",
+    "Who is the head of the computer science department at jiit?",
+    "When does the student registration for the even semester start?",
+    "Is there a scholarship for students with high jee main rank?",
+    "Where can I find the academic calendar and examination schedule?",
+]
+
+
+def make_corpus(doc_count: int, doc_len: int, vocab_size: int, seed: int = 0):
+    """Token lists with Zipfian word frequencies; question words are planted in the vocabulary."""
+    rng = np.random.default_rng(seed)
+    tokenize = chatbot.Tokenizer().tokenize
+    question_words = sorted({token for question in QUESTIONS for token in tokenize(question)} - set(COMMON_WORDS))
+    vocab = np.array(question_words + [f"term{i}" for i in range(vocab_size - len(question_words))])
+    rng.shuffle(vocab)
+    ranks = np.minimum(rng.zipf(1.2, size=(doc_count, doc_len)) - 1, vocab_size - 1)
+    corpus = []
+    for row in ranks:
+        tokens = vocab[row].tolist()
+        tokens += [word for word in COMMON_WORDS if rng.random() < 0.9]
+        corpus.append(tokens)
+    return corpus, [tokenize(question) for question in QUESTIONS]
+
+
+def time_queries(search, queries, repeat: int):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [search(query) for query in queries]
+    return (time.perf_counter() - start) * 1000 / (repeat * len(queries)), results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--doc-len", type=int, default=250, help="tokens per document")
+    parser.add_argument("--vocab", type=int, default=50000)
+    parser.add_argument("--top-k", type=int, default=chatbot.Config.BM25_TOP_K)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{len(QUESTIONS)} queries, top {args.top_k}, ~{args.doc_len} tokens per document")
+    print(f"{'docs':>8} {'engine':>10} {'build s':>8} {'ms/query':>9} {'speedup':>8} "
+          f"{'postings/query':>15} {'identical':>10}")
+    for doc_count in args.docs:
+        corpus, queries = make_corpus(doc_count, args.doc_len, args.vocab)
+
+        start = time.perf_counter()
+        okapi = BM25Okapi(corpus)
+        okapi_build = time.perf_counter() - start
+
+        def okapi_search(query):
+            scores = okapi.get_scores(query)
+            top = np.argsort(scores, kind='stable')[::-1][:args.top_k]
+            return [(int(i), float(scores[i])) for i in top if scores[i] > 0]
+
+        start = time.perf_counter()
+        index = chatbot.BM25Index.build(corpus)
+        index_build = time.perf_counter() - start
+
+        okapi_ms, expected = time_queries(okapi_search, queries, 1)
+        print(f"{doc_count:>8} {'BM25Okapi':>10} {okapi_build:>8.2f} {okapi_ms:>9.2f} {'':>8} "
+              f"{len(corpus) * sum(map(len, queries)) / len(queries):>15.0f} {'':>10}")
+        for label, prune in (("BM25Index", False), ("MaxScore", True)):
+            ms, results = time_queries(lambda query: index.top_k(query, args.top_k, prune=prune), queries, args.repeat)
+            postings = 0
+            for query in queries:
+                stats = {}
+                index.top_k(query, args.top_k, prune=prune, stats=stats)
+                postings += stats['postings']
+            print(f"{doc_count:>8} {label:>10} {index_build:>8.2f} {ms:>9.3f} {okapi_ms / ms:>7.0f}x "
+                  f"{postings / len(queries):>15.0f} {str(results == expected):>10}")
+
+
+if __name__ == "__main__":
+    main()
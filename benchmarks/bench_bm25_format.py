@@ -0,0 +1,86 @@
+"""
+Keyword Index Storage Benchmark
+===============================
+
+Compares the previous on-disk keyword index (a pickled
+``rank_bm25.BM25Okapi`` object) with the columnar ``BM25Index`` files, on
+the synthetic corpora of ``bench_bm25.py``. Reported per corpus size:
+
+- size on disk in MB (all files of the index)
+- save time
+- load time, memory-mapped and read fully into memory
+- latency of the first query after loading (includes page faults)
+
+Usage:
+    python benchmarks/bench_bm25_format.py
+    python benchmarks/bench_bm25_format.py --docs 10000 100000 --doc-len 400
+"""
+
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chatbot  # noqa: E402
+from bench_bm25 import make_corpus  # noqa: E402
+from rank_bm25 import BM25Okapi  # noqa: E402
+
+np = chatbot.np
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--doc-len", type=int, default=250, help="tokens per document")
+    parser.add_argument("--vocab", type=int, default=50000)
+    args = parser.parse_args()
+
+    print(f"{'docs':>8} {'format':>16} {'MB':>8} {'save s':>8} {'load ms':>9} {'1st query ms':>13}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for doc_count in args.docs:
+            corpus, queries = make_corpus(doc_count, args.doc_len, args.vocab)
+            doc_ids = np.array([chatbot.EnhancedWebScraper._doc_id(f"https://www.jiit.ac.in/{i}")
+                                for i in range(doc_count)])
+
+            pickle_path = Path(tmp) / f"okapi-{doc_count}.pkl"
+            okapi = BM25Okapi(corpus)
+
+            def save_pickle():
+                with open(pickle_path, 'wb') as f:
+                    pickle.dump({'bm25': okapi, 'doc_ids': doc_ids.tolist()}, f)
+
+            def load_pickle():
+                with open(pickle_path, 'rb') as f:
+                    return pickle.load(f)
+
+            _, save_time = timed(save_pickle)
+            data, load_time = timed(load_pickle)
+            _, query_time = timed(lambda: data['bm25'].get_scores(queries[0]))
+            print(f"{doc_count:>8} {'BM25Okapi pickle':>16} {pickle_path.stat().st_size / 1e6:>8.1f} "
+                  f"{save_time:>8.2f} {load_time * 1000:>9.1f} {query_time * 1000:>13.2f}")
+            del okapi, data
+
+            column_dir = Path(tmp) / f"bm25-{doc_count}"
+            index = chatbot.BM25Index.build(corpus, doc_ids.tolist())
+            _, save_time = timed(lambda: index.save(column_dir))
+            size_mb = sum(path.stat().st_size for path in column_dir.iterdir()) / 1e6
+            for label, mmap in (("columnar mmap", True), ("columnar read", False)):
+                loaded, load_time = timed(lambda: chatbot.BM25Index.load(column_dir, mmap=mmap))
+                _, query_time = timed(lambda: loaded.top_k(queries[0], chatbot.Config.BM25_TOP_K, prune=True))
+                print(f"{doc_count:>8} {label:>16} {size_mb:>8.1f} "
+                      f"{save_time:>8.2f} {load_time * 1000:>9.1f} {query_time * 1000:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
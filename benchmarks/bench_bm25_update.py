@@ -0,0 +1,108 @@
+"""
+Keyword Index Update Benchmark
+==============================
+
+Measures what a small recrawl costs the keyword index: applying a delta of
+changed and removed documents with ``BM25Index.updated`` and saving it,
+against rebuilding the whole index from the token lists and saving that.
+Corpora are the synthetic ones of ``bench_bm25.py``; changed documents get
+freshly drawn text, so they also bring new terms.
+
+Several rounds are applied to the same index so segment merges show up.
+After every round the updated index is checked against a fresh build of
+the same documents: same documents found for every query, with scores
+equal to 1e-9 relative.
+
+Usage:
+    python benchmarks/bench_bm25_update.py
+    python benchmarks/bench_bm25_update.py --docs 100000 --changed 50 --removed 10 --rounds 12
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chatbot  # noqa: E402
+from bench_bm25 import make_corpus  # noqa: E402
+
+np = chatbot.np
+
+
+def same_results(index, fresh, queries, k: int) -> bool:
+    for query in queries:
+        got = [(index.doc_id(position), score) for position, score in index.top_k(query, k, prune=True)]
+        expected = [(fresh.doc_id(position), score) for position, score in fresh.top_k(query, k)]
+        if ({doc_id for doc_id, _ in got} != {doc_id for doc_id, _ in expected}
+                or not np.allclose([s for _, s in got], [s for _, s in expected], rtol=1e-9, atol=0)):
+            return False
+    return True
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100000)
+    parser.add_argument("--doc-len", type=int, default=250, help="tokens per document")
+    parser.add_argument("--vocab", type=int, default=50000)
+    parser.add_argument("--changed", type=int, default=50, help="changed or new documents per round")
+    parser.add_argument("--removed", type=int, default=10, help="deleted documents per round")
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+
+    params = {'k1': chatbot.Config.BM25_K1, 'b': chatbot.Config.BM25_B, 'epsilon': chatbot.Config.BM25_EPSILON,
+              'max_segments': chatbot.Config.BM25_MAX_SEGMENTS,
+              'max_deleted_fraction': chatbot.Config.BM25_MERGE_DELETED_FRACTION}
+    corpus, queries = make_corpus(args.docs, args.doc_len, args.vocab)
+    fresh_text, _ = make_corpus(args.changed * args.rounds, args.doc_len, args.vocab * 2, seed=1)
+    documents = {f"doc{i}": tokens for i, tokens in enumerate(corpus)}
+    rng = np.random.default_rng(2)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        start = time.perf_counter()
+        index = chatbot.BM25Index.build(corpus, list(documents), **params)
+        index.save(directory)
+        print(f"{args.docs} documents, initial build + save {time.perf_counter() - start:.2f} s")
+        print(f"{'round':>5} {'update ms':>10} {'save ms':>8} {'rebuild s':>10} {'speedup':>8} "
+              f"{'segments':>9} {'deleted':>8} {'identical':>10}")
+        next_id = args.docs
+        for round_number in range(args.rounds):
+            ids = list(documents)
+            picked = rng.choice(len(ids), args.changed + args.removed, replace=False)
+            removed = [ids[i] for i in picked[:args.removed]]
+            # Half of the changes edit existing pages, half are new pages
+            changed = [ids[i] for i in picked[args.removed:args.removed + args.changed // 2]]
+            changed += [f"doc{next_id + i}" for i in range(args.changed - len(changed))]
+            next_id += args.changed
+            texts = fresh_text[round_number * args.changed:(round_number + 1) * args.changed]
+            for doc_id in removed:
+                del documents[doc_id]
+            documents.update(zip(changed, texts))
+
+            start = time.perf_counter()
+            index = index.updated(removed, [(doc_id, Counter(tokens)) for doc_id, tokens in zip(changed, texts)])
+            update_time = time.perf_counter() - start
+            start = time.perf_counter()
+            index.save(directory)
+            save_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            fresh = chatbot.BM25Index.build(list(documents.values()), list(documents), **params)
+            with tempfile.TemporaryDirectory() as rebuild_dir:
+                fresh.save(Path(rebuild_dir))
+            rebuild_time = time.perf_counter() - start
+
+            deleted = int(index.offsets[-1]) - len(index)
+            print(f"{round_number + 1:>5} {update_time * 1000:>10.1f} {save_time * 1000:>8.1f} "
+                  f"{rebuild_time:>10.2f} {rebuild_time / (update_time + save_time):>7.0f}x "
+                  f"{len(index.segments):>9} {deleted:>8} "
+                  f"{str(same_results(index, fresh, queries, chatbot.Config.BM25_TOP_K)):>10}")
+
+
+if __name__ == "__main__":
+    main()
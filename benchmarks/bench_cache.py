@@ -0,0 +1,117 @@
+"""
+Page Cache Backend Benchmark
+============================
+
+Compares the cold-start load time of the page cache backends used by
+``EnhancedWebScraper``:
+
+- ``json``: one ``<md5>.json`` file per page (the original layout)
+- ``sqlite``: single SQLite file with zlib-compressed payloads
+
+Each backend is filled with the same synthetic entries, then reopened and
+read back with a single bulk lookup, as ``EnhancedWebScraper._crawl`` does.
+The migration path from the JSON directory is timed as well.
+
+Usage:
+    python benchmarks/bench_cache.py
+    python benchmarks/bench_cache.py --entries 5000 --size 8000 --repeat 5
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chatbot  # noqa: E402
+
+
+WORDS = ("admission placement hostel fee campus faculty research library "
+         "semester examination scholarship department laboratory").split()
+
+
+def make_entries(count: int, size: int) -> dict:
+    rng = random.Random(42)
+    entries = {}
+    for i in range(count):
+        url = f"https://www.jiit.ac.in/page/{i}"
+        key = hashlib.md5(url.encode()).hexdigest()
+        words = []
+        while sum(len(w) + 1 for w in words) < size:
+            words.append(rng.choice(WORDS))
+        entries[key] = {
+            'id': key, 'url': url, 'title': f"Page {i}", 'content': ' '.join(words),
+            'doc_type': 'general', 'metadata': {'url': url, 'doc_type': 'general'},
+            'last_updated': '2024-01-01T00:00:00', 'etag': f'"{key[:8]}"', 'last_modified': None,
+        }
+    return entries
+
+
+def dir_size(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+    return sum(p.stat().st_size for p in path.rglob('*') if p.is_file())
+
+
+def time_cold_load(open_cache, keys, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        cache = open_cache()
+        found = cache.get_many(keys)
+        elapsed = time.perf_counter() - start
+        cache.close()
+        assert len(found) == len(keys), f"expected {len(keys)} entries, got {len(found)}"
+        best = min(best, elapsed)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=1000, help="number of cached pages")
+    parser.add_argument("--size", type=int, default=5000, help="approximate content length per page")
+    parser.add_argument("--repeat", type=int, default=3, help="take the best of N cold loads")
+    args = parser.parse_args()
+
+    entries = make_entries(args.entries, args.size)
+    keys = list(entries)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_dir = Path(tmp) / "cache"
+        db_path = Path(tmp) / "page_cache.sqlite3"
+
+        start = time.perf_counter()
+        chatbot.JSONPageCache(json_dir).put_many(entries)
+        json_write = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sqlite_cache = chatbot.SQLitePageCache(db_path)
+        sqlite_cache.put_many(entries)
+        sqlite_cache.close()
+        sqlite_write = time.perf_counter() - start
+
+        migrated_path = Path(tmp) / "migrated.sqlite3"
+        start = time.perf_counter()
+        migrated = chatbot.SQLitePageCache(migrated_path)
+        imported = migrated.migrate_from_json(json_dir)
+        migrated.close()
+        migrate_time = time.perf_counter() - start
+
+        json_load = time_cold_load(lambda: chatbot.JSONPageCache(json_dir), keys, args.repeat)
+        sqlite_load = time_cold_load(lambda: chatbot.SQLitePageCache(db_path), keys, args.repeat)
+
+        print(f"{args.entries} entries, ~{args.size} chars each")
+        print(f"{'backend':>8} {'write s':>9} {'cold load s':>12} {'disk MB':>9}")
+        print(f"{'json':>8} {json_write:>9.3f} {json_load:>12.3f} {dir_size(json_dir) / 1e6:>9.2f}")
+        print(f"{'sqlite':>8} {sqlite_write:>9.3f} {sqlite_load:>12.3f} {dir_size(db_path) / 1e6:>9.2f}")
+        print(f"Cold-load speedup: {json_load / sqlite_load:.1f}x")
+        print(f"Migration: {imported} JSON entries imported in {migrate_time:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+Passage Chunking Benchmark
+==========================
+
+Compares the legacy "first 1500 characters per document" embedding against
+passage chunking at several window sizes, on a synthetic labelled corpus.
+
+Each document is long filler text about campus life with a few unique facts
+(e.g. which room a named club meets in) placed at random depths. Each query
+asks for one fact and is labelled with the document that contains it.
+The benchmark reports, per configuration:
+
+- vectors in the index and index size in MB
+- build time (embedding + indexing)
+- document-level recall@1 and recall@5
+
+Usage:
+    python benchmarks/bench_chunking.py
+    python benchmarks/bench_chunking.py --docs 300 --doc-chars 20000 --sizes 500 1000 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chatbot  # noqa: E402
+
+
+FILLER = [
+    "Students attend lectures and laboratory sessions throughout the semester.",
+    "The campus has a central library with digital resources and reading halls.",
+    "Faculty members guide project work and encourage research publications.",
+    "Hostel residents have access to mess facilities and common rooms.",
+    "The placement cell organises training sessions before the recruitment season.",
+    "Cultural and technical festivals are held every year with wide participation.",
+    "Sports facilities include courts for basketball, volleyball and badminton.",
+    "Examinations are conducted at the end of each semester as per the academic calendar.",
+]
+ADJECTIVES = "amber azure crimson golden ivory jade lunar maroon onyx scarlet silver violet".split()
+NOUNS = "falcons otters comets pioneers voyagers coders makers rovers thinkers builders".split()
+DAYS = "Monday Tuesday Wednesday Thursday Friday Saturday".split()
+
+
+def make_corpus(doc_count: int, doc_chars: int, facts_per_doc: int, seed: int = 7):
+    rng = random.Random(seed)
+    names = [f"{a} {n}" for a in ADJECTIVES for n in NOUNS]
+    rng.shuffle(names)
+    documents, queries = [], []
+    for i in range(doc_count):
+        sentences = []
+        while sum(len(x) + 1 for x in sentences) < doc_chars:
+            sentences.append(rng.choice(FILLER))
+        for _ in range(facts_per_doc):
+            if not names:
+                break
+            club = names.pop()
+            room = rng.randint(100, 999)
+            fact = f"The {club} club meets in room {room} every {rng.choice(DAYS)} evening."
+            sentences.insert(rng.randrange(len(sentences)), fact)
+            queries.append((f"Where does the {club} club meet?", f"doc{i}"))
+        documents.append(chatbot.Document(
+            id=f"doc{i}", url=f"https://www.jiit.ac.in/doc{i}", title=f"Campus notice {i}",
+            content=' '.join(sentences), doc_type='general', metadata={},
+        ))
+    return documents, queries
+
+
+class LegacyVectorStore(chatbot.VectorStore):
+    """One vector per document from its first 1500 characters (pre-chunking behaviour)."""
+
+    def _embed(self, documents, progress_callback=None):
+        texts = [f"{doc.title}\n\n{doc.content[:1500]}" for doc in documents]
+        embeddings = chatbot.np.ascontiguousarray(self._encode(texts), dtype='float32')
+        chatbot.faiss.normalize_L2(embeddings)
+        return embeddings, [doc.id for doc in documents], [(0, 1500)] * len(documents), texts
+
+
+def evaluate(store, documents, queries):
+    start = time.perf_counter()
+    store.build_index(documents)
+    build_time = time.perf_counter() - start
+    hits1 = hits5 = 0
+    for query, label in queries:
+        ranked = [doc_id for doc_id, _ in store.search(query, top_k=5)]
+        hits1 += ranked[:1] == [label]
+        hits5 += label in ranked
+    index_mb = store.index.ntotal * store.index.d * 4 / 1e6
+    return store.index.ntotal, index_mb, build_time, hits1 / len(queries), hits5 / len(queries)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=100)
+    parser.add_argument("--doc-chars", type=int, default=12000, help="approximate length of each document")
+    parser.add_argument("--facts", type=int, default=1, help="labelled facts per document")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[500, 1000, 2000], help="CHUNK_SIZE values")
+    parser.add_argument("--overlap", type=float, default=0.2, help="overlap as a fraction of CHUNK_SIZE")
+    parser.add_argument("--model", default=chatbot.Config.EMBEDDING_MODEL)
+    args = parser.parse_args()
+
+    documents, queries = make_corpus(args.docs, args.doc_chars, args.facts)
+    print(f"{len(documents)} documents x ~{args.doc_chars} chars, {len(queries)} labelled queries")
+    print(f"{'config':>16} {'vectors':>8} {'index MB':>9} {'build s':>8} {'R@1':>6} {'R@5':>6}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model = None
+        configs = [("first 1500 chars", None)] + [(f"chunk {size}", size) for size in args.sizes]
+        for label, size in configs:
+            class BenchConfig(chatbot.Config):
+                FAISS_DIR = Path(tmp)
+                # Fresh embedding cache per configuration so build times include encoding
+                EMBEDDING_CACHE_DIR = Path(tmp) / f"embedding_cache_{size}"
+                EMBEDDING_MODEL = args.model
+                CHUNK_SIZE = size or chatbot.Config.CHUNK_SIZE
+                CHUNK_OVERLAP = int((size or 0) * args.overlap)
+
+            store = (LegacyVectorStore if size is None else chatbot.VectorStore)(BenchConfig)
+            # Load the model once and keep it out of the build timings
+            if model is None:
+                store._init_model()
+                model = store.embedding_model
+            store.embedding_model = model
+            vectors, index_mb, build_time, r1, r5 = evaluate(store, documents, queries)
+            print(f"{label:>16} {vectors:>8} {index_mb:>9.2f} {build_time:>8.2f} {r1:>6.2f} {r5:>6.2f}")
+
+
+if __name__ == "__main__":
+    main()
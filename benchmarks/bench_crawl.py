@@ -0,0 +1,123 @@
+"""
+Crawl Engine Benchmark
+======================
+
+Measures ``EnhancedWebScraper.scrape_website`` against a local fixture HTTP
+server so results do not depend on the live JIIT website.
+
+The fixture serves a sitemap plus ``--pages`` HTML pages, each delayed by
+``--latency`` milliseconds to mimic a real network round-trip. The crawl is
+run once per worker count and the document order is checked to be identical
+across runs.
+
+Usage:
+    python benchmarks/bench_crawl.py
+    python benchmarks/bench_crawl.py --pages 300 --latency 80 --workers 1 4 8 16
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chatbot  # noqa: E402
+
+
+PARAGRAPH = (
+    "Jaypee Institute of Information Technology offers undergraduate and "
+    "postgraduate programmes with a strong focus on research and placements. "
+)
+
+
+def make_handler(page_count: int, latency: float):
+    """Build a request handler serving a sitemap and ``page_count`` pages."""
+
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            if self.path == "/sitemap.xml":
+                host = f"http://{self.headers['Host']}"
+                locs = "".join(f"<url><loc>{host}/page/{i}</loc></url>" for i in range(page_count))
+                body = (
+                    '<?xml version="1.0" encoding="UTF-8"?>'
+                    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+                    f"{locs}</urlset>"
+                ).encode()
+                content_type = "application/xml"
+            else:
+                body = (
+                    f"<html><head><title>Fixture {self.path}</title></head><body><main>"
+                    f"<h1>Page {self.path}</h1><p>{PARAGRAPH * 4}</p></main></body></html>"
+                ).encode()
+                content_type = "text/html; charset=utf-8"
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return FixtureHandler
+
+
+def run_crawl(base_url: str, cache_dir: Path, workers: int, per_host: int):
+    class BenchConfig(chatbot.Config):
+        BASE_URL = base_url
+        SITEMAP_URL = f"{base_url}/sitemap.xml"
+        CACHE_DIR = cache_dir
+        CRAWL_WORKERS = workers
+        MAX_CONNECTIONS_PER_HOST = per_host
+
+    BenchConfig.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    scraper = chatbot.EnhancedWebScraper(BenchConfig)
+    progress = []
+    start = time.perf_counter()
+    documents, _ = scraper.scrape_website(force_refresh=True, progress_callback=progress.append)
+    elapsed = time.perf_counter() - start
+    return documents, elapsed, len(progress)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200, help="pages listed in the fixture sitemap")
+    parser.add_argument("--latency", type=float, default=50.0, help="per-request server latency in ms")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--per-host", type=int, default=chatbot.Config.MAX_CONNECTIONS_PER_HOST,
+                        help="politeness limit; the fixture is a single host, so this caps speedup")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.pages, args.latency / 1000))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    print(f"Fixture: {args.pages} sitemap pages + critical pages, {args.latency:.0f} ms latency, "
+          f"{args.per_host} connections per host")
+    print(f"{'workers':>8} {'docs':>6} {'seconds':>9} {'pages/s':>9} {'speedup':>8}")
+    baseline_time = None
+    baseline_order = None
+    try:
+        for workers in args.workers:
+            with tempfile.TemporaryDirectory() as tmp:
+                documents, elapsed, _ = run_crawl(base_url, Path(tmp) / "cache", workers, args.per_host)
+            order = [doc.url for doc in documents]
+            if baseline_order is None:
+                baseline_order, baseline_time = order, elapsed
+            elif order != baseline_order:
+                raise SystemExit(f"❌ Document order differs with {workers} workers")
+            print(f"{workers:>8} {len(documents):>6} {elapsed:>9.2f} "
+                  f"{len(documents) / elapsed:>9.1f} {baseline_time / elapsed:>7.1f}x")
+    finally:
+        server.shutdown()
+    print("✅ Document order identical across worker counts")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Excerpt Selection Benchmark
+===========================
+
+Measures the time to pick the excerpt shown for each search hit: the
+previous ``HybridSearch._get_excerpt``, which slides a 400-character window
+over the document in steps of 100 and substring-searches every query term
+in every window, against ``ExcerptIndex.best_window``, which looks the
+query terms up among the token positions stored at index time.
+
+Documents are long, PDF-like texts (``--chars`` characters each, 30k by
+default); each query is timed over ``FINAL_TOP_K`` hits, as one answer
+shows them. Also reported: the time to build the excerpt index and its
+size on disk, and how often both methods pick the same window. They can
+differ by design: the previous method also matched terms inside longer
+words ("fee" in "coffee"; "term12" in "term123" with these synthetic
+words), the index matches whole tokens only. Against the same window scan
+counting whole tokens, the index must agree on every hit.
+
+Usage:
+    python benchmarks/bench_excerpt.py
+    python benchmarks/bench_excerpt.py --docs 500 --chars 60000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chatbot  # noqa: E402
+from bench_tokenizer import make_texts  # noqa: E402
+
+np = chatbot.np
+
+
+def legacy_best_pos(content: str, query_terms, length: int = 400) -> int:
+    content = content.lower()
+    best_pos = 0
+    max_matches = 0
+    for i in range(0, max(1, len(content) - length), 100):
+        chunk = content[i:i+length]
+        matches = sum(1 for term in query_terms if term in chunk)
+        if matches > max_matches:
+            max_matches = matches
+            best_pos = i
+    return best_pos
+
+
+def whole_token_best_pos(content: str, query_terms, tokenizer, length: int = 400) -> int:
+    tokens, spans = tokenizer.tokenize_spans(content)
+    best_pos = 0
+    max_matches = 0
+    for i in range(0, max(1, len(content) - length), 100):
+        inside = (spans[:, 0] >= i) & (spans[:, 1] <= i + length)
+        matches = len(query_terms.intersection(token for token, keep in zip(tokens, inside) if keep))
+        if matches > max_matches:
+            max_matches = matches
+            best_pos = i
+    return best_pos
+
+
+def make_queries(texts, count: int, terms_per_query: int, seed: int = 1):
+    # Query terms drawn from the documents themselves, so most windows have something to find
+    rng = np.random.default_rng(seed)
+    tokenizer = chatbot.Tokenizer()
+    queries = []
+    for _ in range(count):
+        tokens = tokenizer.tokenize(texts[int(rng.integers(len(texts)))])
+        queries.append(" ".join(tokens[i] for i in rng.integers(0, len(tokens), terms_per_query)))
+    return queries
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--chars", type=int, default=30000, help="characters per document")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--terms", type=int, default=4, help="terms per query")
+    args = parser.parse_args()
+
+    # About 7 characters per word in make_texts; trimmed to the exact length
+    texts = [text[:args.chars] for text in make_texts(args.docs, args.chars // 6, 50000)]
+    documents = [chatbot.Document(f"doc{i}", f"https://www.jiit.ac.in/{i}.pdf", f"Document {i}", text, "pdf", {})
+                 for i, text in enumerate(texts)]
+    queries = make_queries(texts, args.queries, args.terms)
+    tokenizer = chatbot.Tokenizer()
+    hits = chatbot.Config.FINAL_TOP_K
+    rng = np.random.default_rng(2)
+    hit_lists = [[documents[i] for i in rng.choice(len(documents), hits, replace=False)] for _ in queries]
+
+    start = time.perf_counter()
+    excerpts = chatbot.ExcerptIndex.build(documents, tokenizer)
+    build_time = time.perf_counter() - start
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / chatbot.ExcerptIndex.FILE
+        excerpts.save(path)
+        size_mb = path.stat().st_size / 1e6
+        excerpts = chatbot.ExcerptIndex.load(path)
+        text_mb = sum(len(text) for text in texts) / 1e6
+        print(f"{args.docs} documents of {args.chars} characters, {args.queries} queries x {hits} hits")
+        print(f"Excerpt index: built in {build_time:.2f} s, {size_mb:.1f} MB on disk for {text_mb:.1f} MB of text\n")
+
+        start = time.perf_counter()
+        expected = [[legacy_best_pos(doc.content, set(tokenizer.tokenize(query))) for doc in docs]
+                    for query, docs in zip(queries, hit_lists)]
+        legacy_time = time.perf_counter() - start
+        start = time.perf_counter()
+        got = [[excerpts.best_window(doc.id, tokenizer.tokenize(query), len(doc.content)) for doc in docs]
+               for query, docs in zip(queries, hit_lists)]
+        index_time = time.perf_counter() - start
+        del excerpts
+    reference = [[whole_token_best_pos(doc.content, set(tokenizer.tokenize(query)), tokenizer) for doc in docs]
+                 for query, docs in zip(queries, hit_lists)]
+
+    same = sum(a == b for row_a, row_b in zip(expected, got) for a, b in zip(row_a, row_b))
+    exact = sum(a == b for row_a, row_b in zip(reference, got) for a, b in zip(row_a, row_b))
+    total = args.queries * hits
+    print(f"{'method':>22} {'ms / query':>11} {'ms / hit':>9}")
+    print(f"{'sliding window':>22} {legacy_time * 1000 / args.queries:>11.2f} {legacy_time * 1000 / total:>9.3f}")
+    print(f"{'ExcerptIndex':>22} {index_time * 1000 / args.queries:>11.2f} {index_time * 1000 / total:>9.3f}")
+    print(f"\nSpeedup {legacy_time / index_time:.1f}x; same window as the substring scan for {same}/{total} hits, "
+          f"as a whole-token scan for {exact}/{total}")
+
+
+if __name__ == "__main__":
+    main()
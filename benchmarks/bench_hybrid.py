@@ -0,0 +1,119 @@
+"""
+Hybrid Search Latency Benchmark
+===============================
+
+Measures end-to-end ``HybridSearch.search`` latency with the semantic and
+keyword legs run one after the other (``PARALLEL_RETRIEVAL = False``) and
+concurrently on the shared search executor, over a synthetic knowledge
+base: ``bench_bm25.py`` documents for BM25 and random unit vectors, a few
+passages per document, for FAISS. Queries are encoded with the configured
+sentence-transformers model, as in the chatbot.
+
+Also reported per mode: the latency of each leg on its own, and, with a
+per-leg timeout (``--leg-timeout``), how many legs were dropped.
+Concurrent and sequential runs must return the same documents when no leg
+is dropped; the benchmark checks that.
+
+Usage:
+    python benchmarks/bench_hybrid.py
+    python benchmarks/bench_hybrid.py --docs 50000 --kind hnsw --leg-timeout 0.005
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chatbot  # noqa: E402
+from bench_bm25 import QUESTIONS, make_corpus  # noqa: E402
+
+np = chatbot.np
+faiss = chatbot.faiss
+
+
+def make_config(directory: Path, kind: str, timeout):
+    class BenchConfig(chatbot.Config):
+        FAISS_DIR = directory / "faiss"
+        BM25_DIR = directory / "bm25"
+        EMBEDDING_CACHE_DIR = directory / "embedding_cache"
+        VECTOR_INDEX_TYPE = kind
+        SEARCH_LEG_TIMEOUT = timeout
+    return BenchConfig
+
+
+def build(config, doc_count: int, doc_len: int, passages_per_doc: int, dim: int):
+    corpus, _ = make_corpus(doc_count, doc_len, 50000)
+    documents = [chatbot.Document(f"doc{i}", f"https://www.jiit.ac.in/{i}", f"Page {i}", " ".join(tokens),
+                                  "general", {}) for i, tokens in enumerate(corpus)]
+    keyword_search = chatbot.KeywordSearch(config)
+    keyword_search.build_index(documents)
+
+    rng = np.random.default_rng(0)
+    count = doc_count * passages_per_doc
+    vectors = rng.standard_normal((count, dim), dtype=np.float32)
+    faiss.normalize_L2(vectors)
+    vector_store = chatbot.VectorStore(config)
+    vector_store.index, vector_store.index_kind = chatbot.create_vector_index(config, vectors)
+    vector_store.index.add_with_ids(vectors, np.arange(count, dtype=np.int64))
+    vector_store.passages = {i: (f"doc{i // passages_per_doc}", 0, 1000) for i in range(count)}
+    vector_store.next_id = count
+    return documents, vector_store, keyword_search
+
+
+def time_calls(function, queries, repeat: int):
+    latencies = []
+    results = []
+    for _ in range(repeat):
+        for query in queries:
+            start = time.perf_counter()
+            results.append(function(query))
+            latencies.append((time.perf_counter() - start) * 1000)
+    return np.percentile(latencies, 50), np.percentile(latencies, 95), results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--doc-len", type=int, default=250, help="tokens per document")
+    parser.add_argument("--passages", type=int, default=4, help="vectors per document")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--kind", default="flat", choices=["flat", "hnsw", "ivfpq"])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--leg-timeout", type=float, default=None, help="SEARCH_LEG_TIMEOUT in seconds")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = make_config(Path(tmp), args.kind, args.leg_timeout)
+        documents, vector_store, keyword_search = build(config, args.docs, args.doc_len, args.passages, args.dim)
+        # Load the model and touch the indexes before timing anything
+        vector_store.search_passages(QUESTIONS[0], config.FAISS_TOP_K)
+        keyword_search.search(QUESTIONS[0], config.BM25_TOP_K)
+
+        print(f"{args.docs} documents, {args.docs * args.passages} {vector_store.index_kind} vectors, "
+              f"{len(QUESTIONS)} queries x {args.repeat}")
+        print(f"{'leg / mode':>22} {'p50 ms':>8} {'p95 ms':>8} {'dropped legs':>13} {'same docs':>10}")
+        for label, leg in (("semantic leg", lambda q: vector_store.search_passages(q, config.FAISS_TOP_K)),
+                           ("keyword leg", lambda q: keyword_search.search(q, config.BM25_TOP_K))):
+            p50, p95, _ = time_calls(leg, QUESTIONS, args.repeat)
+            print(f"{label:>22} {p50:>8.2f} {p95:>8.2f}")
+
+        sequential = chatbot.HybridSearch(config, vector_store, keyword_search, documents)
+        p50, p95, expected = time_calls(sequential.search, QUESTIONS, args.repeat)
+        print(f"{'hybrid sequential':>22} {p50:>8.2f} {p95:>8.2f}")
+        with ThreadPoolExecutor(max_workers=config.SEARCH_WORKERS, thread_name_prefix="jiit-search") as executor:
+            parallel = chatbot.HybridSearch(config, vector_store, keyword_search, documents, executor)
+            p50, p95, results = time_calls(parallel.search, QUESTIONS, args.repeat)
+        dropped = sum(parallel.stats.values())
+        # Dropping a leg changes the fused ranking by design, so only complete runs are compared
+        same = "-" if dropped else str([[r['url'] for r in result] for result in results]
+                                       == [[r['url'] for r in result] for result in expected])
+        print(f"{'hybrid concurrent':>22} {p50:>8.2f} {p95:>8.2f} {dropped:>13} {same:>10}")
+
+
+if __name__ == "__main__":
+    main()
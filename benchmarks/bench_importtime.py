@@ -0,0 +1,112 @@
+"""
+App Import Time Benchmark
+=========================
+
+Runs ``python -X importtime -c "import app"`` in a fresh interpreter and
+reports how long importing the app takes, its slowest direct imports,
+and whether any heavy feature dependency (``HEAVY_MODULES``) got loaded.
+Feature pages import their modules only when routed to, so none should.
+
+With ``--eager``, each feature module is then imported as well, one
+interpreter per module, showing what routing to its page costs (what
+app.py used to pay up front for all of them). A module that cannot be
+imported here, for lack of its optional packages, is reported as such.
+
+Exits with status 1 if ``import app`` loads a heavy module or takes longer
+than ``--budget-ms``, so it can gate regressions in CI.
+
+Usage:
+    python benchmarks/bench_importtime.py
+    python benchmarks/bench_importtime.py --eager --budget-ms 1500
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FEATURE_MODULES = ["chatbot", "ppt_generator", "jiit_info", "jiit_live"]
+
+HEAVY_MODULES = ["faiss", "torch", "sentence_transformers", "groq", "openai", "google.generativeai",
+                 "reportlab", "docx", "sklearn", "textblob", "plotly"]
+
+
+def import_times(code: str):
+    """
+    Import ``code`` under ``-X importtime``.
+
+    Returns the cumulative microseconds of each top-level import and of
+    each one's direct imports, every module left loaded, and the exit status.
+    """
+    # -X importtime also lists failed attempts (streamlit probes for plotly); sys.modules has what loaded
+    code += "; import sys; print('MODULES', *sys.modules)"
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                            capture_output=True, text=True)
+    top_level = {}
+    children = {}
+    pending = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Nesting is shown by indentation, one space per level; a module is listed after its imports
+        depth = len(name) - len(name.lstrip(" "))
+        if depth == 1:
+            top_level[name.strip()] = int(cumulative)
+            children[name.strip()], pending = pending, {}
+        elif depth == 3:
+            pending[name.strip()] = int(cumulative)
+    loaded = set()
+    for line in result.stdout.splitlines():
+        if line.startswith("MODULES "):
+            loaded = set(line.split()[1:])
+    return top_level, children, loaded, result.returncode
+
+
+def heavy(loaded):
+    return sorted(name for name in HEAVY_MODULES
+                  if name in loaded or any(module.startswith(name + ".") for module in loaded))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="maximum import time of app")
+    parser.add_argument("--eager", action="store_true", help="also time importing each feature module")
+    parser.add_argument("--top", type=int, default=8, help="slowest imports of app to list")
+    args = parser.parse_args()
+
+    top_level, children, loaded, status = import_times("import app")
+    if status != 0:
+        print("import app failed")
+        sys.exit(1)
+    app_ms = top_level["app"] / 1000
+    heavy_loaded = heavy(loaded)
+    print(f"import app: {app_ms:.0f} ms, {len(loaded)} modules, heavy modules: {', '.join(heavy_loaded) or 'none'}")
+    print("slowest imports of app:")
+    for name, cumulative in sorted(children["app"].items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:>28} {cumulative / 1000:>8.1f} ms")
+
+    if args.eager:
+        print(f"\n{'feature module':>16} {'import ms':>10} heavy modules it loads")
+        for module in FEATURE_MODULES:
+            times, _, modules, status = import_times(f"import app; import {module}")
+            if status != 0:
+                print(f"{module:>16} {'-':>10} (cannot be imported here: missing optional packages)")
+                continue
+            print(f"{module:>16} {times[module] / 1000:>10.0f} {', '.join(heavy(modules - loaded)) or '-'}")
+
+    failures = []
+    if heavy_loaded:
+        failures.append(f"import app loads {', '.join(heavy_loaded)}")
+    if app_ms > args.budget_ms:
+        failures.append(f"import app takes {app_ms:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+    if failures:
+        print("\nFAIL: " + "; ".join(failures))
+        sys.exit(1)
+    print(f"\nOK: within the {args.budget_ms:.0f} ms budget, no heavy modules")
+
+
+if __name__ == "__main__":
+    main()
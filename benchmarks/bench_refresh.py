@@ -0,0 +1,154 @@
+"""
+Refresh While Serving Benchmark
+===============================
+
+Measures what queries see while the knowledge base is refreshed in the
+background (``JIITAdvancedChatbot.start_refresh``): reader threads keep
+searching the live ``HybridSearch`` while an incremental update and then a
+full rebuild are built into new index versions, published and swapped in.
+
+Reported per phase (idle, incremental update, full rebuild): how long it
+took, the queries answered meanwhile with their p50/p99/max latency,
+failed queries, and hits on documents the serving ``HybridSearch`` does not
+know (a mix of index versions). For the incremental update, also how much
+of the new version was written rather than hard-linked from the live one.
+
+The crawler is replaced by the synthetic documents: ``bench_hybrid.py``
+documents and random passage vectors to start from, ``--changed`` of them
+edited and ``--removed`` deleted for the update, all of them re-indexed
+for the rebuild. Changed documents are encoded with the configured model.
+
+Usage:
+    python benchmarks/bench_refresh.py
+    python benchmarks/bench_refresh.py --docs 20000 --readers 8 --changed 500
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chatbot  # noqa: E402
+from bench_bm25 import QUESTIONS  # noqa: E402
+from bench_hybrid import build  # noqa: E402
+from bench_sessions import make_config  # noqa: E402
+
+np = chatbot.np
+
+
+class Readers:
+    """Threads searching the engine's live ``HybridSearch`` until stopped, recording each query."""
+
+    def __init__(self, engine, count: int):
+        self.engine = engine
+        self.lock = threading.Lock()
+        self.latencies, self.errors, self.missing = [], 0, 0
+        self.running = True
+        self.threads = [threading.Thread(target=self._run, args=(i,)) for i in range(count)]
+        for thread in self.threads:
+            thread.start()
+
+    def _run(self, reader: int) -> None:
+        n = 0
+        while self.running:
+            # A unique query, so the query cache never answers it
+            query = f"{QUESTIONS[(reader + n) % len(QUESTIONS)]} r{reader}q{n}"
+            n += 1
+            hybrid_search = self.engine.hybrid_search
+            start = time.perf_counter()
+            try:
+                _, keyword, _ = hybrid_search._retrieve(query)
+                hybrid_search.search(query)
+                missing = sum(doc_id not in hybrid_search.documents for doc_id, _ in keyword)
+                failed = 0
+            except Exception:
+                missing, failed = 0, 1
+            elapsed = time.perf_counter() - start
+            with self.lock:
+                self.latencies.append(elapsed)
+                self.errors += failed
+                self.missing += missing
+
+    def take(self):
+        with self.lock:
+            taken = (np.array(self.latencies) * 1000, self.errors, self.missing)
+            self.latencies, self.errors, self.missing = [], 0, 0
+        return taken
+
+    def stop(self) -> None:
+        self.running = False
+        for thread in self.threads:
+            thread.join()
+
+
+def written_mb(directory: Path):
+    """MB of files under ``directory`` written for it, and of all its files (hard links included)."""
+    files = [path for path in directory.rglob("*") if path.is_file()]
+    own = sum(path.stat().st_size for path in files if path.stat().st_nlink == 1)
+    return own / 1e6, sum(path.stat().st_size for path in files) / 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--doc-len", type=int, default=250, help="tokens per document")
+    parser.add_argument("--passages", type=int, default=4, help="vectors per document")
+    parser.add_argument("--readers", type=int, default=4, help="threads searching throughout")
+    parser.add_argument("--changed", type=int, default=100, help="documents edited by the incremental update")
+    parser.add_argument("--removed", type=int, default=20, help="documents deleted by the incremental update")
+    parser.add_argument("--idle", type=float, default=2.0, help="seconds measured with no refresh running")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = make_config(Path(tmp))
+        config.setup_directories()
+        documents, vector_store, _ = build(config, args.docs, args.doc_len, args.passages, config.EMBEDDING_DIM)
+        vector_store._save_index()
+        chatbot.DocumentManager(config).save_documents(documents)
+        del vector_store
+
+        engine = chatbot.JIITAdvancedChatbot(config)
+        engine.initialize()
+        changed = [chatbot.Document(doc.id, doc.url, doc.title, doc.content + " revised admission schedule",
+                                    doc.doc_type, {}) for doc in documents[:args.changed]]
+        removed = [doc.id for doc in documents[-args.removed:]] if args.removed else []
+        # The frontier is left as it is: nothing was crawled
+        engine.scraper.scrape_incremental = lambda progress_callback=None: (changed, removed, chatbot.FrontierUpdate())
+        engine.scraper.scrape_website = (lambda force_refresh=False, progress_callback=None:
+                                         (documents, chatbot.FrontierUpdate()))
+
+        print(f"{args.docs} documents, {args.docs * args.passages} passage vectors, {args.readers} readers")
+        print(f"{'phase':>12} {'seconds':>8} {'queries':>8} {'p50 ms':>7} {'p99 ms':>7} {'max ms':>7} "
+              f"{'errors':>7} {'mixed':>6}")
+        readers = Readers(engine, args.readers)
+        notes = []
+        for phase in ("idle", "incremental", "rebuild"):
+            start = time.perf_counter()
+            if phase == "idle":
+                time.sleep(args.idle)
+            else:
+                engine.start_refresh(force_rebuild=phase == "rebuild")
+                engine.refresh_thread.join()
+                if not engine.refresh_result:
+                    notes.append(f"{phase} failed: {engine.refresh_message}")
+            elapsed = time.perf_counter() - start
+            latencies, errors, missing = readers.take()
+            if phase == "incremental":
+                own, total = written_mb(config.INDEX_DIR / f"v{engine.index_version}")
+                notes.append(f"incremental version: {own:.1f} of {total:.1f} MB written, the rest hard-linked")
+            print(f"{phase:>12} {elapsed:>8.2f} {len(latencies):>8} {np.percentile(latencies, 50):>7.2f} "
+                  f"{np.percentile(latencies, 99):>7.2f} {latencies.max():>7.2f} {errors:>7} {missing:>6}")
+        readers.stop()
+        print(f"\nlive index version {engine.index_version}; versions on disk: "
+              f"{sorted(path.name for path in config.INDEX_DIR.iterdir() if path.is_dir())}")
+        for note in notes:
+            print(note)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Semantic Answer Cache Benchmark
+===============================
+
+Two measurements for ``SemanticAnswerCache``:
+
+1. Threshold calibration. Hand-written pairs of questions, encoded with the
+   configured sentence-transformers model exactly as the chatbot encodes
+   queries (``VectorStore.encode_query``): paraphrases that should reuse
+   each other's answer, and near misses that must not ("B.Tech fees" /
+   "M.Tech fees"). For each threshold, the share of paraphrases that hit
+   and the number of near misses that would wrongly hit, by similarity
+   alone and with the ``SEMANTIC_CACHE_KEY_TERMS`` check the cache applies
+   on top. ``SEMANTIC_CACHE_THRESHOLD`` should sit above every near miss
+   the key terms don't catch.
+
+2. Cost at capacity. Lookup latency (one FAISS flat search) and add
+   latency (which saves the whole store) with ``--entries`` answers
+   cached, to compare with the seconds an LLM call takes.
+
+Usage:
+    python benchmarks/bench_semantic_cache.py
+    python benchmarks/bench_semantic_cache.py --entries 5000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chatbot  # noqa: E402
+
+np = chatbot.np
+faiss = chatbot.faiss
+
+PARAPHRASES = [
+    ("hostel fees", "fee for hostel accommodation"),
+    ("What is the fee structure for B.Tech?", "How much are the B.Tech fees?"),
+    ("Tell me about placement statistics", "What are the placement records?"),
+    ("What is the admission process for B.Tech?", "How do I get admission in B.Tech?"),
+    ("Tell me about campus life and facilities", "What facilities are there on campus?"),
+    ("Is there a hostel for girls?", "Do girls get hostel accommodation?"),
+    ("When does the semester start?", "What is the start date of the semester?"),
+    ("Which companies come for placements?", "Top recruiters at JIIT"),
+    ("What is the B.Tech eligibility criteria?", "Who is eligible for B.Tech admission?"),
+    ("How can I contact the admission office?", "Admission office contact details"),
+]
+
+NEAR_MISSES = [
+    ("What is the fee structure for B.Tech?", "What is the fee structure for M.Tech?"),
+    ("hostel fees", "mess fees"),
+    ("B.Tech admission eligibility", "MBA admission eligibility"),
+    ("placement statistics 2023", "placement statistics 2024"),
+    ("Is there a hostel for girls?", "Is there a hostel for boys?"),
+    ("library timings", "gym timings"),
+    ("Who is the director of JIIT?", "Who is the registrar of JIIT?"),
+    ("JIIT Noida sector 62 campus", "JIIT Noida sector 128 campus"),
+]
+
+
+def similarities(vector_store, pairs):
+    scores = []
+    for first, second in pairs:
+        a, b = vector_store.encode_query(first), vector_store.encode_query(second)
+        scores.append(float(a[0] @ b[0]))
+    return np.array(scores)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=chatbot.Config.SEMANTIC_CACHE_SIZE)
+    parser.add_argument("--lookups", type=int, default=1000)
+    args = parser.parse_args()
+
+    config = chatbot.Config
+    vector_store = chatbot.VectorStore(config)
+    paraphrase = similarities(vector_store, PARAPHRASES)
+    near_miss = similarities(vector_store, NEAR_MISSES)
+    with tempfile.TemporaryDirectory() as tmp:
+        keys = chatbot.SemanticAnswerCache(Path(tmp) / "keys.npz", config.EMBEDDING_MODEL, config.EMBEDDING_DIM,
+                                           config.SEMANTIC_CACHE_THRESHOLD, 0, config.SEMANTIC_CACHE_TTL,
+                                           config.SEMANTIC_CACHE_KEY_TERMS)
+    paraphrase_keys = np.array([keys.key_tokens(a) == keys.key_tokens(b) for a, b in PARAPHRASES])
+    near_miss_keys = np.array([keys.key_tokens(a) == keys.key_tokens(b) for a, b in NEAR_MISSES])
+    print(f"Model {config.EMBEDDING_MODEL}")
+    print(f"Cosine similarity: paraphrases min {paraphrase.min():.3f} median {np.median(paraphrase):.3f}, "
+          f"near misses median {np.median(near_miss):.3f} max {near_miss.max():.3f}")
+    for (first, second), score, same_keys in zip(NEAR_MISSES, near_miss, near_miss_keys):
+        print(f"  {score:.3f}  {first!r} / {second!r}{'' if same_keys else '  (key terms differ)'}")
+    print(f"\n{'threshold':>10} {'paraphrase hits':>16} {'wrong hits':>11} {'with key terms':>15}")
+    for threshold in (0.75, 0.8, 0.85, 0.9, 0.95):
+        marker = "  <- SEMANTIC_CACHE_THRESHOLD" if threshold == config.SEMANTIC_CACHE_THRESHOLD else ""
+        hits = int(((paraphrase >= threshold) & paraphrase_keys).sum())
+        wrong = int((near_miss >= threshold).sum())
+        wrong_keys = int(((near_miss >= threshold) & near_miss_keys).sum())
+        print(f"{threshold:>10.2f} {hits:>9}/{len(paraphrase):<6} {wrong:>6}/{len(near_miss):<4} "
+              f"{wrong_keys:>10}/{len(near_miss):<4}{marker}")
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((args.entries + args.lookups, config.EMBEDDING_DIM), dtype=np.float32)
+    faiss.normalize_L2(vectors)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "answer_cache.npz"
+        cache = chatbot.SemanticAnswerCache(path, config.EMBEDDING_MODEL, config.EMBEDDING_DIM,
+                                            config.SEMANTIC_CACHE_THRESHOLD, args.entries, config.SEMANTIC_CACHE_TTL)
+        answer = "x" * 2000  # About the length of an LLM answer with its sources
+        add_times = []
+        for i in range(args.entries):
+            start = time.perf_counter()
+            cache.add(f"question {i}", vectors[i:i + 1], (1, 1), answer)
+            add_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        for i in range(args.entries, args.entries + args.lookups):
+            cache.lookup(f"question {i}", vectors[i:i + 1], (1, 1))
+        lookup_ms = (time.perf_counter() - start) * 1000 / args.lookups
+        size_mb = path.stat().st_size / 1e6
+        start = time.perf_counter()
+        reloaded = chatbot.SemanticAnswerCache(path, config.EMBEDDING_MODEL, config.EMBEDDING_DIM,
+                                               config.SEMANTIC_CACHE_THRESHOLD, args.entries,
+                                               config.SEMANTIC_CACHE_TTL)
+        load_ms = (time.perf_counter() - start) * 1000
+    print(f"\nWith {args.entries} cached answers: lookup {lookup_ms:.3f} ms, add + save "
+          f"{np.percentile(add_times, 50) * 1000:.2f} ms p50 / {max(add_times) * 1000:.2f} ms max, "
+          f"store {size_mb:.1f} MB, reloaded {len(reloaded)} entries in {load_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
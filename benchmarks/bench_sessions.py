@@ -0,0 +1,134 @@
+"""
+Concurrent Sessions Memory Benchmark
+====================================
+
+Measures what N simultaneous Streamlit sessions cost the server process,
+with one ``JIITAdvancedChatbot`` per session (how ``chatbot.show()`` used
+to keep it in ``st.session_state``) and with the one engine shared by all
+sessions (``get_engine``), each session keeping only its chat history.
+
+Each scenario runs in a fresh child process against the same saved
+synthetic knowledge base (``bench_hybrid.py`` documents and random
+passage vectors). The child starts the engine(s), then every session asks
+one question at the same time, from its own thread, as concurrent
+browser tabs would. Reported per scenario: the growth in resident (RSS)
+and private (unshared) memory of the child, and the time until every
+session has its answer (engine start-up plus the first query). Shared
+answers are also checked against the same questions asked one at a time,
+with the query caches cleared.
+
+Memory is read from ``/proc/self/smaps_rollup``, so Linux only. Answers
+come from the fallback generator (no LLM keys are used).
+
+Usage:
+    python benchmarks/bench_sessions.py
+    python benchmarks/bench_sessions.py --sessions 1 10 50 --modes shared --docs 20000
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chatbot  # noqa: E402
+from bench_bm25 import QUESTIONS  # noqa: E402
+from bench_hybrid import build  # noqa: E402
+
+
+def make_config(directory: Path):
+    class BenchConfig(chatbot.Config):
+        BASE_DIR = directory
+        CACHE_DIR = directory / "cache"
+        CACHE_DB_PATH = directory / "page_cache.sqlite3"
+        FAISS_DIR = directory / "faiss_index"
+        EMBEDDING_CACHE_DIR = directory / "embedding_cache"
+        BM25_DIR = directory / "bm25_index"
+        DOCS_DIR = directory / "documents"
+        INDEX_DIR = directory / "indexes"
+        FRONTIER_PATH = directory / "frontier.json"
+        SEMANTIC_CACHE_PATH = directory / "answer_cache.npz"
+        GROQ_API_KEY = None
+        OPENAI_API_KEY = None
+    return BenchConfig
+
+
+def memory_mb():
+    """Resident and private memory of this process, in MB."""
+    with open("/proc/self/smaps_rollup", encoding="utf-8") as f:
+        fields = {line.split(":")[0]: int(line.split()[1]) for line in f if line.rstrip().endswith("kB")}
+    return fields["Rss"] / 1024, (fields["Private_Clean"] + fields["Private_Dirty"]) / 1024
+
+
+def run_sessions(directory: str, mode: str, sessions: int, results) -> None:
+    config = make_config(Path(directory))
+    rss_before, private_before = memory_mb()
+    start = time.perf_counter()
+    if mode == "per-session":
+        engines = [chatbot.JIITAdvancedChatbot(config) for _ in range(sessions)]
+    else:
+        engines = [chatbot.JIITAdvancedChatbot(config)] * sessions
+    histories = [[] for _ in range(sessions)]
+    questions = [QUESTIONS[i % len(QUESTIONS)] for i in range(sessions)]
+
+    def session(i: int) -> str:
+        # What show() does for a new session: initialize (a no-op once shared), then answer
+        engines[i].initialize()
+        histories[i].append({"role": "user", "content": questions[i]})
+        answer = engines[i].query(questions[i])
+        histories[i].append({"role": "assistant", "content": answer})
+        return answer
+
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        answers = list(pool.map(session, range(sessions)))
+    elapsed = time.perf_counter() - start
+    rss_after, private_after = memory_mb()
+
+    same = "-"
+    if mode == "shared":
+        engine = engines[0]
+        engine.search_cache.clear()
+        engine.answer_cache.clear()
+        same = str(answers == [engine.query(question) for question in questions])
+    results.put((rss_after - rss_before, private_after - private_before, elapsed, same))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--modes", nargs="+", default=["per-session", "shared"], choices=["per-session", "shared"])
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--doc-len", type=int, default=250, help="tokens per document")
+    parser.add_argument("--passages", type=int, default=4, help="vectors per document")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = make_config(Path(tmp))
+        config.setup_directories()
+        documents, vector_store, _ = build(config, args.docs, args.doc_len, args.passages, config.EMBEDDING_DIM)
+        vector_store._save_index()
+        chatbot.DocumentManager(config).save_documents(documents)
+        del documents, vector_store
+
+        print(f"{args.docs} documents, {args.docs * args.passages} passage vectors, "
+              f"one question per session, all sessions at once")
+        print(f"{'mode':>12} {'sessions':>9} {'RSS MB':>8} {'private MB':>11} {'MB / session':>13} "
+              f"{'all answered s':>15} {'same answers':>13}")
+        for mode in args.modes:
+            for sessions in args.sessions:
+                results = multiprocessing.Queue()
+                child = multiprocessing.Process(target=run_sessions, args=(tmp, mode, sessions, results))
+                child.start()
+                rss, private, elapsed, same = results.get()
+                child.join()
+                print(f"{mode:>12} {sessions:>9} {rss:>8.0f} {private:>11.0f} {private / sessions:>13.1f} "
+                      f"{elapsed:>15.2f} {same:>13}")
+
+
+if __name__ == "__main__":
+    main()
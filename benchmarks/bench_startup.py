@@ -0,0 +1,135 @@
+"""
+Vector Store Startup Benchmark
+==============================
+
+Measures how long a fresh process takes to load a saved ``VectorStore`` and
+how much memory the loaded index costs it, for three on-disk layouts:
+
+- ``pickle``: ``faiss.read_index`` + pickled id table (previous layout)
+- ``npy``: ``.npy`` id table, read into the heap (``INDEX_MMAP = False``)
+- ``npy+mmap``: index and id table memory-mapped (``INDEX_MMAP = True``)
+
+Each layout is loaded in its own child process, which also runs a few
+searches so the touched pages are counted. Memory is reported as the
+growth of private (``RssAnon``) and file-backed (``RssFile``) resident
+memory. File-backed pages live in the OS page cache and are shared by
+every worker process mapping the same index; private pages are paid once
+per worker. The files are usually in the page cache already, so load times
+are warm-cache times.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --passages 500000 --kind hnsw
+"""
+
+import argparse
+import json
+import os
+import pickle
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chatbot  # noqa: E402
+
+np = chatbot.np
+faiss = chatbot.faiss
+
+LAYOUTS = ("pickle", "npy", "npy+mmap")
+
+
+def memory_mb():
+    fields = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(("RssAnon:", "RssFile:")):
+                key, value, _ = line.split()
+                fields[key.rstrip(":")] = int(value) / 1024
+    return fields["RssAnon"], fields["RssFile"]
+
+
+def make_config(directory: Path, kind: str, mmap: bool):
+    class BenchConfig(chatbot.Config):
+        FAISS_DIR = directory
+        EMBEDDING_CACHE_DIR = directory / "embedding_cache"
+        VECTOR_INDEX_TYPE = kind
+        INDEX_MMAP = mmap
+    return BenchConfig
+
+
+def build(directory: Path, passages: int, dim: int, kind: str) -> None:
+    """Save a synthetic store (random vectors, 8 passages per document) in both layouts."""
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((passages, dim), dtype=np.float32)
+    faiss.normalize_L2(vectors)
+    store = chatbot.VectorStore(make_config(directory / "npy", kind, True))
+    store.index, store.index_kind = chatbot.create_vector_index(store.config, vectors)
+    store.index.add_with_ids(vectors, np.arange(passages, dtype=np.int64))
+    store.passages = {i: (chatbot.EnhancedWebScraper._doc_id(f"https://www.jiit.ac.in/{i // 8}"),
+                          (i % 8) * 800, (i % 8) * 800 + 1000) for i in range(passages)}
+    store.next_id = passages
+    store._save_index()
+
+    legacy = directory / "pickle"
+    legacy.mkdir()
+    faiss.write_index(store.index, str(legacy / "index-1.faiss"))
+    with open(legacy / "ids-1.pkl", "wb") as f:
+        pickle.dump({'passages': store.passages, 'next_id': store.next_id, 'kind': store.index_kind}, f)
+    with open(legacy / "manifest.json", "w") as f:
+        json.dump({'generation': 1, 'index': "index-1.faiss", 'ids': "ids-1.pkl"}, f)
+
+
+def child(directory: Path, layout: str, kind: str, dim: int, queries: int) -> None:
+    folder = directory / ("pickle" if layout == "pickle" else "npy")
+    store = chatbot.VectorStore(make_config(folder, kind, layout == "npy+mmap"))
+    anon_before, file_before = memory_mb()
+    start = time.perf_counter()
+    store._load_index()
+    load_time = time.perf_counter() - start
+    query = np.random.default_rng(1).standard_normal((queries, dim), dtype=np.float32)
+    faiss.normalize_L2(query)
+    start = time.perf_counter()
+    for i in range(queries):
+        _, ids = store.index.search(query[i:i + 1], 60)
+        [store.passages.get(vector_id) for vector_id in ids[0].tolist()]
+    search_ms = (time.perf_counter() - start) * 1000 / queries
+    anon_after, file_after = memory_mb()
+    print(json.dumps({'load': load_time, 'search_ms': search_ms,
+                      'anon': anon_after - anon_before, 'file': file_after - file_before}))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--passages", type=int, default=200_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--kind", default="flat", choices=["flat", "hnsw", "ivfpq"])
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--child", nargs=2, metavar=("DIR", "LAYOUT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(Path(args.child[0]), args.child[1], args.kind, args.dim, args.queries)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        print(f"Building {args.passages} x {args.dim} {args.kind} index...")
+        build(directory, args.passages, args.dim, args.kind)
+        print(f"{'layout':>10} {'load s':>8} {'ms/query':>9} {'private MB':>11} {'shared MB':>10}")
+        for layout in LAYOUTS:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--child", tmp, layout, "--kind", args.kind,
+                 "--dim", str(args.dim), "--queries", str(args.queries)],
+                capture_output=True, text=True, check=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(f"{layout:>10} {result['load']:>8.3f} {result['search_ms']:>9.3f} "
+                  f"{result['anon']:>11.1f} {result['file']:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Answer Streaming Benchmark
+==========================
+
+Measures when a chat answer becomes visible and when it is complete, for
+the two ways of displaying a generated answer:
+
+- ``wait+typing``: wait for the whole completion (``ResponseGenerator.answer``),
+  then replay it with ``display_typing_effect`` (how every answer used to
+  be shown; now only cached answers are)
+- ``stream``: ``ResponseGenerator.stream_answer`` shown by
+  ``display_stream`` as the chunks arrive
+
+No LLM is called: a simulated provider client streams ``--tokens`` words
+after ``--first-token-ms``, at ``--tokens-per-s``, in the chunk format of
+the Groq and OpenAI SDKs. The placeholder records every redraw instead of
+sending it to a browser. Also reported: redraws per answer and the bytes
+they would send, each redraw carrying the whole text so far.
+
+Usage:
+    python benchmarks/bench_streaming.py
+    python benchmarks/bench_streaming.py --tokens 800 --tokens-per-s 60 --first-token-ms 800
+"""
+
+import argparse
+import os
+import sys
+import time
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chatbot  # noqa: E402
+
+
+class SimulatedClient:
+    """Stands in for a Groq/OpenAI client's ``chat.completions.create(..., stream=True)``."""
+
+    def __init__(self, tokens: int, first_token: float, tokens_per_s: float):
+        self.tokens, self.first_token, self.interval = tokens, first_token, 1 / tokens_per_s
+        self.chat = types.SimpleNamespace(completions=types.SimpleNamespace(create=self.create))
+
+    def _words(self):
+        time.sleep(self.first_token)
+        for i in range(self.tokens):
+            if i:
+                time.sleep(self.interval)
+            yield f"word{i}{'.' if i % 12 == 11 else ''} "
+
+    def create(self, **kwargs):
+        return (types.SimpleNamespace(choices=[types.SimpleNamespace(delta=types.SimpleNamespace(content=word))])
+                for word in self._words())
+
+
+class RecordingPlaceholder:
+    """Records when each redraw happens and how much text it carries."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.draws = []
+
+    def markdown(self, text: str) -> None:
+        self.draws.append((time.perf_counter() - self.start, len(text.encode("utf-8"))))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tokens", type=int, default=400, help="words in the simulated answer")
+    parser.add_argument("--first-token-ms", type=float, default=400.0)
+    parser.add_argument("--tokens-per-s", type=float, default=150.0)
+    parser.add_argument("--typing-speed", type=int, default=20, help="ms per word of the typing effect (as in show())")
+    args = parser.parse_args()
+
+    config = chatbot.Config
+    generator = chatbot.ResponseGenerator(config)
+    generator.client = SimulatedClient(args.tokens, args.first_token_ms / 1000, args.tokens_per_s)
+    documents = [chatbot.Document(f"doc{i}", f"https://www.jiit.ac.in/page{i}", f"Page {i}", "B.Tech admission " * 50,
+                                  "general", {}) for i in range(5)]
+    results = [{'document': doc, 'excerpt': doc.content[:400]} for doc in documents]
+    question = "What is the admission process for B.Tech?"
+
+    print(f"{args.tokens} words, first after {args.first_token_ms:.0f} ms, then {args.tokens_per_s:.0f}/s")
+    print(f"{'display':>12} {'first text s':>13} {'complete s':>11} {'redraws':>8} {'KB sent':>8}")
+    for mode in ("wait+typing", "stream"):
+        placeholder = RecordingPlaceholder()
+        if mode == "stream":
+            chatbot.display_stream(generator.stream_answer(question, results), placeholder,
+                                   config.STREAM_RENDER_INTERVAL)
+        else:
+            answer, _ = generator.answer(question, results)
+            chatbot.display_typing_effect(answer, placeholder, speed=args.typing_speed)
+        first, complete = placeholder.draws[0][0], placeholder.draws[-1][0]
+        sent = sum(size for _, size in placeholder.draws) / 1024
+        print(f"{mode:>12} {first:>13.2f} {complete:>11.2f} {len(placeholder.draws):>8} {sent:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Tokenizer Throughput Benchmark
+==============================
+
+Measures tokenization throughput in MB/s of UTF-8 text for the previous
+keyword tokenizer (``re.findall(r'\\b\\w+\\b')`` plus a length filter in a list
+comprehension) and for ``tokenizer.Tokenizer`` with each of its options.
+The default ``Tokenizer`` must produce exactly the previous tokens; the
+benchmark checks that.
+
+It also reports the memory a tokenized corpus takes as one list of token
+strings per document (what ``KeywordSearch.build_index`` used to collect)
+against interned bag-of-ids arrays (``TokenInterner.encode_counts``).
+
+Documents are synthetic web-page-like text: Zipf-distributed words mixed
+with capitalized stopwords, punctuation and numbers.
+
+Usage:
+    python benchmarks/bench_tokenizer.py
+    python benchmarks/bench_tokenizer.py --docs 20000 --doc-len 800
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+import tracemalloc
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chatbot  # noqa: E402
+from tokenizer import STOPWORDS, Tokenizer, TokenInterner  # noqa: E402
+
+np = chatbot.np
+
+PUNCTUATION = [",", ".", ":", ";", "(", ")", "-", "/", "₹", "%"]
+
+
+def make_texts(doc_count: int, doc_len: int, vocab_size: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"term{i}" for i in range(vocab_size)] + sorted(STOPWORDS))
+    texts = []
+    for _ in range(doc_count):
+        ranks = np.minimum(rng.zipf(1.3, size=doc_len) - 1, len(vocab) - 1)
+        # A third of the words are stopwords, as in running English text
+        stop = rng.random(doc_len) < 0.33
+        ranks[stop] = vocab_size + rng.integers(0, len(STOPWORDS), int(stop.sum()))
+        words = vocab[ranks].tolist()
+        for i in rng.integers(0, doc_len, doc_len // 8).tolist():
+            words[i] = words[i].capitalize() + PUNCTUATION[i % len(PUNCTUATION)]
+        for i in rng.integers(0, doc_len, doc_len // 20).tolist():
+            words[i] = str(int(rng.integers(0, 100000)))
+        texts.append(" ".join(words))
+    return texts
+
+
+def legacy_tokenize(text):
+    text = text.lower()
+    tokens = re.findall(r'\b\w+\b', text)
+    return [t for t in tokens if len(t) > 2]
+
+
+def throughput(tokenize_all, texts, megabytes: float, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = tokenize_all(texts)
+        best = min(best, time.perf_counter() - start)
+    return megabytes / best, result
+
+
+def traced_mb(build):
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current / 1e6, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--doc-len", type=int, default=500, help="words per document")
+    parser.add_argument("--vocab", type=int, default=50000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    texts = make_texts(args.docs, args.doc_len, args.vocab)
+    megabytes = sum(len(text.encode("utf-8")) for text in texts) / 1e6
+    print(f"{args.docs} documents, {megabytes:.1f} MB of text")
+    print(f"{'tokenizer':>24} {'MB/s':>8} {'tokens':>11} {'matches legacy':>15}")
+
+    legacy_rate, expected = throughput(lambda texts: [legacy_tokenize(text) for text in texts],
+                                       texts, megabytes, args.repeat)
+    print(f"{'legacy re.findall':>24} {legacy_rate:>8.1f} {sum(map(len, expected)):>11}")
+    variants = [
+        ("Tokenizer", Tokenizer(), True),
+        ("Tokenizer batch", Tokenizer(), True),
+        ("Tokenizer +stop", Tokenizer(stopwords=True), False),
+        ("Tokenizer +stem", Tokenizer(stem=True), False),
+        ("Tokenizer +stop+stem", Tokenizer(stopwords=True, stem=True), False),
+    ]
+    for label, tokenizer, check in variants:
+        if "batch" in label:
+            rate, tokens = throughput(lambda texts: list(tokenizer.tokenize_batch(texts)), texts, megabytes,
+                                      args.repeat)
+        else:
+            rate, tokens = throughput(lambda texts: [tokenizer.tokenize(text) for text in texts], texts,
+                                      megabytes, args.repeat)
+        same = str(tokens == expected) if check else ""
+        print(f"{label:>24} {rate:>8.1f} {sum(map(len, tokens)):>11} {same:>15}")
+    del expected, tokens
+
+    tokenizer = Tokenizer()
+    lists_mb, token_lists = traced_mb(lambda: [tokenizer.tokenize(text) for text in texts])
+    del token_lists
+    ids_mb, _ = traced_mb(lambda: TokenInterner().encode_counts(
+        Counter(tokens) for tokens in tokenizer.tokenize_batch(texts)))
+    print(f"\nTokenized corpus in memory: {lists_mb:.1f} MB as token lists, "
+          f"{ids_mb:.1f} MB as interned bag-of-ids ({lists_mb / ids_mb:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
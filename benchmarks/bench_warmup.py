@@ -0,0 +1,89 @@
+"""
+Engine Warm-up Benchmark
+========================
+
+Measures what the first visitor to the chat page waits for, with the
+engine started on demand (``initialize`` when the page opens, the embedding
+model loaded by the first question, as ``show()`` used to) and with the
+background warm-up started at server start (``EngineWarmup``).
+
+Each mode runs in a fresh child process against the same saved synthetic
+knowledge base (``bench_hybrid.py`` documents and random passage vectors).
+Reported per mode: seconds until the engine is initialized, then the
+latency of the first and second questions (different ones, so no cache
+answers them). For the warm-up, also the time of each of its steps.
+
+The index files are in the OS page cache already (dropping it needs root),
+so the read-ahead step shows little here; it matters after a reboot or
+when the indexes are larger than the free memory. Answers come from the
+fallback generator (no LLM keys are used).
+
+Usage:
+    python benchmarks/bench_warmup.py
+    python benchmarks/bench_warmup.py --docs 20000 --passages 8
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import chatbot  # noqa: E402
+from bench_bm25 import QUESTIONS  # noqa: E402
+from bench_hybrid import build  # noqa: E402
+from bench_sessions import make_config  # noqa: E402
+
+
+def run_mode(directory: str, mode: str, results) -> None:
+    config = make_config(Path(directory))
+    start = time.perf_counter()
+    engine = chatbot.JIITAdvancedChatbot(config)
+    if mode == "on-demand":
+        engine.initialize()
+    else:
+        engine.warmup.start()
+        engine.warmup.wait()
+    ready = time.perf_counter() - start
+    latencies = []
+    for question in QUESTIONS[:2]:
+        start = time.perf_counter()
+        answer = engine.query(question)
+        latencies.append((time.perf_counter() - start) * 1000)
+        assert not answer.startswith("❌"), answer
+    results.put((ready, latencies, dict(engine.warmup.timings)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=5000)
+    parser.add_argument("--doc-len", type=int, default=250, help="tokens per document")
+    parser.add_argument("--passages", type=int, default=4, help="vectors per document")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        config = make_config(Path(tmp))
+        config.setup_directories()
+        documents, vector_store, _ = build(config, args.docs, args.doc_len, args.passages, config.EMBEDDING_DIM)
+        vector_store._save_index()
+        chatbot.DocumentManager(config).save_documents(documents)
+        del documents, vector_store
+
+        print(f"{args.docs} documents, {args.docs * args.passages} passage vectors, model {config.EMBEDDING_MODEL}")
+        print(f"{'mode':>10} {'ready s':>8} {'1st question ms':>16} {'2nd question ms':>16}  warm-up steps")
+        for mode in ("on-demand", "warm-up"):
+            results = multiprocessing.Queue()
+            child = multiprocessing.Process(target=run_mode, args=(tmp, mode, results))
+            child.start()
+            ready, (first, second), timings = results.get()
+            child.join()
+            steps = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in timings.items()) or "-"
+            print(f"{mode:>10} {ready:>8.2f} {first:>16.1f} {second:>16.1f}  {steps}")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,12 +16,23 @@ Key Components:
 ---------------
 - Document: Data model for storing scraped content
 - Config: Central configuration for all system parameters
+- PageCache: Pluggable page cache (SQLitePageCache by default, JSONPageCache)
+- UrlFrontier: Persistent URL -> sitemap lastmod record for incremental recrawls
+- PdfExtractor: Process-pool PDF text extraction with page streaming
 - EnhancedWebScraper: Intelligent web crawler with PDF support
+- DocumentDeduplicator: Exact and SimHash near-duplicate collapse at ingest
+- EmbeddingCache: Memory-mapped embedding cache keyed by model + text hash
 - VectorStore: FAISS-based semantic search engine
+- BM25Index: Segmented inverted-index BM25 with incremental updates
 - KeywordSearch: BM25-based keyword search engine
+- QueryCache: LRU + TTL cache of search results and answers, keyed by normalized query
 - HybridSearch: Combines both search methods using reciprocal rank fusion
-- ResponseGenerator: LLM-powered response generation
+- ResponseGenerator: LLM-powered response generation, streamed as the LLM writes it
+- AnswerStream: An answer delivered in chunks, as the chat UI displays it
+- SemanticAnswerCache: Reuses LLM answers of past questions with similar embeddings
+- IndexVersions: Blue/green document + index sets, made live by an atomic manifest swap
 - JIITAdvancedChatbot: Main orchestrator class
+- EngineWarmup: Background model and index loading with a pollable readiness state
 
 Features:
 ---------
@@ -42,16 +53,29 @@ Supervisor: Dr. Tribhuvan Kumar Tewary
 
 import os
 import sys
+import atexit
 import json
 import pickle
 import hashlib
+import math
 import re
-import io
+import itertools
 import time
 import random
+import shutil
+import sqlite3
+import threading
+import unicodedata
+import zlib
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from collections import Counter, OrderedDict
+from collections.abc import Mapping
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple, Any
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Optional, Tuple, Any, Iterable, Iterator, Generator
+from dataclasses import dataclass, asdict, field, replace
 from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
@@ -74,8 +98,6 @@ except Exception:
     SENTENCE_TRANSFORMERS_AVAILABLE = False
     SentenceTransformer = None
 
-from rank_bm25 import BM25Okapi
-
 try:
     from groq import Groq
     GROQ_AVAILABLE = True
@@ -88,22 +110,22 @@ try:
 except Exception:
     OPENAI_AVAILABLE = False
 
-try:
-    import PyPDF2
-    PDF_AVAILABLE = True
-except Exception:
-    PDF_AVAILABLE = False
+import pdf_extract
+from pdf_extract import PDF_AVAILABLE
+from tokenizer import Tokenizer, TokenInterner, split_words
 
 
 # ============================================================================
 # PAGE CONFIG — Sidebar always expanded (hardcoded)
 # ============================================================================
-st.set_page_config(
-    page_title="JIIT AI Assistant",
-    page_icon="🎓",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+# Only when run standalone; inside app.py, imported mid-page, the app's page config applies
+if __name__ == "__main__":
+    st.set_page_config(
+        page_title="JIIT AI Assistant",
+        page_icon="🎓",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
 
 
 # ============================================================================
@@ -146,6 +168,24 @@ class Document:
         d['last_updated'] = self.last_updated.isoformat() if self.last_updated else None
         return d
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Document':
+        """
+        Rebuild a document from the output of ``to_dict``.
+        
+        Args:
+            data (Dict): Serialized document (extra keys are ignored)
+        
+        Returns:
+            Document: Document without embedding
+        """
+        return cls(
+            id=data['id'], url=data['url'], title=data['title'],
+            content=data['content'], doc_type=data['doc_type'],
+            metadata=data['metadata'],
+            last_updated=datetime.fromisoformat(data['last_updated']) if data.get('last_updated') else None
+        )
+
 
 # ============================================================================
 # CONFIGURATION
@@ -167,10 +207,15 @@ class Config:
     """
     # Directory structure for data persistence
     BASE_DIR = Path("jiit_data")
-    CACHE_DIR = BASE_DIR / "cache"  # Cached web pages
+    CACHE_DIR = BASE_DIR / "cache"  # Cached web pages (JSON backend)
+    CACHE_DB_PATH = BASE_DIR / "page_cache.sqlite3"  # Cached web pages (SQLite backend)
     FAISS_DIR = BASE_DIR / "faiss_index"  # Vector search index
+    EMBEDDING_CACHE_DIR = BASE_DIR / "embedding_cache"  # Embeddings keyed by model + text hash
     BM25_DIR = BASE_DIR / "bm25_index"  # Keyword search index
     DOCS_DIR = BASE_DIR / "documents"  # Processed documents
+    INDEX_DIR = BASE_DIR / "indexes"  # Versioned document + index sets; current.json names the live one
+    FRONTIER_PATH = BASE_DIR / "frontier.json"  # Crawled URLs with sitemap lastmod
+    SEMANTIC_CACHE_PATH = BASE_DIR / "answer_cache.npz"  # Past questions' embeddings and LLM answers
 
     # JIIT website configuration
     BASE_URL = "https://www.jiit.ac.in"
@@ -179,17 +224,58 @@ class Config:
     # Web scraping parameters
     MAX_PAGES = 1000  # Maximum pages to scrape
     CACHE_VALIDITY_HOURS = 24  # Cache expiration time
+    CACHE_BACKEND = "sqlite"  # Page cache store: "sqlite" (single file) or "json" (file per page)
     REQUEST_TIMEOUT = 15  # HTTP request timeout in seconds
-    REQUEST_DELAY = 0.1  # Delay between requests to avoid overloading server
+    CRAWL_WORKERS = 8  # Concurrent fetch threads (1 = sequential crawl)
+    MAX_CONNECTIONS_PER_HOST = 4  # Politeness limit: in-flight requests per host
+
+    # PDF extraction (runs in a separate process pool)
+    PDF_WORKERS = 2  # Worker processes for PDF text extraction
+    PDF_TIMEOUT = 60  # Seconds allowed per PDF document before giving up on remaining pages
+    PDF_PAGES_PER_TASK = 8  # Pages extracted per worker task (unit of streaming)
+    PDF_MAX_PAGES = 500  # Safety cap on pages read from a single PDF
+
+    # Ingest deduplication
+    DEDUP_SHINGLE_SIZE = 4  # Words per shingle for near-duplicate fingerprints
+    DEDUP_SIMHASH_DISTANCE = 6  # Max differing SimHash bits (of 64) to count as a near-duplicate
 
     # Embedding model configuration
     EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
     EMBEDDING_DIM = 384  # Dimension of embedding vectors
+    EMBEDDING_CACHE_DTYPE = "float16"  # Storage precision of cached embeddings ("float16" or "float32")
+
+    # Vector index backend
+    VECTOR_INDEX_TYPE = "auto"  # "flat", "hnsw", "ivfpq" or "auto" (by corpus size)
+    ANN_MIN_VECTORS = 50_000  # auto: below this, exact flat search is fast enough
+    IVFPQ_MIN_VECTORS = 500_000  # auto: from here on, compress with IVF-PQ instead of HNSW
+    HNSW_M = 32  # Graph neighbours per node
+    HNSW_EF_CONSTRUCTION = 200  # Build-time candidate list size
+    HNSW_EF_SEARCH = 64  # Default query-time candidate list size
+    HNSW_MAX_DEAD_FRACTION = 0.2  # Rebuild HNSW once this share of vectors has been removed
+    IVF_NPROBE = 16  # Default inverted lists probed per query
+    INDEX_MMAP = True  # Memory-map saved FAISS and BM25 indexes so worker processes share their pages
+
+    # Passage chunking for semantic search
+    CHUNK_SIZE = 1000  # Characters per embedded passage
+    CHUNK_OVERLAP = 200  # Characters shared by consecutive passages
 
     # Search parameters
     FAISS_TOP_K = 15  # Top results from semantic search
     BM25_TOP_K = 15  # Top results from keyword search
+    BM25_K1 = 1.5  # Term frequency saturation (rank_bm25 default)
+    BM25_B = 0.75  # Document length normalization (rank_bm25 default)
+    BM25_EPSILON = 0.25  # IDF floor for very common terms, as a fraction of the mean IDF
+    BM25_PRUNING = True  # MaxScore early termination in keyword search (same results, fewer postings)
+    TOKENIZER_STOPWORDS = False  # Drop English stopwords from keyword index and queries
+    TOKENIZER_STEMMING = False  # Reduce plurals ("fees" -> "fee") in keyword index and queries
+    BM25_MAX_SEGMENTS = 8  # Incremental updates beyond this many segments merge the newer ones
+    BM25_MERGE_DELETED_FRACTION = 0.25  # Rewrite the keyword index once this share of its documents is deleted
     FINAL_TOP_K = 8  # Final results after fusion
+    PARALLEL_RETRIEVAL = True  # Run the semantic and keyword legs of a query concurrently
+    SEARCH_WORKERS = 4  # Threads shared by all queries for retrieval legs
+    SEARCH_LEG_TIMEOUT = None  # Seconds before answering from the other leg alone (None = wait)
+    QUERY_CACHE_SIZE = 256  # Recent queries whose search results and answers are kept (0 = no caching)
+    QUERY_CACHE_TTL = 3600  # Seconds a cached result or answer stays valid
 
     # API keys from environment variables
     GROQ_API_KEY = os.getenv("GROQ_API_KEY")
@@ -211,6 +297,24 @@ class Config:
     # LLM generation parameters
     LLM_TEMPERATURE = 0.2  # Lower temperature for more focused responses
     LLM_MAX_TOKENS = 1200  # Maximum response length
+    STREAM_RENDER_INTERVAL = 0.05  # Seconds between redraws of an answer streaming into the chat
+
+    # Semantic answer cache (paraphrased questions reuse an earlier LLM answer)
+    SEMANTIC_CACHE_SIZE = 1000  # LLM answers kept; least recently used beyond this are evicted (0 = off)
+    SEMANTIC_CACHE_THRESHOLD = 0.9  # Cosine similarity of question embeddings needed to reuse an answer
+    # Both questions must name the same of these (and the same numbers): "B.Tech fees" / "M.Tech fees"
+    # embed closer than the threshold. Dots and hyphens are dropped first, so "B.Tech" is "btech"
+    SEMANTIC_CACHE_KEY_TERMS = (
+        "btech", "mtech", "mba", "bba", "bca", "mca", "bsc", "msc", "phd", "integrated", "dual",
+        "noida", "128", "62", "boys", "girls",
+    )
+    SEMANTIC_CACHE_TTL = 7 * 24 * 3600  # Seconds an answer may be reused (indexes changing also drops it)
+
+    # Warm-up (model and indexes loaded in the background, so the first question doesn't wait for them)
+    WARMUP_ON_START = True  # app.py starts the warm-up when the server starts, not when the chat page opens
+    WARMUP_QUERY = "B.Tech admission fees and placements"  # Encoded and searched once to warm kernels and pages
+    STATUS_POLL_INTERVAL = 1.0  # Seconds between the chat page's checks on warm-up or a background refresh
+    INDEX_VERSIONS_KEPT = 2  # Index versions kept on disk, the live one included; older ones are deleted
 
     @classmethod
     def setup_directories(cls) -> None:
@@ -223,26 +327,422 @@ class Config:
         for dir_path in [cls.CACHE_DIR, cls.FAISS_DIR, cls.BM25_DIR, cls.DOCS_DIR]:
             dir_path.mkdir(parents=True, exist_ok=True)
 
+    @classmethod
+    def for_index_version(cls, directory: Path) -> type:
+        """
+        This configuration, with documents and indexes stored under ``directory``.
+        
+        Args:
+            directory (Path): An index version directory (see ``IndexVersions``)
+        
+        Returns:
+            type: A ``Config`` subclass overriding ``FAISS_DIR``, ``BM25_DIR`` and ``DOCS_DIR``
+        """
+        return type(cls.__name__, (cls,), {
+            'FAISS_DIR': directory / "faiss_index",
+            'BM25_DIR': directory / "bm25_index",
+            'DOCS_DIR': directory / "documents",
+        })
+
+
+# ============================================================================
+# PAGE CACHE
+# ============================================================================
+
+class PageCache:
+    """
+    Storage interface for scraped page cache entries.
+    
+    An entry is a serialized Document plus its HTTP validators (``etag``,
+    ``last_modified``). Every backend also tracks when each entry was stored
+    or last revalidated, which drives ``CACHE_VALIDITY_HOURS``.
+    """
+    def get_many(self, keys: List[str]) -> Dict[str, Tuple[Dict[str, Any], float]]:
+        """
+        Bulk lookup.
+        
+        Returns:
+            Dict[str, Tuple[Dict, float]]: key -> (entry, stored-at UNIX time)
+            for every key that is present
+        """
+        raise NotImplementedError
+
+    def put_many(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        """Bulk insert or replace, stamping every entry with the current time."""
+        raise NotImplementedError
+
+    def touch_many(self, keys: List[str]) -> None:
+        """Restart the validity window of existing entries (after a 304)."""
+        raise NotImplementedError
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        return self.get_many([key]).get(key)
+
+    def put(self, key: str, entry: Dict[str, Any]) -> None:
+        self.put_many({key: entry})
+
+    def close(self) -> None:
+        pass
+
+
+class JSONPageCache(PageCache):
+    """Original layout: one ``<md5>.json`` file per page; the file mtime is the stored-at time."""
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def get_many(self, keys: List[str]) -> Dict[str, Tuple[Dict[str, Any], float]]:
+        found: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        for key in keys:
+            path = self.cache_dir / f"{key}.json"
+            try:
+                stored_at = path.stat().st_mtime
+                with open(path, 'r', encoding='utf-8') as f:
+                    found[key] = (json.load(f), stored_at)
+            except Exception:
+                continue
+        return found
+
+    def put_many(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        for key, entry in entries.items():
+            with open(self.cache_dir / f"{key}.json", 'w', encoding='utf-8') as f:
+                json.dump(entry, f, indent=2)
+
+    def touch_many(self, keys: List[str]) -> None:
+        for key in keys:
+            try:
+                os.utime(self.cache_dir / f"{key}.json")
+            except OSError:
+                continue
+
+
+class SQLitePageCache(PageCache):
+    """
+    Single-file page cache backed by stdlib ``sqlite3``.
+    
+    Entries are stored as zlib-compressed JSON blobs in one table, so a
+    cold start is a handful of sequential reads instead of a ``stat()`` and
+    ``open()`` per page. One connection is shared by all crawl threads and
+    guarded by a lock.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS pages (
+            key TEXT PRIMARY KEY,
+            stored_at REAL NOT NULL,
+            payload BLOB NOT NULL
+        )
+    """
+    # SQLite's default limit on host parameters is 999
+    BATCH_SIZE = 500
+
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(self.SCHEMA)
+        self._conn.commit()
+
+    @staticmethod
+    def _encode(entry: Dict[str, Any]) -> bytes:
+        return zlib.compress(json.dumps(entry, separators=(',', ':')).encode('utf-8'))
+
+    @staticmethod
+    def _decode(payload: bytes) -> Dict[str, Any]:
+        return json.loads(zlib.decompress(payload).decode('utf-8'))
+
+    def get_many(self, keys: List[str]) -> Dict[str, Tuple[Dict[str, Any], float]]:
+        found: Dict[str, Tuple[Dict[str, Any], float]] = {}
+        for start in range(0, len(keys), self.BATCH_SIZE):
+            batch = keys[start:start + self.BATCH_SIZE]
+            placeholders = ','.join('?' * len(batch))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT key, stored_at, payload FROM pages WHERE key IN ({placeholders})", batch
+                ).fetchall()
+            for key, stored_at, payload in rows:
+                try:
+                    found[key] = (self._decode(payload), stored_at)
+                except Exception:
+                    continue
+        return found
+
+    def put_many(self, entries: Dict[str, Dict[str, Any]], stored_at: Optional[float] = None) -> None:
+        if not entries:
+            return
+        now = time.time() if stored_at is None else stored_at
+        rows = [(key, now, self._encode(entry)) for key, entry in entries.items()]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO pages (key, stored_at, payload) VALUES (?, ?, ?)", rows
+            )
+
+    def touch_many(self, keys: List[str]) -> None:
+        if not keys:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany("UPDATE pages SET stored_at = ? WHERE key = ?", [(now, k) for k in keys])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def migrate_from_json(self, cache_dir: Path) -> int:
+        """
+        One-shot import of a ``JSONPageCache`` directory, keeping each file's mtime.
+        
+        Returns:
+            int: Number of entries imported
+        """
+        imported = 0
+        paths = sorted(cache_dir.glob("*.json")) if cache_dir.exists() else []
+        for start in range(0, len(paths), self.BATCH_SIZE):
+            rows = []
+            for path in paths[start:start + self.BATCH_SIZE]:
+                try:
+                    with open(path, 'r', encoding='utf-8') as f:
+                        rows.append((path.stem, path.stat().st_mtime, self._encode(json.load(f))))
+                except Exception:
+                    continue
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO pages (key, stored_at, payload) VALUES (?, ?, ?)", rows
+                )
+            imported += len(rows)
+        return imported
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def create_page_cache(config: Config) -> PageCache:
+    """
+    Build the page cache selected by ``Config.CACHE_BACKEND``.
+    
+    The first time the SQLite store is created next to an existing JSON
+    cache directory, the JSON entries are migrated into it so upgrading does
+    not throw away the cache.
+    """
+    if config.CACHE_BACKEND == "json":
+        return JSONPageCache(config.CACHE_DIR)
+    if config.CACHE_BACKEND != "sqlite":
+        raise ValueError(f"Unknown CACHE_BACKEND: {config.CACHE_BACKEND}")
+    is_new = not config.CACHE_DB_PATH.exists()
+    cache = SQLitePageCache(config.CACHE_DB_PATH)
+    if is_new:
+        cache.migrate_from_json(config.CACHE_DIR)
+    return cache
+
+
+# ============================================================================
+# PDF EXTRACTION
+# ============================================================================
+
+class PdfPageStream:
+    """
+    Iterable over ``(page_number, text)`` of one PDF, extracted in worker processes.
+    
+    Pages are extracted in batches of ``PDF_PAGES_PER_TASK`` that run in
+    parallel and are yielded in page order as soon as each batch is ready,
+    so callers can consume large circulars incrementally. If the document
+    exceeds ``PDF_TIMEOUT`` the remaining batches are cancelled, iteration
+    stops early and ``complete`` is left False.
+    
+    Attributes:
+        page_count (int): Total pages in the PDF (known once iteration starts)
+        complete (bool): True if every page up to ``PDF_MAX_PAGES`` was read
+    """
+    def __init__(self, extractor: 'PdfExtractor', content: bytes):
+        self.extractor = extractor
+        self.content = content
+        self.page_count = 0
+        self.complete = False
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        config = self.extractor.config
+        deadline = time.monotonic() + config.PDF_TIMEOUT
+        try:
+            self.page_count = self.extractor.run(pdf_extract.count_pages, self.content, deadline=deadline)
+            last_page = min(self.page_count, config.PDF_MAX_PAGES)
+            step = max(1, config.PDF_PAGES_PER_TASK)
+            batches = [self.extractor.submit(pdf_extract.extract_pages, self.content, start, start + step)
+                       for start in range(0, last_page, step)]
+            try:
+                for batch in batches:
+                    yield from batch.result(timeout=max(0.0, deadline - time.monotonic()))
+            finally:
+                for batch in batches:
+                    batch.cancel()
+            self.complete = last_page == self.page_count
+        except FutureTimeoutError:
+            # Not the builtin TimeoutError before Python 3.11
+            return
+
+
+class PdfExtractor:
+    """
+    Offloads PyPDF2 text extraction to a process pool.
+    
+    Crawl threads block on the pool's futures (which releases the GIL), so
+    HTML fetching and parsing continue on the other crawl threads while PDFs
+    are being parsed. Workers are started with ``spawn`` because forking a
+    process that is running crawl threads is unsafe. A task that has already
+    started cannot be interrupted; on timeout its result is simply discarded.
+    """
+    def __init__(self, config: Config):
+        self.config = config
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=max(1, self.config.PDF_WORKERS),
+                    mp_context=multiprocessing.get_context('spawn'),
+                )
+                atexit.register(self.shutdown)
+            return self._pool
+
+    def submit(self, fn: Any, *args: Any) -> Any:
+        try:
+            return self._get_pool().submit(fn, *args)
+        except (BrokenProcessPool, RuntimeError):
+            # A dead pool (e.g. a worker was OOM-killed) is replaced once
+            self.shutdown()
+            return self._get_pool().submit(fn, *args)
+
+    def run(self, fn: Any, *args: Any, deadline: Optional[float] = None) -> Any:
+        timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+        return self.submit(fn, *args).result(timeout=timeout)
+
+    def stream(self, content: bytes) -> PdfPageStream:
+        """Stream the text of a PDF page by page; see ``PdfPageStream``."""
+        return PdfPageStream(self, content)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is None:
+            return
+        if sys.version_info >= (3, 9):
+            pool.shutdown(wait=False, cancel_futures=True)
+        else:
+            # No cancel_futures; PdfPageStream cancels the batches it queued itself
+            pool.shutdown(wait=False)
+
 
 # ============================================================================
 # WEB SCRAPER
 # ============================================================================
 
+class UrlFrontier:
+    """
+    Persistent record of crawled URLs and the sitemap ``<lastmod>`` seen for each.
+    
+    Used by incremental recrawls to decide which URLs actually need fetching.
+    
+    Attributes:
+        path (Path): JSON file backing the frontier
+        entries (Dict): URL -> {'lastmod', 'doc_id', 'crawled_at'}
+    """
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except Exception:
+                self.entries = {}
+
+    def save(self) -> None:
+        """Write the frontier atomically so a crash never leaves a truncated file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f)
+        os.replace(tmp_path, self.path)
+
+    def needs_fetch(self, url: str, lastmod: Optional[str]) -> bool:
+        """
+        True if the URL is new, its lastmod moved, or the sitemap gives no lastmod.
+        
+        URLs without a lastmod are still fetched, but through the conditional
+        GET path, so unchanged pages cost a 304.
+        """
+        entry = self.entries.get(url)
+        return entry is None or lastmod is None or entry.get('lastmod') != lastmod
+
+    def missing(self, live_urls: List[str]) -> Dict[str, str]:
+        """
+        URLs recorded here that are no longer listed anywhere.
+        
+        Returns:
+            Dict[str, str]: URL -> document id
+        """
+        live = set(live_urls)
+        with self._lock:
+            return {url: entry['doc_id'] for url, entry in self.entries.items() if url not in live}
+
+    def apply(self, update: 'FrontierUpdate') -> None:
+        """Record a crawl's fetched and dropped URLs, then save."""
+        with self._lock:
+            for url in update.removed:
+                self.entries.pop(url, None)
+            self.entries.update(update.marks)
+        self.save()
+
+
+@dataclass
+class FrontierUpdate:
+    """
+    Frontier changes from one crawl, held back until its documents are published.
+    
+    Applying them earlier would let a failed or interrupted index build leave
+    the frontier claiming pages the live index has never seen, and the next
+    incremental crawl would skip them.
+    
+    Attributes:
+        marks (Dict): URL -> frontier entry for each successfully fetched page
+        removed (List[str]): URLs no longer listed anywhere
+    """
+    marks: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    removed: List[str] = field(default_factory=list)
+
+
 class EnhancedWebScraper:
     """
     Intelligent web scraper for JIIT website with caching and PDF support.
     
     Features:
-    - Automatic sitemap parsing
+    - Automatic sitemap parsing, keeping ``<lastmod>`` for incremental recrawls
+    - Bounded-concurrency crawling with a per-host politeness limit
     - Intelligent caching to minimize redundant requests
+    - Conditional GETs (ETag / Last-Modified) to revalidate stale cache entries
     - PDF document processing
     - Content classification
     - Progress tracking via callbacks
     
     Attributes:
         config (Config): Configuration object with scraping parameters
+        cache (PageCache): Page cache backend selected by ``Config.CACHE_BACKEND``
         session (requests.Session): Persistent HTTP session for efficiency
+            (crawl workers use their own, closed when the crawl ends)
     """
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+    STAT_KEYS = ('cache_hits', 'not_modified', 'full_fetches')
+    SITEMAP_NS = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
+
     def __init__(self, config: Config):
         """
         Initialize the web scraper with configuration.
@@ -251,13 +751,88 @@ class EnhancedWebScraper:
             config (Config): Configuration object containing scraping parameters
         """
         self.config = config
-        self.session = requests.Session()
+        self.frontier = UrlFrontier(config.FRONTIER_PATH)
+        self.cache = create_page_cache(config)
+        self.pdf_extractor = PdfExtractor(config)
+        self.session = self._new_session()
+        # requests.Session is not thread-safe, so crawl workers get their own (by thread id)
+        self._sessions: Dict[int, requests.Session] = {threading.get_ident(): self.session}
+        self._sessions_lock = threading.Lock()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_slots_lock = threading.Lock()
+        # Cache outcome counters, reset at the start of every crawl
+        self._stats_lock = threading.Lock()
+        self.stats: Dict[str, int] = dict.fromkeys(self.STAT_KEYS, 0)
+        # Cache writes/touches buffered by crawl workers until the next flush
+        self._pending_lock = threading.Lock()
+        self._pending_writes: Dict[str, Dict[str, Any]] = {}
+        self._pending_touches: List[str] = []
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self.stats = dict.fromkeys(self.STAT_KEYS, 0)
+
+    def get_cache_stats(self) -> Dict[str, int]:
+        """
+        Return cache outcome counters for the last crawl.
+        
+        Returns:
+            Dict[str, int]: ``cache_hits`` (served from a fresh cache entry),
+            ``not_modified`` (revalidated with a 304) and ``full_fetches``
+            (downloaded and parsed)
+        """
+        with self._stats_lock:
+            return dict(self.stats)
+
+    def _new_session(self) -> requests.Session:
+        session = requests.Session()
         # Set user agent to avoid being blocked
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
+        session.headers.update({'User-Agent': self.USER_AGENT})
+        return session
+
+    def _get_session(self) -> requests.Session:
+        """Return the calling thread's HTTP session, creating it on first use."""
+        thread_id = threading.get_ident()
+        with self._sessions_lock:
+            session = self._sessions.get(thread_id)
+            if session is None:
+                session = self._sessions[thread_id] = self._new_session()
+            return session
+
+    def _close_sessions(self, thread_ids: Iterable[int]) -> None:
+        """Close the sessions of finished crawl workers, releasing their pooled connections."""
+        with self._sessions_lock:
+            sessions = [self._sessions.pop(thread_id, None) for thread_id in thread_ids]
+        for session in sessions:
+            if session is not None and session is not self.session:
+                session.close()
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc
+        with self._host_slots_lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = threading.BoundedSemaphore(max(1, self.config.MAX_CONNECTIONS_PER_HOST))
+                self._host_slots[host] = slot
+            return slot
+
+    def _fetch(self, url: str, **kwargs: Any) -> requests.Response:
+        """
+        GET a URL while holding one of its host's politeness slots.
+        
+        At most ``Config.MAX_CONNECTIONS_PER_HOST`` requests are in flight
+        against a single host, however many crawl workers are running.
+        """
+        kwargs.setdefault('timeout', self.config.REQUEST_TIMEOUT)
+        with self._host_slot(url):
+            return self._get_session().get(url, **kwargs)
 
-    def scrape_website(self, force_refresh: bool = False, progress_callback: Optional[Any] = None) -> List[Document]:
+    def scrape_website(self, force_refresh: bool = False,
+                       progress_callback: Optional[Any] = None) -> Tuple[List[Document], FrontierUpdate]:
         """
         Main scraping method that crawls the JIIT website.
         
@@ -266,95 +841,196 @@ class EnhancedWebScraper:
             progress_callback (Optional): Function to call with progress updates
         
         Returns:
-            List[Document]: List of successfully scraped documents
+            Tuple[List[Document], FrontierUpdate]: Successfully scraped
+            documents, in URL discovery order regardless of which fetch
+            finished first, and the frontier changes to apply with
+            ``UrlFrontier.apply`` once they are published
         
         Process:
             1. Get all URLs from sitemap and critical pages
-            2. Scrape each URL (using cache when available)
+            2. Scrape each URL (using cache when available), up to
+               ``Config.CRAWL_WORKERS`` at a time
             3. Process and classify content
             4. Return list of Document objects
         """
         try:
             # Get list of URLs to scrape
-            urls = self._get_all_urls()
+            discovered = self._discover_urls()
+            urls = list(discovered)
             if progress_callback:
                 progress_callback(f"Found {len(urls)} URLs to process")
             
-            documents: List[Document] = []
-            total = min(len(urls), self.config.MAX_PAGES)
-            
-            # Scrape each URL
-            for i, url in enumerate(urls[:self.config.MAX_PAGES], 1):
-                try:
-                    # Update progress every 10 pages
-                    if progress_callback and i % 10 == 0:
-                        progress_callback(f"Processing {i}/{total} pages...")
-                    
-                    doc = self._scrape_page(url, force_refresh)
-                    if doc:
-                        documents.append(doc)
-                except Exception:
-                    # Skip failed pages and continue
-                    continue
+            self.reset_stats()
+            targets = urls[:self.config.MAX_PAGES]
+            results = self._crawl(targets, force_refresh, progress_callback)
+            documents: List[Document] = [doc for doc in results if doc]
+            update = self._frontier_update(targets, results, discovered, list(self.frontier.missing(targets)))
             
             if progress_callback:
-                progress_callback(f"✅ Successfully scraped {len(documents)} documents")
-            return documents
+                self._report_stats(len(documents), progress_callback)
+            return documents, update
         except Exception as e:
             if progress_callback:
                 progress_callback(f"❌ Error during scraping: {str(e)}")
-            return []
+            return [], FrontierUpdate()
+
+    def scrape_incremental(self, progress_callback: Optional[Any] = None
+                           ) -> Tuple[List[Document], List[str], FrontierUpdate]:
+        """
+        Recrawl only the URLs whose sitemap ``<lastmod>`` moved since the last crawl.
+        
+        New URLs and URLs without a lastmod are fetched too, the latter via a
+        conditional GET. Everything else is skipped without a request.
+        
+        Args:
+            progress_callback (Optional): Function to call with progress updates
+        
+        Returns:
+            Tuple[List[Document], List[str], FrontierUpdate]: Refetched
+            documents (possibly identical to the stored ones), ids of documents
+            whose URLs have disappeared from the sitemap, and the frontier
+            changes to apply once the result is published
+        """
+        discovered = self._discover_urls()
+        targets = list(discovered)[:self.config.MAX_PAGES]
+        to_fetch = [url for url in targets if self.frontier.needs_fetch(url, discovered[url])]
+        if progress_callback:
+            progress_callback(f"Found {len(targets)} URLs, {len(to_fetch)} new or modified")
+        
+        self.reset_stats()
+        results = self._crawl(to_fetch, force_refresh=True, progress_callback=progress_callback)
+        documents: List[Document] = [doc for doc in results if doc]
+        missing = self.frontier.missing(targets)
+        update = self._frontier_update(to_fetch, results, discovered, list(missing))
+        
+        if progress_callback:
+            self._report_stats(len(documents), progress_callback)
+        return documents, list(missing.values()), update
+
+    def _frontier_update(self, urls: List[str], results: List[Optional[Document]],
+                         lastmods: Dict[str, Optional[str]], removed: List[str]) -> FrontierUpdate:
+        crawled_at = datetime.now().isoformat()
+        # Failed fetches are left out so the next incremental crawl retries them
+        marks = {url: {'lastmod': lastmods.get(url), 'doc_id': doc.id, 'crawled_at': crawled_at}
+                 for url, doc in zip(urls, results) if doc}
+        return FrontierUpdate(marks, removed)
+
+    def _report_stats(self, doc_count: int, progress_callback: Any) -> None:
+        stats = self.get_cache_stats()
+        progress_callback(
+            f"✅ Successfully scraped {doc_count} documents "
+            f"({stats['cache_hits']} cached, {stats['not_modified']} unchanged, "
+            f"{stats['full_fetches']} fetched)"
+        )
+
+    def _crawl(self, urls: List[str], force_refresh: bool = False,
+               progress_callback: Optional[Any] = None) -> List[Optional[Document]]:
+        """
+        Scrape ``urls`` with a bounded worker pool.
+        
+        Returns:
+            List[Optional[Document]]: One slot per input URL (None for failed
+            or skipped pages), so the output order never depends on timing
+        """
+        total = len(urls)
+        results: List[Optional[Document]] = [None] * total
+        workers = max(1, min(self.config.CRAWL_WORKERS, total))
+        # One bulk read up front; cache writes are buffered and flushed in batches
+        doc_ids = [self._doc_id(url) for url in urls]
+        cached = self.cache.get_many(doc_ids)
+        worker_ids: set = set()
+
+        def scrape(i: int) -> Optional[Document]:
+            worker_ids.add(threading.get_ident())
+            try:
+                return self._scrape_with_cache(urls[i], doc_ids[i], cached.get(doc_ids[i]), force_refresh)
+            except Exception:
+                # Skip failed pages and continue
+                return None
 
-    def _get_all_urls(self) -> List[str]:
+        try:
+            if workers == 1:
+                for i in range(total):
+                    results[i] = scrape(i)
+                    # Update progress every 10 pages
+                    if (i + 1) % 10 == 0:
+                        self._flush_cache()
+                        if progress_callback:
+                            progress_callback(f"Processing {i + 1}/{total} pages...")
+                return results
+
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jiit-crawl") as pool:
+                futures = {pool.submit(scrape, i): i for i in range(total)}
+                # Progress is reported from this thread only, so Streamlit callbacks stay safe
+                for done, future in enumerate(as_completed(futures), 1):
+                    results[futures[future]] = future.result()
+                    if done % 10 == 0:
+                        self._flush_cache()
+                        if progress_callback:
+                            progress_callback(f"Processing {done}/{total} pages...")
+            return results
+        finally:
+            self._flush_cache()
+            # The pool's threads have exited; the calling thread keeps its session
+            worker_ids.discard(threading.get_ident())
+            self._close_sessions(worker_ids)
+
+    def _discover_urls(self) -> Dict[str, Optional[str]]:
         """
-        Collects all URLs to scrape from sitemap and critical pages.
+        Collects all URLs to scrape together with their sitemap ``<lastmod>``.
         
         Returns:
-            List[str]: Unique list of URLs to scrape
+            Dict[str, Optional[str]]: URL -> lastmod (None when the sitemap
+            does not provide one), in first-seen order
         
         Sources:
             - Critical pages (admissions, placements, etc.)
-            - Sitemap XML (up to 5 sub-sitemaps, 50 URLs each)
+            - Sitemap XML (up to 5 sub-sitemaps); ``MAX_PAGES`` bounds the total
         """
-        urls: set = set()
+        # dict keeps first-seen order, so the crawl order is stable across runs
+        urls: Dict[str, Optional[str]] = {}
         # Add critical pages first (always included)
-        urls.update(self._get_critical_urls())
+        urls.update(dict.fromkeys(self._get_critical_urls()))
         
         try:
             # Parse main sitemap
-            response = self.session.get(self.config.SITEMAP_URL, timeout=15)
+            response = self._fetch(self.config.SITEMAP_URL, timeout=15)
             root = ET.fromstring(response.content)
-            namespace = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
             
             # Check if sitemap contains sub-sitemaps
-            sitemaps = root.findall('.//ns:sitemap/ns:loc', namespace)
+            sitemaps = root.findall('.//ns:sitemap/ns:loc', self.SITEMAP_NS)
             if sitemaps:
                 # Parse up to 5 sub-sitemaps
                 for sitemap in sitemaps[:5]:
                     if sitemap.text:
-                        sub_urls = self._parse_sitemap(sitemap.text)
-                        urls.update(sub_urls[:50])  # Limit to 50 URLs per sitemap
+                        for url, lastmod in self._parse_sitemap(sitemap.text.strip()):
+                            urls[url] = lastmod or urls.get(url)
             else:
-                # No sub-sitemaps, parse main sitemap directly
-                urls.update(self._parse_sitemap(self.config.SITEMAP_URL))
+                # No sub-sitemaps, the main sitemap is the URL set
+                for url, lastmod in self._parse_urlset(root):
+                    urls[url] = lastmod or urls.get(url)
         except Exception:
             # If sitemap parsing fails, continue with critical URLs only
             pass
         
-        return list(urls)
+        return urls
 
-    def _parse_sitemap(self, sitemap_url: str) -> List[str]:
-        urls: List[str] = []
+    def _parse_sitemap(self, sitemap_url: str) -> List[Tuple[str, Optional[str]]]:
         try:
-            response = self.session.get(sitemap_url, timeout=15)
-            root = ET.fromstring(response.content)
-            namespace = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-            for url_elem in root.findall('.//ns:loc', namespace):
-                if url_elem.text:
-                    urls.append(url_elem.text)
+            response = self._fetch(sitemap_url, timeout=15)
+            return self._parse_urlset(ET.fromstring(response.content))
         except Exception:
-            pass
-        return urls
+            return []
+
+    def _parse_urlset(self, root: ET.Element) -> List[Tuple[str, Optional[str]]]:
+        entries: List[Tuple[str, Optional[str]]] = []
+        for url_elem in root.findall('.//ns:url', self.SITEMAP_NS):
+            loc = url_elem.find('ns:loc', self.SITEMAP_NS)
+            if loc is None or not loc.text:
+                continue
+            lastmod = url_elem.find('ns:lastmod', self.SITEMAP_NS)
+            entries.append((loc.text.strip(), lastmod.text.strip() if lastmod is not None and lastmod.text else None))
+        return entries
 
     def _get_critical_urls(self) -> List[str]:
         """
@@ -379,68 +1055,103 @@ class EnhancedWebScraper:
         ]
         return [urljoin(self.config.BASE_URL, p) for p in paths]
 
-    def _scrape_page(self, url: str, force_refresh: bool = False) -> Optional[Document]:
-        doc_id = hashlib.md5(url.encode()).hexdigest()
-        cache_path = self.config.CACHE_DIR / f"{doc_id}.json"
-        if not force_refresh and cache_path.exists():
-            cache_time = datetime.fromtimestamp(cache_path.stat().st_mtime)
+    @staticmethod
+    def _doc_id(url: str) -> str:
+        return hashlib.md5(url.encode()).hexdigest()
+
+    def _scrape_with_cache(self, url: str, doc_id: str, cached: Optional[Tuple[Dict[str, Any], float]],
+                           force_refresh: bool = False) -> Optional[Document]:
+        """
+        Fetch one page, reusing the cache whenever the server allows it.
+        
+        A cache entry younger than ``CACHE_VALIDITY_HOURS`` is returned as-is
+        (unless ``force_refresh``). Otherwise the stored ETag / Last-Modified
+        validators are sent as a conditional GET, and a 304 response returns
+        the cached document without downloading or parsing the page again.
+        
+        Args:
+            cached: ``(entry, stored_at)`` from the page cache, if any
+        """
+        entry, stored_at = cached if cached else (None, 0.0)
+        if entry and not force_refresh:
+            cache_time = datetime.fromtimestamp(stored_at)
             if datetime.now() - cache_time < timedelta(hours=self.config.CACHE_VALIDITY_HOURS):
-                try:
-                    with open(cache_path, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        return Document(
-                            id=data['id'], url=data['url'], title=data['title'],
-                            content=data['content'], doc_type=data['doc_type'],
-                            metadata=data['metadata'],
-                            last_updated=datetime.fromisoformat(data['last_updated']) if data['last_updated'] else None
-                        )
-                except Exception:
-                    pass
+                self._count('cache_hits')
+                return Document.from_dict(entry)
+        headers: Dict[str, str] = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
         try:
-            response = self.session.get(url, timeout=self.config.REQUEST_TIMEOUT)
+            response = self._fetch(url, headers=headers)
+            if response.status_code == 304 and entry:
+                # Unchanged upstream: restart the validity window and skip parsing
+                with self._pending_lock:
+                    self._pending_touches.append(doc_id)
+                self._count('not_modified')
+                return Document.from_dict(entry)
             if response.status_code != 200:
                 return None
+            self._count('full_fetches')
             if 'application/pdf' in response.headers.get('Content-Type', ''):
-                return self._process_pdf(url, response.content)
-            soup = BeautifulSoup(response.text, 'html.parser')
-            for tag in soup(['script', 'style', 'nav', 'footer', 'header']):
-                tag.decompose()
-            title = soup.find('title')
-            title_text = title.get_text().strip() if title else url.split('/')[-1]
-            content = self._extract_content(soup)
-            if not content or len(content) < 100:
-                return None
-            doc_type = self._classify_page(url, title_text, content)
-            metadata: Dict[str, Any] = {'url': url, 'doc_type': doc_type}
-            doc = Document(
-                id=doc_id, url=url, title=title_text, content=content,
-                doc_type=doc_type, metadata=metadata, last_updated=datetime.now()
-            )
-            with open(cache_path, 'w', encoding='utf-8') as f:
-                json.dump(doc.to_dict(), f, indent=2)
+                doc = self._process_pdf(url, response.content)
+            else:
+                doc = self._process_html(url, doc_id, response.text)
+            if doc:
+                self._queue_cache_write(doc, response)
             return doc
         except Exception:
             return None
 
+    def _process_html(self, url: str, doc_id: str, html: str) -> Optional[Document]:
+        soup = BeautifulSoup(html, 'html.parser')
+        for tag in soup(['script', 'style', 'nav', 'footer', 'header']):
+            tag.decompose()
+        title = soup.find('title')
+        title_text = title.get_text().strip() if title else url.split('/')[-1]
+        content = self._extract_content(soup)
+        if not content or len(content) < 100:
+            return None
+        doc_type = self._classify_page(url, title_text, content)
+        metadata: Dict[str, Any] = {'url': url, 'doc_type': doc_type}
+        return Document(
+            id=doc_id, url=url, title=title_text, content=content,
+            doc_type=doc_type, metadata=metadata, last_updated=datetime.now()
+        )
+
+    def _queue_cache_write(self, doc: Document, response: requests.Response) -> None:
+        """Buffer the document together with the HTTP validators needed to revalidate it."""
+        data = doc.to_dict()
+        data['etag'] = response.headers.get('ETag')
+        data['last_modified'] = response.headers.get('Last-Modified')
+        with self._pending_lock:
+            self._pending_writes[doc.id] = data
+
+    def _flush_cache(self) -> None:
+        with self._pending_lock:
+            writes, self._pending_writes = self._pending_writes, {}
+            touches, self._pending_touches = self._pending_touches, []
+        self.cache.put_many(writes)
+        self.cache.touch_many(touches)
+
     def _process_pdf(self, url: str, content: bytes) -> Optional[Document]:
         if not PDF_AVAILABLE:
             return None
         try:
-            pdf_file = io.BytesIO(content)
-            reader = PyPDF2.PdfReader(pdf_file)
-            text_parts: List[str] = []
-            for page in reader.pages[:30]:
-                text = page.extract_text()
-                if text:
-                    text_parts.append(text)
+            stream = self.pdf_extractor.stream(content)
+            text_parts: List[str] = [text for _, text in stream]
             if not text_parts:
                 return None
             full_text = '\n\n'.join(text_parts)
-            doc_id = hashlib.md5(url.encode()).hexdigest()
+            doc_id = self._doc_id(url)
             title = url.split('/')[-1]
             return Document(
-                id=doc_id, url=url, title=f"📄 {title}", content=full_text[:30000],
-                doc_type='pdf', metadata={'page_count': len(reader.pages)},
+                id=doc_id, url=url, title=f"📄 {title}", content=full_text,
+                doc_type='pdf',
+                metadata={'page_count': stream.page_count, 'pages_extracted': len(text_parts),
+                          'complete': stream.complete},
                 last_updated=datetime.now()
             )
         except Exception:
@@ -479,130 +1190,1907 @@ class EnhancedWebScraper:
         return 'general'
 
 
+# ============================================================================
+# DEDUPLICATION
+# ============================================================================
+
+class DocumentDeduplicator:
+    """
+    Ingest stage that collapses duplicate documents before they are indexed.
+    
+    Two passes, in crawl order (so critical pages win as canonical):
+    1. Exact duplicates: identical normalized URL or identical content hash
+    2. Near-duplicates: 64-bit SimHash over word shingles within
+       ``DEDUP_SIMHASH_DISTANCE`` bits of an already kept document
+    
+    Dropped documents are recorded on the canonical document as
+    ``metadata['aliases']`` so their URLs stay traceable. Input documents are
+    never modified: canonical documents are returned as copies carrying the
+    alias list rebuilt for this call.
+    
+    Attributes:
+        stats (Dict[str, int]): Counters from the last ``deduplicate`` call
+    """
+    HASH_BITS = 64
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.stats: Dict[str, int] = {}
+        # Pigeonhole: fingerprints within d bits share at least one of d + 1 bands exactly
+        self.bands = min(self.HASH_BITS, max(1, config.DEDUP_SIMHASH_DISTANCE + 1))
+
+    def deduplicate(self, documents: List[Document], progress_callback: Optional[Any] = None,
+                    removed_urls: Iterable[str] = ()) -> List[Document]:
+        """
+        Drop exact and near-duplicate documents.
+        
+        Aliases a document already carries (from an earlier crawl whose
+        duplicates are not in ``documents``) are kept, except URLs in
+        ``removed_urls`` and URLs crawled again, which are regrouped here.
+        
+        Args:
+            documents (List[Document]): Scraped documents, in crawl order
+            progress_callback (Optional): Function to call with a summary
+            removed_urls (Iterable[str]): URLs no longer listed anywhere
+        
+        Returns:
+            List[Document]: Canonical documents, order preserved
+        """
+        kept: List[Document] = []
+        duplicates: List[List[Document]] = []
+        by_url: Dict[str, int] = {}
+        by_hash: Dict[str, int] = {}
+        fingerprints: List[int] = []
+        bands: List[Dict[int, List[int]]] = [{} for _ in range(self.bands)]
+        exact = near = 0
+        max_distance = self.config.DEDUP_SIMHASH_DISTANCE
+        
+        for doc in documents:
+            url_key = self.normalize_url(doc.url)
+            content_hash = self.content_hash(doc.content)
+            canonical_idx = by_url.get(url_key)
+            if canonical_idx is None:
+                canonical_idx = by_hash.get(content_hash)
+            if canonical_idx is not None:
+                exact += 1
+                duplicates[canonical_idx].append(doc)
+                continue
+            fingerprint = self.simhash(doc.content)
+            canonical_idx = self._find_near(fingerprint, fingerprints, bands, max_distance)
+            if canonical_idx is not None:
+                near += 1
+                duplicates[canonical_idx].append(doc)
+                by_url[url_key] = canonical_idx
+                continue
+            for band, key in enumerate(self._band_keys(fingerprint)):
+                bands[band].setdefault(key, []).append(len(kept))
+            fingerprints.append(fingerprint)
+            by_url[url_key] = by_hash[content_hash] = len(kept)
+            kept.append(doc)
+            duplicates.append([])
+        
+        stale = {self.normalize_url(url) for url in removed_urls}
+        stale.update(self.normalize_url(doc.url) for doc in documents)
+        kept = [self._with_aliases(doc, group, stale) for doc, group in zip(kept, duplicates)]
+        
+        self.stats = {
+            'input': len(documents), 'kept': len(kept),
+            'exact_duplicates': exact, 'near_duplicates': near,
+            'embeddings_avoided': exact + near,
+        }
+        if progress_callback and (exact or near):
+            progress_callback(
+                f"🧹 Collapsed {exact} exact and {near} near-duplicate documents "
+                f"({exact + near} embeddings avoided)"
+            )
+        return kept
+
+    @staticmethod
+    def normalize_url(url: str) -> str:
+        """Lowercase scheme/host and drop fragments and trailing slashes."""
+        parsed = urlparse(url)
+        path = parsed.path.rstrip('/') or '/'
+        query = f"?{parsed.query}" if parsed.query else ''
+        return f"{parsed.scheme.lower()}://{parsed.netloc.lower()}{path}{query}"
+
+    @staticmethod
+    def content_hash(content: str) -> str:
+        normalized = ' '.join(content.lower().split())
+        return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+    def simhash(self, content: str) -> int:
+        """
+        64-bit SimHash of the document's word shingles.
+        
+        Each shingle is hashed with blake2b (stable across processes) and
+        every bit of the fingerprint is the majority vote of that bit over
+        all shingles.
+        """
+        words = split_words(content)
+        size = self.config.DEDUP_SHINGLE_SIZE
+        shingles = {' '.join(words[i:i + size]) for i in range(max(1, len(words) - size + 1))}
+        hashes = np.array(
+            [int.from_bytes(hashlib.blake2b(sh.encode('utf-8'), digest_size=8).digest(), 'little')
+             for sh in shingles],
+            dtype=np.uint64,
+        )
+        bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder='little')
+        votes = bits.sum(axis=0, dtype=np.int64) * 2 > len(hashes)
+        return int(np.packbits(votes, bitorder='little').view(np.uint64)[0])
+
+    def _band_keys(self, fingerprint: int) -> List[int]:
+        # The last band absorbs the remainder when 64 is not divisible by the band count
+        width = self.HASH_BITS // self.bands
+        keys = [(fingerprint >> (band * width)) & ((1 << width) - 1) for band in range(self.bands - 1)]
+        keys.append(fingerprint >> ((self.bands - 1) * width))
+        return keys
+
+    def _find_near(self, fingerprint: int, fingerprints: List[int],
+                   bands: List[Dict[int, List[int]]], max_distance: int) -> Optional[int]:
+        candidates = set()
+        for band, key in enumerate(self._band_keys(fingerprint)):
+            candidates.update(bands[band].get(key, ()))
+        for idx in sorted(candidates):
+            if bin(fingerprint ^ fingerprints[idx]).count('1') <= max_distance:
+                return idx
+        return None
+
+    def _with_aliases(self, canonical: Document, duplicates: List[Document], stale: set) -> Document:
+        # Documents can be shared with a live index, so the copy gets its own metadata dict
+        aliases: List[str] = []
+        for doc in [canonical] + duplicates:
+            carried = [url for url in doc.metadata.get('aliases', []) if self.normalize_url(url) not in stale]
+            for url in ([] if doc is canonical else [doc.url]) + carried:
+                if url != canonical.url and url not in aliases:
+                    aliases.append(url)
+        metadata = {key: value for key, value in canonical.metadata.items() if key != 'aliases'}
+        if aliases:
+            metadata['aliases'] = aliases
+        return replace(canonical, metadata=metadata)
+
+
 # ============================================================================
 # VECTOR STORE
 # ============================================================================
 
+class EmbeddingCache:
+    """
+    On-disk embedding cache keyed by (model name, text hash).
+    
+    Each model gets its own directory holding an append-only matrix of
+    vectors (memory-mapped for reads) and an id table whose row i is the
+    SHA-1 of the text embedded in row i. Rebuilds then only run the model on
+    text that was never embedded before.
+    
+    Rows are written before their keys, so after a crash any vectors without
+    a key are ignored and overwritten. Compaction writes a new generation of
+    both files and switches to it by atomically replacing ``meta.json``.
+    
+    Attributes:
+        hits (int): Texts served from the cache since construction
+        misses (int): Texts that had to be embedded
+    """
+    def __init__(self, config: Config, model_name: str):
+        self.config = config
+        self.model_name = model_name
+        self.dtype = np.dtype(config.EMBEDDING_CACHE_DTYPE)
+        self.cache_dir = config.EMBEDDING_CACHE_DIR / re.sub(r'[^A-Za-z0-9_.-]+', '_', model_name)
+        self.meta_path = self.cache_dir / "meta.json"
+        self.dim: Optional[int] = None
+        self.generation = 0
+        self.rows: Dict[str, int] = {}
+        self._vectors: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    @staticmethod
+    def text_key(text: str) -> str:
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def _paths(self, generation: int) -> Tuple[Path, Path]:
+        return (self.cache_dir / f"vectors-{generation}.bin", self.cache_dir / f"keys-{generation}.txt")
+
+    def _load(self) -> None:
+        try:
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('model') != self.model_name or meta.get('dtype') != self.dtype.name:
+                return
+            self.dim, self.generation = int(meta['dim']), int(meta['generation'])
+            vectors_path, keys_path = self._paths(self.generation)
+            with open(keys_path, 'r', encoding='utf-8') as f:
+                keys = f.read().split()
+            stored_rows = vectors_path.stat().st_size // (self.dim * self.dtype.itemsize)
+            keys = keys[:stored_rows]
+            self.rows = {key: row for row, key in enumerate(keys)}
+            self._remap()
+        except Exception:
+            self.dim, self.rows, self._vectors = None, {}, None
+
+    def _write_meta(self) -> None:
+        tmp_path = self.meta_path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'model': self.model_name, 'dim': self.dim, 'dtype': self.dtype.name,
+                       'generation': self.generation}, f)
+        os.replace(tmp_path, self.meta_path)
+
+    def _remap(self) -> None:
+        if not self.rows:
+            self._vectors = None
+            return
+        vectors_path, _ = self._paths(self.generation)
+        self._vectors = np.memmap(vectors_path, dtype=self.dtype, mode='r', shape=(len(self.rows), self.dim))
+
+    def encode(self, texts: List[str], encode_fn: Any) -> np.ndarray:
+        """
+        Return float32 embeddings for ``texts``, running ``encode_fn`` only on cache misses.
+        
+        Args:
+            texts (List[str]): Texts to embed
+            encode_fn: Callable mapping a list of texts to a 2-D array
+        
+        Returns:
+            np.ndarray: ``(len(texts), dim)`` float32 matrix
+        """
+        keys = [self.text_key(text) for text in texts]
+        with self._lock:
+            missing: Dict[str, str] = {}
+            for key, text in zip(keys, texts):
+                if key not in self.rows:
+                    missing.setdefault(key, text)
+            self.hits += sum(1 for key in keys if key not in missing)
+            self.misses += len(missing)
+            if missing:
+                vectors = np.asarray(encode_fn(list(missing.values())), dtype='float32')
+                self._append(list(missing), vectors)
+            if not texts:
+                return np.zeros((0, self.dim or self.config.EMBEDDING_DIM), dtype='float32')
+            rows = np.fromiter((self.rows[key] for key in keys), dtype=np.int64, count=len(keys))
+            return np.asarray(self._vectors[rows], dtype='float32')
+
+    def _append(self, keys: List[str], vectors: np.ndarray) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        if self.dim != vectors.shape[1]:
+            # First write (or the model's dimension changed): start a new generation
+            self.dim, self.rows, self._vectors = vectors.shape[1], {}, None
+            self.generation += 1
+            for path in self._paths(self.generation):
+                path.unlink(missing_ok=True)
+            self._write_meta()
+        vectors_path, keys_path = self._paths(self.generation)
+        with open(vectors_path, 'ab') as f:
+            # Drop rows left by an interrupted append before adding new ones
+            f.truncate(len(self.rows) * self.dim * self.dtype.itemsize)
+            f.write(np.ascontiguousarray(vectors, dtype=self.dtype).tobytes())
+        with open(keys_path, 'a', encoding='utf-8') as f:
+            f.write(''.join(f"{key}\n" for key in keys))
+        start = len(self.rows)
+        self.rows.update((key, start + i) for i, key in enumerate(keys))
+        self._remap()
+
+    def compact(self, live_texts: List[str]) -> None:
+        """Rewrite the cache keeping only ``live_texts`` once dead rows outnumber live ones."""
+        with self._lock:
+            live_keys = [key for key in dict.fromkeys(self.text_key(text) for text in live_texts)
+                         if key in self.rows]
+            if self._vectors is None or len(self.rows) <= 2 * len(live_keys):
+                return
+            vectors = np.array(self._vectors[[self.rows[key] for key in live_keys]])
+            old_paths = self._paths(self.generation)
+            self.generation += 1
+            vectors_path, keys_path = self._paths(self.generation)
+            vectors_path.write_bytes(vectors.tobytes())
+            keys_path.write_text(''.join(f"{key}\n" for key in live_keys), encoding='utf-8')
+            self._write_meta()
+            self._vectors = None
+            for path in old_paths:
+                path.unlink(missing_ok=True)
+            self.rows = {key: row for row, key in enumerate(live_keys)}
+            self._remap()
+
+
+def fsync_path(path: Path) -> None:
+    """
+    Flush a file, or a directory's entries, to disk.
+    
+    Best effort: where the OS refuses (directories and read-only handles on
+    Windows) the call does nothing.
+    """
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def split_passages(text: str, size: int, overlap: int) -> List[Tuple[int, int]]:
+    """
+    Split text into overlapping character windows aligned to whitespace.
+    
+    Args:
+        text (str): Text to split
+        size (int): Target window length in characters
+        overlap (int): Characters shared by consecutive windows
+    
+    Returns:
+        List[Tuple[int, int]]: ``(start, end)`` offsets covering the whole text
+    """
+    spans: List[Tuple[int, int]] = []
+    length = len(text)
+    start = 0
+    while start < length:
+        end = min(length, start + size)
+        if end < length:
+            # Prefer to cut at the last whitespace in the second half of the window
+            cut = text.rfind(' ', start + size // 2, end)
+            end = cut if cut > start else end
+        spans.append((start, end))
+        if end >= length:
+            break
+        next_start = max(start + 1, end - overlap)
+        # Start the next window on a word boundary
+        space = text.find(' ', next_start, end)
+        start = space + 1 if space != -1 else next_start
+    return spans or [(0, 0)]
+
+
+def create_vector_index(config: Config, vectors: np.ndarray) -> Tuple[Any, str]:
+    """
+    Create (and train, if needed) the FAISS index selected by ``VECTOR_INDEX_TYPE``.
+    
+    With ``"auto"`` the backend follows corpus size: exact flat search below
+    ``ANN_MIN_VECTORS``, HNSW up to ``IVFPQ_MIN_VECTORS``, IVF-PQ beyond.
+    IVF-PQ parameters are derived from the data: ``nlist`` ~ 4 * sqrt(n) and
+    one 8-bit sub-quantizer per ~4 dimensions. A corpus too small to train
+    IVF-PQ falls back to flat.
+    
+    Args:
+        config (Config): Configuration with index parameters
+        vectors (np.ndarray): Normalized vectors the index is built from
+    
+    Returns:
+        Tuple[Any, str]: Empty index ready for ``add_with_ids``, and its kind
+    """
+    n, dim = vectors.shape
+    kind = config.VECTOR_INDEX_TYPE
+    if kind == "auto":
+        kind = ("flat" if n < config.ANN_MIN_VECTORS
+                else "hnsw" if n < config.IVFPQ_MIN_VECTORS else "ivfpq")
+    # k-means wants ~39 training points per centroid for both IVF and 8-bit PQ codebooks
+    if kind == "ivfpq" and n < 39 * 256:
+        kind = "flat"
+    if kind == "flat":
+        return faiss.IndexIDMap2(faiss.IndexFlatIP(dim)), kind
+    if kind == "hnsw":
+        hnsw = faiss.IndexHNSWFlat(dim, config.HNSW_M, faiss.METRIC_INNER_PRODUCT)
+        hnsw.hnsw.efConstruction = config.HNSW_EF_CONSTRUCTION
+        hnsw.hnsw.efSearch = config.HNSW_EF_SEARCH
+        return faiss.IndexIDMap2(hnsw), kind
+    if kind == "ivfpq":
+        nlist = int(max(1, min(4 * np.sqrt(n), n // 39)))
+        sub_quantizers = next(m for m in range(max(1, dim // 4), 0, -1) if dim % m == 0)
+        ivf = faiss.IndexIVFPQ(faiss.IndexFlatIP(dim), dim, nlist, sub_quantizers, 8,
+                               faiss.METRIC_INNER_PRODUCT)
+        sample_size = min(n, max(nlist, 256) * 64)
+        sample = vectors[np.random.default_rng(0).choice(n, sample_size, replace=False)]
+        ivf.train(np.ascontiguousarray(sample))
+        ivf.nprobe = config.IVF_NPROBE
+        return ivf, kind
+    raise ValueError(f"Unknown VECTOR_INDEX_TYPE: {config.VECTOR_INDEX_TYPE}")
+
+
+class PassageTable(Mapping):
+    """
+    Read-only vector id -> ``(doc_id, start, end)`` mapping over sorted arrays.
+    
+    Loaded with ``np.load(mmap_mode='r')``, the arrays stay in the OS page
+    cache and are shared by every process serving the same index, instead
+    of each unpickling its own dict.
+    
+    Attributes:
+        vector_ids (np.ndarray): Sorted int64 vector ids
+        doc_ids (np.ndarray): Parent document id per row
+        spans (np.ndarray): ``(start, end)`` character span per row
+    """
+
+    def __init__(self, vector_ids: np.ndarray, doc_ids: np.ndarray, spans: np.ndarray):
+        self.vector_ids = vector_ids
+        self.doc_ids = doc_ids
+        self.spans = spans
+
+    def _row(self, vector_id: int) -> int:
+        row = int(np.searchsorted(self.vector_ids, vector_id))
+        if row < len(self.vector_ids) and self.vector_ids[row] == vector_id:
+            return row
+        return -1
+
+    def __getitem__(self, vector_id: int) -> Tuple[str, int, int]:
+        row = self._row(vector_id)
+        if row < 0:
+            raise KeyError(vector_id)
+        start, end = self.spans[row].tolist()
+        return str(self.doc_ids[row]), start, end
+
+    def __contains__(self, vector_id: object) -> bool:
+        return isinstance(vector_id, (int, np.integer)) and self._row(vector_id) >= 0
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.vector_ids.tolist())
+
+    def __len__(self) -> int:
+        return len(self.vector_ids)
+
+    def items(self) -> Iterator[Tuple[int, Tuple[str, int, int]]]:
+        for vector_id, doc_id, (start, end) in zip(self.vector_ids.tolist(), self.doc_ids.tolist(),
+                                                   self.spans.tolist()):
+            yield vector_id, (doc_id, start, end)
+
+
 class VectorStore:
-    def __init__(self, config: Config):
+    """
+    FAISS semantic index over document passages.
+    
+    Every document is split into overlapping passages of ``CHUNK_SIZE``
+    characters, and each passage is embedded, so content deep inside long
+    pages and PDFs is searchable. Passage hits are mapped back to their
+    parent document.
+    
+    Vectors live under stable int64 ids (an ``IndexIDMap2`` for flat and
+    HNSW, native ids for IVF-PQ), so single documents can be added, replaced
+    or removed without touching the rest of the corpus. HNSW cannot delete
+    vectors, so removed ones are dropped from the id table (and skipped at
+    search time) until ``HNSW_MAX_DEAD_FRACTION`` triggers a rebuild from
+    the stored vectors.
+    
+    On disk, each save writes a new generation of the index and id table,
+    then atomically replaces ``manifest.json`` to point at it. A crash
+    mid-write therefore leaves the previous generation fully intact.
+    
+    With ``INDEX_MMAP`` the saved generation is memory-mapped rather than
+    read into the heap: the FAISS index via ``IO_FLAG_MMAP_IFC`` and the id
+    table as ``.npy`` arrays (see ``PassageTable``). Loading is near-instant
+    and concurrent Streamlit workers share one copy through the page cache.
+    Mapped data is read-only, so the first add or remove reads a private
+    copy (``_materialize``).
+    
+    Attributes:
+        index: FAISS inner-product index (see ``create_vector_index``)
+        index_kind (str): "flat", "hnsw" or "ivfpq"
+        passages (Mapping[int, Tuple[str, int, int]]): vector id -> (doc id, start, end);
+            a ``PassageTable`` while mapped, a dict once modified
+        doc_vectors (Dict[str, List[int]]): doc id -> its vector ids (built on first modification)
+        version (int): Generation of the saved index currently loaded
+    
+    Args:
+        config (Config): Configuration; the index is saved in its ``FAISS_DIR``
+        shared (Optional[VectorStore]): Store whose embedding model, model lock and
+            embedding cache this one reuses (an index version being built beside it)
+    """
+    # Passages fetched per requested document, since several may share a parent
+    PASSAGE_OVERSAMPLE = 4
+    # Texts embedded per model call while building, so queries can encode in between
+    ENCODE_CHUNK = 256
+    MANIFEST = "manifest.json"
+
+    def __init__(self, config: Config, shared: Optional['VectorStore'] = None):
         self.config = config
-        self.embedding_model: Optional[SentenceTransformer] = None
+        if shared is not None:
+            self.embedding_model = shared.embedding_model
+            self.embedding_cache = shared.embedding_cache
+        else:
+            self.embedding_model: Optional[SentenceTransformer] = None
+            self.embedding_cache = EmbeddingCache(config, config.EMBEDDING_MODEL)
         self.index: Optional[Any] = None
-        self.doc_ids: List[str] = []
+        self.index_kind = "flat"
+        self.passages: Dict[int, Tuple[str, int, int]] = {}
+        self.doc_vectors: Dict[str, List[int]] = {}
+        self.next_id = 0
+        self.version = 0
+        # Whether ``self.index`` is a read-only mapping of the saved file
+        self._mapped_index = False
+        # Serializes loading and calling the model: its fast tokenizer fails under concurrent calls
+        self._model_lock = shared._model_lock if shared is not None else threading.Lock()
 
     def _init_model(self) -> None:
         if not SENTENCE_TRANSFORMERS_AVAILABLE:
             raise ImportError("sentence-transformers required")
         if self.embedding_model is None:
-            self.embedding_model = SentenceTransformer(self.config.EMBEDDING_MODEL)
+            with self._model_lock:
+                if self.embedding_model is None:
+                    self.embedding_model = SentenceTransformer(self.config.EMBEDDING_MODEL)
 
     def build_index(self, documents: List[Document], progress_callback: Optional[Any] = None) -> None:
-        self._init_model()
         if progress_callback:
             progress_callback("Generating embeddings...")
-        texts = [f"{doc.title}\n\n{doc.content[:1500]}" for doc in documents]
-        if self.embedding_model is None:
-            return
-        embeddings = self.embedding_model.encode(texts, show_progress_bar=False, batch_size=32)
-        dim = embeddings.shape[1]
-        self.index = faiss.IndexFlatIP(dim)
-        faiss.normalize_L2(embeddings)
-        self.index.add(embeddings)
-        self.doc_ids = [doc.id for doc in documents]
+        self.index, self._mapped_index = None, False
+        self.passages, self.doc_vectors, self.next_id = {}, {}, 0
+        texts = self._add(documents, progress_callback)
         self._save_index()
+        # A full build sees every live passage, so it is the place to drop stale cache rows
+        self.embedding_cache.compact(texts)
         if progress_callback:
-            progress_callback(f"✅ Built FAISS index with {len(documents)} documents")
+            progress_callback(f"✅ Built FAISS index with {len(documents)} documents ({len(self.passages)} passages)")
 
-    def search(self, query: str, top_k: int = 15) -> List[Tuple[str, float]]:
+    def add_documents(self, documents: List[Document], progress_callback: Optional[Any] = None) -> None:
+        """Add or replace documents by id and save."""
+        if self.index is None:
+            self._load_index()
+        self._remove([doc.id for doc in documents])
+        self._add(documents, progress_callback)
+        self._save_index()
+
+    def remove_documents(self, doc_ids: List[str]) -> None:
+        """Remove documents by id and save."""
+        if self.index is None:
+            self._load_index()
+        if self.index is not None and self._remove(doc_ids):
+            self._save_index()
+
+    def update_documents(self, changed: List[Document], removed_ids: List[str],
+                         progress_callback: Optional[Any] = None) -> bool:
+        """
+        Apply a crawl delta: replace ``changed`` documents and drop ``removed_ids``.
+        
+        Only passages of changed documents are embedded (and those usually
+        come from the embedding cache); other vectors are not touched.
+        
+        Returns:
+            bool: False if there is no index to update (caller should rebuild)
+        """
         if self.index is None:
             self._load_index()
         if self.index is None:
+            return False
+        if progress_callback:
+            progress_callback(f"Embedding {len(changed)} changed documents...")
+        self._remove([doc.id for doc in changed] + list(removed_ids))
+        self._add(changed, progress_callback)
+        self._save_index()
+        if progress_callback:
+            progress_callback(f"✅ Updated FAISS index ({len(changed)} changed, {len(removed_ids)} removed)")
+        return True
+
+    def _materialize(self) -> None:
+        """Swap memory-mapped index data for private, writable copies before modifying it."""
+        if self._mapped_index:
+            # Copy out of the mapping itself; the file may already be replaced by a newer generation
+            self.index = faiss.deserialize_index(faiss.serialize_index(self.index))
+            self._mapped_index = False
+        if not isinstance(self.passages, dict):
+            self.passages = dict(self.passages.items())
+            self.doc_vectors = {}
+            for vector_id, (doc_id, _, _) in self.passages.items():
+                self.doc_vectors.setdefault(doc_id, []).append(vector_id)
+
+    def _add(self, documents: List[Document], progress_callback: Optional[Any] = None) -> List[str]:
+        if not documents:
             return []
+        self._materialize()
+        embeddings, doc_ids, spans, texts = self._embed(documents, progress_callback)
+        if self.index is None:
+            self.index, self.index_kind = create_vector_index(self.config, embeddings)
+        ids = np.arange(self.next_id, self.next_id + len(doc_ids), dtype=np.int64)
+        self.next_id += len(doc_ids)
+        self.index.add_with_ids(embeddings, ids)
+        for vector_id, doc_id, (start, end) in zip(ids.tolist(), doc_ids, spans):
+            self.passages[vector_id] = (doc_id, start, end)
+            self.doc_vectors.setdefault(doc_id, []).append(vector_id)
+        return texts
+
+    def _remove(self, doc_ids: List[str]) -> int:
+        self._materialize()
+        vector_ids = [vid for doc_id in doc_ids for vid in self.doc_vectors.pop(doc_id, [])]
+        if not vector_ids or self.index is None:
+            return len(vector_ids)
+        for vector_id in vector_ids:
+            self.passages.pop(vector_id, None)
+        if self.index_kind == "hnsw":
+            dead = self.index.ntotal - len(self.passages)
+            if dead > self.config.HNSW_MAX_DEAD_FRACTION * self.index.ntotal:
+                self._rebuild_live()
+        else:
+            self.index.remove_ids(np.array(vector_ids, dtype=np.int64))
+        return len(vector_ids)
+
+    def _rebuild_live(self) -> None:
+        """Rebuild an HNSW index from its live vectors, dropping tombstoned ones."""
+        ids = faiss.vector_to_array(self.index.id_map)
+        vectors = self.index.index.reconstruct_n(0, self.index.ntotal)
+        live = np.isin(ids, np.fromiter(self.passages, dtype=np.int64, count=len(self.passages)))
+        vectors, ids = np.ascontiguousarray(vectors[live]), ids[live]
+        self.index, self.index_kind = create_vector_index(self.config, vectors)
+        if len(ids):
+            self.index.add_with_ids(vectors, ids)
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        # The model is only loaded when the cache misses
         self._init_model()
-        if self.embedding_model is None:
-            return []
-        query_embedding = self.embedding_model.encode([query])
+        chunks = []
+        for start in range(0, len(texts), self.ENCODE_CHUNK):
+            with self._model_lock:
+                chunks.append(self.embedding_model.encode(texts[start:start + self.ENCODE_CHUNK],
+                                                          show_progress_bar=False, batch_size=32))
+        return np.concatenate(chunks) if chunks else np.zeros((0, self.config.EMBEDDING_DIM), dtype='float32')
+
+    def _embed(self, documents: List[Document], progress_callback: Optional[Any] = None
+               ) -> Tuple[np.ndarray, List[str], List[Tuple[int, int]], List[str]]:
+        """
+        Embed every passage of ``documents`` through the embedding cache.
+        
+        Returns:
+            Tuple: normalized embeddings, parent doc id per row, span per row,
+            and the embedded text per row
+        """
+        texts: List[str] = []
+        doc_ids: List[str] = []
+        spans: List[Tuple[int, int]] = []
+        for doc in documents:
+            for start, end in split_passages(doc.content, self.config.CHUNK_SIZE, self.config.CHUNK_OVERLAP):
+                texts.append(f"{doc.title}\n\n{doc.content[start:end]}")
+                doc_ids.append(doc.id)
+                spans.append((start, end))
+        misses_before = self.embedding_cache.misses
+        embeddings = np.ascontiguousarray(self.embedding_cache.encode(texts, self._encode), dtype='float32')
+        faiss.normalize_L2(embeddings)
+        if progress_callback:
+            computed = self.embedding_cache.misses - misses_before
+            progress_callback(f"Embedded {computed} new passages, reused {len(texts) - computed} from cache")
+        return embeddings, doc_ids, spans, texts
+
+    def search(self, query: str, top_k: int = 15, ef_search: Optional[int] = None,
+               nprobe: Optional[int] = None) -> List[Tuple[str, float]]:
+        return [(doc_id, score) for doc_id, score, _ in self.search_passages(query, top_k, ef_search, nprobe)]
+
+    def encode_query(self, query: str) -> np.ndarray:
+        """Unit-length float32 embedding of ``query``, shape ``(1, dim)``."""
+        self._init_model()
+        with self._model_lock:
+            query_embedding = np.ascontiguousarray(self.embedding_model.encode([query]), dtype='float32')
         faiss.normalize_L2(query_embedding)
-        scores, indices = self.index.search(query_embedding, top_k)
-        results: List[Tuple[str, float]] = []
-        for idx, score in zip(indices[0], scores[0]):
-            if 0 <= idx < len(self.doc_ids):
-                results.append((self.doc_ids[idx], float(score)))
+        return query_embedding
+
+    def search_passages(self, query: str, top_k: int = 15, ef_search: Optional[int] = None,
+                        nprobe: Optional[int] = None,
+                        query_embedding: Optional[np.ndarray] = None) -> List[Tuple[str, float, Tuple[int, int]]]:
+        """
+        Semantic search returning each document's best-matching passage.
+        
+        Args:
+            query (str): Search query
+            top_k (int): Number of distinct documents to return
+            ef_search (Optional[int]): HNSW candidate list size for this query
+                (default ``HNSW_EF_SEARCH``); higher is slower but more accurate
+            nprobe (Optional[int]): IVF lists probed for this query (default ``IVF_NPROBE``)
+            query_embedding (Optional[np.ndarray]): ``encode_query(query)``, if
+                already computed
+        
+        Returns:
+            List[Tuple[str, float, Tuple[int, int]]]: ``(doc_id, score, span)``
+            for up to ``top_k`` distinct documents, best first
+        """
+        if self.index is None:
+            self._load_index()
+        if self.index is None:
+            return []
+        if query_embedding is None:
+            query_embedding = self.encode_query(query)
+        scores, ids = self.index.search(query_embedding, top_k * self.PASSAGE_OVERSAMPLE,
+                                        params=self._search_params(ef_search, nprobe))
+        results: List[Tuple[str, float, Tuple[int, int]]] = []
+        seen: set = set()
+        for vector_id, score in zip(ids[0].tolist(), scores[0]):
+            passage = self.passages.get(vector_id)
+            if passage is None or passage[0] in seen:
+                continue
+            doc_id, start, end = passage
+            seen.add(doc_id)
+            results.append((doc_id, float(score), (start, end)))
+            if len(results) == top_k:
+                break
         return results
 
-    def _save_index(self) -> None:
-        if self.index is not None:
-            faiss.write_index(self.index, str(self.config.FAISS_DIR / "index.faiss"))
-            with open(self.config.FAISS_DIR / "doc_ids.pkl", 'wb') as f:
-                pickle.dump(self.doc_ids, f)
+    def _search_params(self, ef_search: Optional[int], nprobe: Optional[int]) -> Optional[Any]:
+        # Per-call parameters leave the shared index untouched, so concurrent queries are safe
+        if self.index_kind == "hnsw" and ef_search:
+            return faiss.SearchParametersHNSW(efSearch=int(ef_search))
+        if self.index_kind == "ivfpq" and nprobe:
+            return faiss.SearchParametersIVF(nprobe=int(nprobe))
+        return None
+
+    def _save_index(self) -> None:
+        """Write a new generation of index + id table, then flip the manifest atomically."""
+        if self.index is None:
+            return
+        faiss_dir = self.config.FAISS_DIR
+        faiss_dir.mkdir(parents=True, exist_ok=True)
+        previous = self._read_manifest()
+        generation = max(self.version, previous.get('generation', 0) if previous else 0) + 1
+        manifest: Dict[str, Any] = {
+            'generation': generation, 'kind': self.index_kind, 'next_id': self.next_id,
+            'index': f"index-{generation}.faiss", 'vector_ids': f"vector_ids-{generation}.npy",
+            'doc_ids': f"doc_ids-{generation}.npy", 'spans': f"spans-{generation}.npy",
+        }
+        faiss.write_index(self.index, str(faiss_dir / manifest['index']))
+        vector_ids = np.array(sorted(self.passages), dtype=np.int64)
+        rows = [self.passages[vector_id] for vector_id in vector_ids.tolist()]
+        np.save(faiss_dir / manifest['vector_ids'], vector_ids)
+        np.save(faiss_dir / manifest['doc_ids'], np.array([row[0] for row in rows] or [""]))
+        np.save(faiss_dir / manifest['spans'], np.array([row[1:] for row in rows], dtype=np.int64).reshape(-1, 2))
+        # The files the manifest names must be on disk before it does, or a crash can leave it pointing at holes
+        for key in ('index', 'vector_ids', 'doc_ids', 'spans'):
+            fsync_path(faiss_dir / manifest[key])
+        fsync_path(faiss_dir)
+        tmp_path = faiss_dir / f"{self.MANIFEST}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, faiss_dir / self.MANIFEST)
+        fsync_path(faiss_dir)
+        self.version = generation
+        # Older generations (and the pre-manifest layout) are no longer referenced
+        current = set(manifest.values()) | {self.MANIFEST}
+        for path in faiss_dir.iterdir():
+            if path.name not in current and path.suffix in ('.faiss', '.pkl', '.npy'):
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError:
+                    pass  # Still mapped by a reader on a platform that forbids unlinking it
+
+    def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.config.FAISS_DIR / self.MANIFEST, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception:
+            return None
+
+    def _load_index(self) -> None:
+        manifest = self._read_manifest()
+        faiss_dir = self.config.FAISS_DIR
+        try:
+            self._mapped_index = False
+            if manifest and 'vector_ids' in manifest:
+                mmap_mode = 'r' if self.config.INDEX_MMAP else None
+                index = faiss.read_index(str(faiss_dir / manifest['index']),
+                                         faiss.IO_FLAG_MMAP_IFC if self.config.INDEX_MMAP else 0)
+                vector_ids = np.load(faiss_dir / manifest['vector_ids'], mmap_mode=mmap_mode)
+                self.passages = PassageTable(
+                    vector_ids,
+                    np.load(faiss_dir / manifest['doc_ids'], mmap_mode=mmap_mode)[:len(vector_ids)],
+                    np.load(faiss_dir / manifest['spans'], mmap_mode=mmap_mode),
+                )
+                self.doc_vectors = {}
+                self.next_id, self.index_kind = manifest['next_id'], manifest['kind']
+                self.version = manifest['generation']
+                self._mapped_index = self.config.INDEX_MMAP
+            else:
+                if manifest:
+                    # Generation written before the .npy id table
+                    index = faiss.read_index(str(faiss_dir / manifest['index']))
+                    with open(faiss_dir / manifest['ids'], 'rb') as f:
+                        data = pickle.load(f)
+                    self.passages, self.next_id = data['passages'], data['next_id']
+                    self.index_kind = data.get('kind', "flat")
+                    self.version = manifest['generation']
+                else:
+                    index = self._load_legacy_index()
+                self.doc_vectors = {}
+                for vector_id, (doc_id, _, _) in self.passages.items():
+                    self.doc_vectors.setdefault(doc_id, []).append(vector_id)
+            self.index = index
+        except Exception:
+            self.index, self._mapped_index = None, False
+
+    def _load_legacy_index(self) -> Any:
+        """Wrap an ``index.faiss`` + ``doc_ids.pkl`` pair from before the manifest layout."""
+        legacy = faiss.read_index(str(self.config.FAISS_DIR / "index.faiss"))
+        with open(self.config.FAISS_DIR / "doc_ids.pkl", 'rb') as f:
+            data = pickle.load(f)
+        if isinstance(data, list):
+            # Pre-chunking index: one vector per document from its first 1500 chars
+            doc_ids, spans = data, [(0, 1500)] * len(data)
+        else:
+            doc_ids, spans = data['doc_ids'], data['spans']
+        index = faiss.IndexIDMap2(faiss.IndexFlatIP(legacy.d))
+        self.index_kind = "flat"
+        if legacy.ntotal:
+            index.add_with_ids(legacy.reconstruct_n(0, legacy.ntotal),
+                               np.arange(legacy.ntotal, dtype=np.int64))
+        self.passages = {i: (doc_id, start, end) for i, (doc_id, (start, end)) in enumerate(zip(doc_ids, spans))}
+        self.next_id = len(doc_ids)
+        return index
+
+
+# ============================================================================
+# KEYWORD SEARCH
+# ============================================================================
+
+class ColumnFile:
+    """
+    Versioned container of named numpy columns that can be memory-mapped.
+
+    Layout: ``MAGIC``, uint32 format version, uint32 header length, a JSON
+    header (caller fields plus the column directory), then every column
+    aligned to ``ALIGN`` bytes. Files are written to a temporary path and
+    renamed into place, so readers never see a partial file.
+    """
+    MAGIC = b"JIITBM25"
+    # Bump whenever the layout or scoring changes; files of another version are rebuilt
+    VERSION = 2
+    ALIGN = 64
+
+    @classmethod
+    def _align(cls, size: int) -> int:
+        return -(-size // cls.ALIGN) * cls.ALIGN
+
+    @classmethod
+    def write(cls, path: Path, header: Dict[str, Any], columns: Dict[str, np.ndarray]) -> None:
+        columns = {name: np.ascontiguousarray(column) for name, column in columns.items()}
+        layout: Dict[str, Dict[str, Any]] = {}
+        offset = 0
+        for name, column in columns.items():
+            layout[name] = {'dtype': column.dtype.str, 'shape': list(column.shape), 'offset': offset}
+            offset += cls._align(column.nbytes)
+        encoded = json.dumps({**header, 'columns': layout}).encode('utf-8')
+        # Column offsets are relative to the data start, which is aligned as well
+        data_start = cls._align(len(cls.MAGIC) + 8 + len(encoded))
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(cls.MAGIC)
+            f.write(np.array([cls.VERSION, len(encoded)], dtype='<u4').tobytes())
+            f.write(encoded)
+            for name, column in columns.items():
+                f.seek(data_start + layout[name]['offset'])
+                f.write(column.tobytes())
+            f.truncate(data_start + offset)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def read(cls, path: Path, mmap: bool = True) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        """
+        Read a column file.
+
+        Args:
+            path (Path): File written by ``write``
+            mmap (bool): Map columns read-only instead of reading them into memory
+
+        Returns:
+            Tuple[Dict[str, Any], Dict[str, np.ndarray]]: Header fields and columns
+
+        Raises:
+            ValueError: If the file is not a column file of the current ``VERSION``
+        """
+        with open(path, 'rb') as f:
+            prefix = f.read(len(cls.MAGIC) + 8)
+            if len(prefix) < len(cls.MAGIC) + 8 or not prefix.startswith(cls.MAGIC):
+                raise ValueError(f"{path} is not a BM25 index file")
+            version, header_len = np.frombuffer(prefix[len(cls.MAGIC):], dtype='<u4').tolist()
+            if version != cls.VERSION:
+                raise ValueError(f"{path} has BM25 format version {version}, expected {cls.VERSION}")
+            header = json.loads(f.read(header_len).decode('utf-8'))
+        data_start = cls._align(len(cls.MAGIC) + 8 + header_len)
+        buffer = np.memmap(path, dtype=np.uint8, mode='r') if mmap else np.fromfile(path, dtype=np.uint8)
+        columns: Dict[str, np.ndarray] = {}
+        for name, spec in header.pop('columns').items():
+            dtype = np.dtype(spec['dtype'])
+            count = int(np.prod(spec['shape'], dtype=np.int64))
+            start = data_start + spec['offset']
+            columns[name] = buffer[start:start + count * dtype.itemsize].view(dtype).reshape(spec['shape'])
+        return header, columns
+
+
+class TermVocabulary(Mapping):
+    """
+    Read-only term -> term id mapping over a memory-mapped string table.
+
+    Terms are stored as one UTF-8 blob with offsets, in term id order, plus
+    a permutation listing term ids in sorted order, so lookups are a binary
+    search and loading does not build a dict of the whole vocabulary. Terms
+    added since the table was written are kept in a small ``extra`` list
+    and get the ids that follow it.
+
+    Attributes:
+        blob (np.ndarray): Concatenated UTF-8 bytes of the table's terms
+        offsets (np.ndarray): Term ``i`` is ``blob[offsets[i]:offsets[i + 1]]``
+        order (np.ndarray): Table term ids sorted by term
+        extra (List[str]): Terms appended after the table
+        name (Optional[str]): File the table was saved to, if any
+    """
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray, order: np.ndarray, extra: Iterable[str] = ()):
+        self.blob = blob
+        self.offsets = offsets
+        self.order = order
+        self.extra = list(extra)
+        self.base_size = len(offsets) - 1
+        self._extra = {term: self.base_size + i for i, term in enumerate(self.extra)}
+        self.name: Optional[str] = None
+        # Plain views for the binary search; indexing through np.memmap costs several times more
+        self._bytes = memoryview(np.asarray(blob))
+        self._offsets = np.asarray(offsets)
+        self._order = np.asarray(order)
+
+    @classmethod
+    def from_terms(cls, terms: List[str]) -> "TermVocabulary":
+        """Build a table from ``terms`` listed in term id order."""
+        encoded = [term.encode('utf-8') for term in terms]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(term) for term in encoded], out=offsets[1:])
+        # UTF-8 byte order is code point order, so this matches the bytewise search below
+        order = np.array(sorted(range(len(terms)), key=terms.__getitem__), dtype=np.int64)
+        return cls(np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets, order)
+
+    def extended(self, terms: List[str]) -> "TermVocabulary":
+        """A vocabulary with ``terms`` appended; the table itself is shared."""
+        vocabulary = TermVocabulary(self.blob, self.offsets, self.order, self.extra + terms)
+        vocabulary.name = self.name
+        return vocabulary
+
+    def columns(self) -> Dict[str, np.ndarray]:
+        return {'terms': self.blob, 'term_offsets': self.offsets, 'term_order': self.order}
+
+    def _term(self, term_id: int) -> bytes:
+        return self._bytes[self._offsets[term_id]:self._offsets[term_id + 1]].tobytes()
+
+    def __getitem__(self, term: str) -> int:
+        if term in self._extra:
+            return self._extra[term]
+        key = term.encode('utf-8')
+        order = self._order
+        lo, hi = 0, len(order)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(order[mid]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(order) and self._term(order[lo]) == key:
+            return int(order[lo])
+        raise KeyError(term)
+
+    def __iter__(self) -> Iterator[str]:
+        blob = self.blob.tobytes()
+        offsets = self.offsets.tolist()
+        for i in range(self.base_size):
+            yield blob[offsets[i]:offsets[i + 1]].decode('utf-8')
+        yield from self.extra
+
+    def __len__(self) -> int:
+        return self.base_size + len(self.extra)
+
+
+class BM25Segment:
+    """
+    Immutable postings of one batch of documents.
+
+    Term ids are the owning ``BM25Index``'s global ids. ``terms`` lists the
+    ids present in this segment in ascending order, and the CSR postings of
+    ``terms[t]`` are rows ``indptr[t]:indptr[t + 1]`` of ``doc_idx``/``tf``,
+    with documents ascending. A forward copy (``doc_ptr``/``doc_terms``, in
+    each document's first-occurrence order) lets deletions decrement
+    document frequencies and merges rebuild postings without re-tokenizing.
+
+    Attributes:
+        terms (np.ndarray): Global term ids in the segment, ascending
+        indptr (np.ndarray): Postings offsets per local term
+        doc_idx (np.ndarray): Local document index of each posting
+        tf (np.ndarray): Term frequency of each posting
+        doc_len (np.ndarray): Tokens per document
+        doc_ids (np.ndarray): Document id per local document
+        doc_ptr (np.ndarray): Forward entries of document ``d`` are ``doc_ptr[d]:doc_ptr[d + 1]``
+        doc_terms (np.ndarray): Global term id of each forward entry
+        max_impact (np.ndarray): Largest ``tf * (k1 + 1) / (tf + norm)`` per local term,
+            with norms computed for ``avgdl``
+        avgdl (float): Mean document length ``max_impact`` was computed for
+        name (Optional[str]): File the segment was saved to, if any
+    """
+    # Postings scored per step while computing max_impact, to bound temporary memory
+    IMPACT_BLOCK = 1 << 20
+
+    def __init__(self, terms: np.ndarray, indptr: np.ndarray, doc_idx: np.ndarray, tf: np.ndarray,
+                 doc_len: np.ndarray, doc_ids: np.ndarray, doc_ptr: np.ndarray, doc_terms: np.ndarray,
+                 max_impact: np.ndarray, avgdl: float):
+        self.terms, self.indptr, self.doc_idx, self.tf = terms, indptr, doc_idx, tf
+        self.doc_len, self.doc_ids, self.doc_ptr, self.doc_terms = doc_len, doc_ids, doc_ptr, doc_terms
+        self.max_impact, self.avgdl = max_impact, avgdl
+        self.name: Optional[str] = None
+
+    @classmethod
+    def build(cls, doc_ptr: np.ndarray, doc_terms: np.ndarray, doc_tf: np.ndarray, doc_ids: List[str],
+              avgdl: float, k1: float, b: float) -> "BM25Segment":
+        """
+        Build a segment from forward entries (global term id and frequency per document).
+
+        Args:
+            doc_ptr (np.ndarray): Forward entries of document ``d`` are ``doc_ptr[d]:doc_ptr[d + 1]``
+            doc_terms (np.ndarray): Global term id of each entry
+            doc_tf (np.ndarray): Term frequency of each entry
+            doc_ids (List[str]): Document ids
+            avgdl (float): Mean document length to compute ``max_impact`` for
+            k1 (float): BM25 k1
+            b (float): BM25 b
+        """
+        terms, local = np.unique(doc_terms, return_inverse=True)
+        order = np.argsort(local, kind='stable')
+        indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(local, minlength=len(terms)), out=indptr[1:])
+        doc_of = np.repeat(np.arange(len(doc_ids), dtype=np.int32), np.diff(doc_ptr))
+        lengths = np.concatenate([[0], np.cumsum(doc_tf, dtype=np.int64)])
+        doc_len = lengths[doc_ptr[1:]] - lengths[doc_ptr[:-1]]
+        # Nearly all term frequencies are tiny, so store them in the narrowest type that fits
+        tf = doc_tf[order].astype(np.min_scalar_type(int(doc_tf.max()) if len(doc_tf) else 0))
+        segment = cls(terms.astype(np.int64), indptr, doc_of[order], tf, doc_len,
+                      np.array(doc_ids, dtype=str), doc_ptr.astype(np.int64),
+                      doc_terms.astype(np.int32), np.zeros(0), avgdl)
+        segment.max_impact = segment._max_impacts(k1 * (1 - b + b * doc_len / avgdl) if avgdl else doc_len, k1)
+        return segment
+
+    def _max_impacts(self, norm: np.ndarray, k1: float) -> np.ndarray:
+        term_count = len(self.terms)
+        impacts = np.zeros(term_count)
+        term = 0
+        while term < term_count:
+            # Whole terms per block, at least one even if its postings exceed IMPACT_BLOCK
+            stop = max(term + 1, int(np.searchsorted(self.indptr, self.indptr[term] + self.IMPACT_BLOCK, 'right')) - 1)
+            lo, hi = self.indptr[term], self.indptr[stop]
+            freqs = self.tf[lo:hi].astype(np.float64)
+            weights = freqs * (k1 + 1) / (freqs + norm[self.doc_idx[lo:hi]])
+            impacts[term:stop] = np.maximum.reduceat(weights, self.indptr[term:stop] - lo)
+            term = stop
+        return impacts
+
+    def __len__(self) -> int:
+        return len(self.doc_len)
+
+    def local(self, term_id: int) -> int:
+        """Row of global ``term_id`` in this segment's postings, or -1."""
+        row = int(np.searchsorted(self.terms, term_id))
+        return row if row < len(self.terms) and self.terms[row] == term_id else -1
+
+    def forward_tf(self) -> np.ndarray:
+        """Term frequency of each forward entry, recovered from the postings."""
+        order = np.argsort(np.searchsorted(self.terms, self.doc_terms), kind='stable')
+        forward = np.empty(len(order), dtype=np.int64)
+        forward[order] = self.tf
+        return forward
+
+    def save(self, path: Path) -> None:
+        ColumnFile.write(path, {'avgdl': self.avgdl}, {
+            'terms': self.terms, 'indptr': self.indptr, 'doc_idx': self.doc_idx, 'tf': self.tf,
+            'doc_len': self.doc_len, 'doc_ids': self.doc_ids, 'doc_ptr': self.doc_ptr,
+            'doc_terms': self.doc_terms, 'max_impact': self.max_impact,
+        })
+        self.name = path.name
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> "BM25Segment":
+        header, columns = ColumnFile.read(path, mmap)
+        segment = cls(avgdl=header['avgdl'], **columns)
+        segment.name = path.name
+        return segment
+
+
+class BM25Index:
+    """
+    Okapi BM25 over segmented inverted indexes with CSR postings.
+
+    Scores use the same formula, parameters and floating-point operation
+    order as ``rank_bm25.BM25Okapi`` (including its ``epsilon * average_idf``
+    floor for negative IDF), so a freshly built index gives bit-identical
+    scores, but a query only touches the postings of its own terms instead
+    of every document.
+
+    ``top_k(..., prune=True)`` adds MaxScore dynamic pruning on top. Each
+    term's largest possible contribution (``max_impact`` times its IDF) is
+    precomputed. Terms are scored in descending order of that bound. Once
+    the bounds of the remaining terms add up to less than the current k-th
+    best score, no unseen document can reach the top k. The remaining
+    (low-IDF, long-postings) terms, such as "jiit" or "student", are then
+    only looked up for the surviving candidates.
+
+    Documents live in immutable ``BM25Segment``s. ``updated`` appends changed
+    documents as a new segment and tombstones the replaced and removed ones,
+    maintaining document frequencies, document count and total length as it
+    goes, so a small recrawl costs milliseconds. Once there are more than
+    ``max_segments`` segments the newer ones are merged into one, and once
+    ``max_deleted_fraction`` of all documents are tombstones everything is
+    rewritten as a single segment, equal to a fresh build.
+
+    ``save`` writes each segment once, plus a small state file with document
+    frequencies and tombstones (see ``ColumnFile``). ``load`` memory-maps all
+    of them, so opening even a large index takes milliseconds and its pages
+    are shared between processes.
+
+    Documents are addressed by position: segment order, then order within
+    the segment. Positions of tombstoned documents are never returned.
+
+    Attributes:
+        vocab (TermVocabulary): Term -> global term id
+        segments (List[BM25Segment]): Postings, oldest first
+        live (List[Optional[np.ndarray]]): Per segment, which documents are live (None: all)
+        df (np.ndarray): Live document frequency per global term id
+        doc_count (int): Live documents
+        avgdl (float): Mean length of live documents
+        average_idf (float): Mean IDF over terms in live documents
+        analyzer (str): Tokenizer signature the documents were tokenized with
+    """
+    # Relative slack on pruning decisions, so bounds summed in a different order never prune a true hit
+    PRUNE_SLACK = 1e-9
+    # Below this many postings an exhaustive pass is cheaper than MaxScore's bookkeeping
+    PRUNE_MIN_POSTINGS = 50000
+    STATE_FILE = "bm25_index.bin"
+
+    def __init__(self, vocab: TermVocabulary, segments: List[BM25Segment], live: List[Optional[np.ndarray]],
+                 df: np.ndarray, k1: float = 1.5, b: float = 0.75, epsilon: float = 0.25,
+                 max_segments: int = 8, max_deleted_fraction: float = 0.25, analyzer: str = "",
+                 average_idf: Optional[float] = None):
+        self.vocab, self.segments, self.live, self.df = vocab, segments, live, df
+        self.k1, self.b, self.epsilon = k1, b, epsilon
+        self.analyzer = analyzer
+        self.max_segments, self.max_deleted_fraction = max_segments, max_deleted_fraction
+        self.offsets = np.cumsum([0] + [len(segment) for segment in segments])
+        self.doc_count = 0
+        self.total_len = 0
+        for segment, mask in zip(segments, live):
+            self.doc_count += len(segment) if mask is None else int(np.count_nonzero(mask))
+            self.total_len += int(segment.doc_len.sum() if mask is None else segment.doc_len[mask].sum())
+        self.avgdl = self.total_len / self.doc_count if self.doc_count else 0.0
+        self.average_idf = self._average_idf() if average_idf is None else average_idf
+        # Length normalization of each document, the query-independent half of the BM25 denominator
+        self.norms = [self.k1 * (1 - self.b + self.b * segment.doc_len / self.avgdl) if self.avgdl
+                      else np.zeros(len(segment)) for segment in segments]
+        self.generation = 0
+        self._locator: Optional[Dict[str, int]] = None
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        return {'k1': self.k1, 'b': self.b, 'epsilon': self.epsilon, 'analyzer': self.analyzer,
+                'max_segments': self.max_segments, 'max_deleted_fraction': self.max_deleted_fraction}
+
+    @classmethod
+    def build(cls, corpus: Iterable[List[str]], doc_ids: Optional[List[str]] = None,
+              **params: Any) -> "BM25Index":
+        """Index tokenized documents; document ``i`` of the corpus gets position ``i``."""
+        return cls.from_term_counts((Counter(tokens) for tokens in corpus), doc_ids, **params)
+
+    @classmethod
+    def from_term_counts(cls, term_counts: Iterable[Dict[str, int]], doc_ids: Optional[List[str]] = None,
+                         **params: Any) -> "BM25Index":
+        """
+        Index documents given as term -> frequency dicts (e.g. ``BM25Okapi.doc_freqs``).
+
+        Term ids follow first appearance, as ``BM25Okapi`` builds its IDF
+        table, so the IDF average (and the epsilon floor) match it exactly.
+        Dicts are consumed one at a time and kept only as interned ids.
+        ``doc_ids`` default to the document positions as strings.
+        """
+        interner = TokenInterner()
+        doc_ptr, doc_terms, doc_tf = interner.encode_counts(term_counts)
+        if doc_ids is None:
+            doc_ids = [str(i) for i in range(len(doc_ptr) - 1)]
+        return cls._from_forward(interner.tokens, doc_ptr, doc_terms.astype(np.int64), doc_tf, doc_ids, **params)
+
+    @classmethod
+    def _from_forward(cls, terms: List[str], doc_ptr: np.ndarray, doc_terms: np.ndarray, doc_tf: np.ndarray,
+                      doc_ids: List[str], **params: Any) -> "BM25Index":
+        """Single-segment index over forward entries whose term ids index ``terms``."""
+        df = np.bincount(doc_terms, minlength=len(terms)).astype(np.int64)
+        lengths = np.concatenate([[0], np.cumsum(doc_tf, dtype=np.int64)])
+        total_len = int(lengths[-1])
+        avgdl = total_len / len(doc_ids) if len(doc_ids) else 0.0
+        k1, b = params.get('k1', 1.5), params.get('b', 0.75)
+        segment = BM25Segment.build(doc_ptr, doc_terms, doc_tf, doc_ids, avgdl, k1, b)
+        return cls(TermVocabulary.from_terms(terms), [segment], [None], df, **params)
+
+    def _average_idf(self) -> float:
+        # BM25Okapi._calc_idf over every term with a live document: math.log per distinct
+        # document frequency and a sequential (cumsum) sum in term id order, so the value is identical
+        df = self.df[self.df > 0]
+        if not len(df):
+            return 0.0
+        values, inverse = np.unique(df, return_inverse=True)
+        n = self.doc_count
+        idf = np.array([math.log(n - freq + 0.5) - math.log(freq + 0.5) for freq in values.tolist()])[inverse]
+        return float(np.cumsum(idf)[-1]) / len(idf)
+
+    def _idf(self, term_id: int) -> float:
+        freq = int(self.df[term_id])
+        if freq == 0:
+            return 0.0
+        idf = math.log(self.doc_count - freq + 0.5) - math.log(freq + 0.5)
+        return self.epsilon * self.average_idf if idf < 0 else idf
+
+    def __len__(self) -> int:
+        return self.doc_count
+
+    def doc_id(self, position: int) -> str:
+        segment = int(np.searchsorted(self.offsets, position, 'right')) - 1
+        return str(self.segments[segment].doc_ids[position - self.offsets[segment]])
+
+    def _query(self, query_tokens: List[str]) -> List[Tuple[int, float]]:
+        """``(term_id, idf)`` per query token that can score, in query order (repeats kept)."""
+        query: List[Tuple[int, float]] = []
+        for token in query_tokens:
+            term_id = self.vocab.get(token)
+            if term_id is not None:
+                idf = self._idf(term_id)
+                if idf != 0:
+                    query.append((term_id, idf))
+        return query
+
+    def get_scores(self, query_tokens: List[str]) -> np.ndarray:
+        """BM25 score per position, equal to ``BM25Okapi.get_scores`` (tombstones score 0)."""
+        query = self._query(query_tokens)
+        scores = np.zeros(int(self.offsets[-1]))
+        for number, segment in enumerate(self.segments):
+            segment_scores = scores[self.offsets[number]:self.offsets[number + 1]]
+            self._accumulate(number, [(segment.local(term_id), idf) for term_id, idf in query], segment_scores)
+            if self.live[number] is not None:
+                segment_scores[~self.live[number]] = 0
+        return scores
+
+    def _accumulate(self, number: int, query: List[Tuple[int, float]], scores: np.ndarray) -> None:
+        segment, norm = self.segments[number], self.norms[number]
+        for row, idf in query:
+            if row < 0:
+                continue
+            lo, hi = segment.indptr[row], segment.indptr[row + 1]
+            docs = segment.doc_idx[lo:hi]
+            freqs = segment.tf[lo:hi].astype(np.float64)
+            # Repeated query terms count again, as in BM25Okapi
+            scores[docs] += idf * (freqs * (self.k1 + 1) / (freqs + norm[docs]))
+
+    def top_k(self, query_tokens: List[str], k: int, prune: bool = False,
+              stats: Optional[Dict[str, int]] = None) -> List[Tuple[int, float]]:
+        """
+        Best ``k`` live documents with a positive score, best first.
+
+        Uses a partial selection rather than sorting every score. Equal
+        scores are ordered by descending position, as a stable
+        ``argsort(scores)[::-1]`` would. Pruned and exhaustive searches
+        return identical results.
+
+        Args:
+            query_tokens (List[str]): Tokenized query
+            k (int): Number of results
+            prune (bool): Use MaxScore early termination
+            stats (Optional[Dict[str, int]]): If given, receives ``postings``,
+                the number of postings scored or looked up
+
+        Returns:
+            List[Tuple[int, float]]: ``(position, score)`` pairs; see ``doc_id``
+        """
+        query = self._query(query_tokens)
+        positions: List[np.ndarray] = []
+        scores: List[np.ndarray] = []
+        postings = 0
+        for number in range(len(self.segments)):
+            docs, doc_scores, touched = self._segment_top_k(number, query, k, prune)
+            positions.append(docs.astype(np.int64) + self.offsets[number])
+            scores.append(doc_scores)
+            postings += touched
+        if stats is not None:
+            stats['postings'] = postings
+        if not positions:
+            return []
+        candidates, candidate_scores = np.concatenate(positions), np.concatenate(scores)
+        order = np.lexsort((-candidates, -candidate_scores))[:k]
+        return [(int(candidates[i]), float(candidate_scores[i])) for i in order]
+
+    def _segment_top_k(self, number: int, query: List[Tuple[int, float]], k: int,
+                       prune: bool) -> Tuple[np.ndarray, np.ndarray, int]:
+        """Live documents of one segment that may be in the overall top ``k``, with exact scores."""
+        segment, live = self.segments[number], self.live[number]
+        local = [(segment.local(term_id), idf) for term_id, idf in query]
+        local = [(row, idf) for row, idf in local if row >= 0]
+        postings = int(sum(segment.indptr[row + 1] - segment.indptr[row] for row, _ in local))
+        # Pruning relies on partial scores only growing, which a negative IDF floor would break
+        if prune and k > 0 and postings >= self.PRUNE_MIN_POSTINGS and all(idf > 0 for _, idf in local):
+            candidates, postings = self._maxscore_candidates(number, local, k)
+            scores = self._score_docs(number, local, candidates)
+            postings += len(candidates) * len(local)
+        else:
+            dense = np.zeros(len(segment))
+            self._accumulate(number, local, dense)
+            candidates = np.flatnonzero(dense > 0)
+            if live is not None:
+                candidates = candidates[live[candidates]]
+            scores = dense[candidates]
+        positive = scores > 0
+        candidates, scores = candidates[positive], scores[positive]
+        if len(candidates) > k > 0:
+            cutoff = len(candidates) - k
+            kth = np.partition(scores, cutoff)[cutoff]
+            # Keep every tie with the k-th score so the final tie-break decides
+            keep = scores >= kth
+            candidates, scores = candidates[keep], scores[keep]
+        return candidates, scores, postings
+
+    def _maxscore_candidates(self, number: int, query: List[Tuple[int, float]], k: int) -> Tuple[np.ndarray, int]:
+        """
+        MaxScore: find a small set of live documents guaranteed to contain the segment's top ``k``.
+
+        Returns:
+            Tuple[np.ndarray, int]: Candidate document indices (ascending) and
+            postings scored or looked up
+        """
+        segment, norm, live = self.segments[number], self.norms[number], self.live[number]
+        multiplicity = Counter(row for row, _ in query)
+        idf = dict(query)
+        # Impacts only grow when avgdl grows past the one max_impact was computed for
+        scale = max(1.0, self.avgdl / segment.avgdl) if segment.avgdl else 1.0
+        bound = {row: idf[row] * min(self.k1 + 1, segment.max_impact[row] * scale) * count
+                 for row, count in multiplicity.items()}
+        rows = sorted(multiplicity, key=bound.__getitem__, reverse=True)
+        # remaining[i]: most that rows[i:] can add to any document's score
+        remaining = [0.0] * (len(rows) + 1)
+        for i in range(len(rows) - 1, -1, -1):
+            remaining[i] = remaining[i + 1] + bound[rows[i]]
+        scores = np.zeros(len(segment))
+        candidates = np.zeros(0, dtype=segment.doc_idx.dtype)
+        postings = 0
+        essential = True
+        threshold = 0.0
+        for i, row in enumerate(rows):
+            lo, hi = segment.indptr[row], segment.indptr[row + 1]
+            docs, freqs = segment.doc_idx[lo:hi], segment.tf[lo:hi]
+            if essential:
+                postings += len(docs)
+                candidates = np.union1d(candidates, docs if live is None else docs[live[docs]])
+            else:
+                # Drop candidates that cannot reach the k-th score even with every remaining term
+                candidates = candidates[(scores[candidates] + remaining[i]) * (1 + self.PRUNE_SLACK) >= threshold]
+                postings += len(candidates)
+                found_rows = np.minimum(np.searchsorted(docs, candidates), len(docs) - 1)
+                found = docs[found_rows] == candidates
+                docs, freqs = candidates[found], freqs[found_rows[found]]
+            freqs = freqs.astype(np.float64)
+            scores[docs] += multiplicity[row] * idf[row] * (freqs * (self.k1 + 1) / (freqs + norm[docs]))
+            if len(candidates) >= k:
+                cutoff = len(candidates) - k
+                threshold = np.partition(scores[candidates], cutoff)[cutoff]
+            # Documents outside every list scored so far can score at most remaining[i + 1]
+            if essential and remaining[i + 1] * (1 + self.PRUNE_SLACK) < threshold:
+                essential = False
+        if len(candidates) > k:
+            candidates = candidates[scores[candidates] * (1 + self.PRUNE_SLACK) >= threshold]
+        return candidates, postings
+
+    def _score_docs(self, number: int, query: List[Tuple[int, float]], docs: np.ndarray) -> np.ndarray:
+        """Exact BM25 scores of ``docs`` (ascending), summed in query order like ``get_scores``."""
+        segment, norm = self.segments[number], self.norms[number]
+        scores = np.zeros(len(docs))
+        for row, idf in query:
+            if not len(docs):
+                break
+            lo, hi = segment.indptr[row], segment.indptr[row + 1]
+            postings = segment.doc_idx[lo:hi]
+            found_rows = np.minimum(np.searchsorted(postings, docs), len(postings) - 1)
+            found = postings[found_rows] == docs
+            freqs = segment.tf[lo:hi][found_rows[found]].astype(np.float64)
+            scores[found] += idf * (freqs * (self.k1 + 1) / (freqs + norm[docs[found]]))
+        return scores
+
+    def _doc_locator(self) -> Dict[str, int]:
+        """Live document id -> position, built on first use."""
+        if self._locator is None:
+            self._locator = {}
+            for number, segment in enumerate(self.segments):
+                live = self.live[number]
+                for row, doc_id in enumerate(segment.doc_ids.tolist()):
+                    if live is None or live[row]:
+                        self._locator[doc_id] = int(self.offsets[number]) + row
+        return self._locator
+
+    def updated(self, removed_ids: Iterable[str], added: List[Tuple[str, Dict[str, int]]]) -> "BM25Index":
+        """
+        Return a new index with ``removed_ids`` deleted and ``added`` documents added or replaced.
+
+        Replaced and removed documents are tombstoned and their terms'
+        document frequencies decremented; added documents become a new
+        segment. Only ``added`` is tokenized; other segments are shared
+        with this index. May merge segments (see class docstring).
+
+        Args:
+            removed_ids (Iterable[str]): Ids of documents to delete
+            added (List[Tuple[str, Dict[str, int]]]): ``(doc_id, term counts)``
+                of new or changed documents
+        """
+        locator = dict(self._doc_locator())
+        live = list(self.live)
+        df = np.array(self.df, dtype=np.int64)
+        total_len, doc_count = self.total_len, self.doc_count
+        for doc_id in set(removed_ids) | {doc_id for doc_id, _ in added}:
+            position = locator.pop(doc_id, None)
+            if position is None:
+                continue
+            number = int(np.searchsorted(self.offsets, position, 'right')) - 1
+            row = position - int(self.offsets[number])
+            segment = self.segments[number]
+            if live[number] is self.live[number]:
+                # Copy on write: tombstones of the shared (possibly mapped) mask stay untouched
+                live[number] = (np.ones(len(segment), dtype=bool) if live[number] is None
+                                else np.array(live[number]))
+            live[number][row] = False
+            df[segment.doc_terms[segment.doc_ptr[row]:segment.doc_ptr[row + 1]]] -= 1
+            total_len -= int(segment.doc_len[row])
+            doc_count -= 1
+        segments = list(self.segments)
+        vocab = self.vocab
+        if added:
+            # Term ids of this batch, so each distinct term is looked up in the vocabulary once
+            term_ids: Dict[str, int] = {}
+            new_terms: List[str] = []
+            doc_terms: List[int] = []
+            doc_tf: List[int] = []
+            doc_ptr = [0]
+            for _, counts in added:
+                for term, count in counts.items():
+                    term_id = term_ids.get(term)
+                    if term_id is None:
+                        term_id = vocab.get(term)
+                        if term_id is None:
+                            term_id = len(vocab) + len(new_terms)
+                            new_terms.append(term)
+                        term_ids[term] = term_id
+                    doc_terms.append(term_id)
+                    doc_tf.append(count)
+                doc_ptr.append(len(doc_terms))
+            vocab = vocab.extended(new_terms)
+            df = np.concatenate([df, np.zeros(len(new_terms), dtype=np.int64)])
+            np.add.at(df, np.array(doc_terms, dtype=np.int64), 1)
+            total_len += sum(doc_tf)
+            doc_count += len(added)
+            segments.append(BM25Segment.build(np.array(doc_ptr, dtype=np.int64), np.array(doc_terms, dtype=np.int64),
+                                              np.array(doc_tf, dtype=np.int64), [doc_id for doc_id, _ in added],
+                                              total_len / doc_count, self.k1, self.b))
+            live.append(None)
+            for row, (doc_id, _) in enumerate(added):
+                locator[doc_id] = int(self.offsets[-1]) + row
+        index = BM25Index(vocab, segments, live, df, **self.params)
+        index.generation = self.generation
+        index._locator = locator
+        return index._merged_if_needed()
+
+    def _merged_if_needed(self) -> "BM25Index":
+        slots = int(self.offsets[-1])
+        if slots and slots - self.doc_count > self.max_deleted_fraction * slots:
+            return self.merged(full=True)
+        if len(self.segments) > self.max_segments:
+            # A partial merge leaves two segments
+            return self.merged(full=self.max_segments < 2)
+        return self
+
+    def merged(self, full: bool = True) -> "BM25Index":
+        """
+        Rewrite segments without their tombstoned documents.
+
+        Args:
+            full (bool): Merge everything into one segment with a fresh
+                vocabulary (same as building from scratch); otherwise merge
+                every segment after the first, keeping term ids
+        """
+        first = 0 if full else 1
+        parts_terms: List[np.ndarray] = []
+        parts_tf: List[np.ndarray] = []
+        lengths: List[np.ndarray] = []
+        doc_ids: List[str] = []
+        for number in range(first, len(self.segments)):
+            segment, live = self.segments[number], self.live[number]
+            rows = np.arange(len(segment)) if live is None else np.flatnonzero(live)
+            starts, counts = segment.doc_ptr[rows], np.diff(segment.doc_ptr)[rows]
+            # Forward entries of the kept documents, in document order
+            entries = np.repeat(starts - np.concatenate([[0], np.cumsum(counts)[:-1]]), counts) + np.arange(counts.sum())
+            parts_terms.append(segment.doc_terms[entries].astype(np.int64))
+            parts_tf.append(segment.forward_tf()[entries])
+            lengths.append(counts)
+            doc_ids.extend(segment.doc_ids[rows].tolist())
+        doc_terms = np.concatenate(parts_terms) if parts_terms else np.zeros(0, dtype=np.int64)
+        doc_tf = np.concatenate(parts_tf) if parts_tf else np.zeros(0, dtype=np.int64)
+        doc_ptr = np.concatenate([[0], np.cumsum(np.concatenate(lengths) if lengths else [], dtype=np.int64)])
+        if full:
+            # Renumber terms by first appearance, exactly as a fresh build would
+            used, first_seen = np.unique(doc_terms, return_index=True)
+            used = used[np.argsort(first_seen)]
+            renumber = np.zeros(len(self.df), dtype=np.int64)
+            renumber[used] = np.arange(len(used))
+            all_terms = list(self.vocab)
+            index = BM25Index._from_forward([all_terms[term_id] for term_id in used.tolist()], doc_ptr,
+                                            renumber[doc_terms], doc_tf, doc_ids, **self.params)
+        else:
+            avgdl = self.avgdl
+            tail = BM25Segment.build(doc_ptr, doc_terms, doc_tf, doc_ids, avgdl, self.k1, self.b)
+            index = BM25Index(self.vocab, [self.segments[0], tail], [self.live[0], None], self.df,
+                              average_idf=self.average_idf, **self.params)
+        index.generation = self.generation
+        return index
+
+    def save(self, directory: Path) -> None:
+        """
+        Write new segments and the vocabulary table if needed, then the state file.
+
+        Files no longer referenced by the state file are deleted afterwards.
+        """
+        directory.mkdir(parents=True, exist_ok=True)
+        try:
+            # Continue after an index saved by someone else, so its files are never overwritten in place
+            saved = ColumnFile.read(directory / self.STATE_FILE)[0]['generation']
+        except (OSError, ValueError, KeyError):
+            saved = 0
+        self.generation = max(self.generation, saved) + 1
+        for number, segment in enumerate(self.segments):
+            if segment.name is None:
+                segment.save(directory / f"segment-{self.generation}-{number}.bin")
+        if self.vocab.name is None:
+            ColumnFile.write(directory / f"vocab-{self.generation}.bin", {}, self.vocab.columns())
+            self.vocab.name = f"vocab-{self.generation}.bin"
+        live = [np.ones(len(segment), dtype=bool) if mask is None else mask
+                for segment, mask in zip(self.segments, self.live)]
+        header = {
+            'k1': self.k1, 'b': self.b, 'epsilon': self.epsilon, 'analyzer': self.analyzer,
+            'generation': self.generation,
+            'average_idf': self.average_idf, 'vocab': self.vocab.name, 'extra_terms': self.vocab.extra,
+            'segments': [segment.name for segment in self.segments],
+        }
+        ColumnFile.write(directory / self.STATE_FILE, header, {
+            'df': self.df, 'live': np.concatenate(live) if live else np.zeros(0, dtype=bool),
+        })
+        referenced = set(header['segments']) | {self.vocab.name}
+        for path in list(directory.glob("segment-*.bin")) + list(directory.glob("vocab-*.bin")):
+            if path.name not in referenced:
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError:
+                    pass  # Still mapped by a reader on a platform that forbids unlinking it
+
+    @classmethod
+    def load(cls, directory: Path, mmap: bool = True, **params: Any) -> "BM25Index":
+        """
+        Open an index written by ``save``.
+
+        Args:
+            directory (Path): Directory holding the state file
+            mmap (bool): Map files read-only instead of reading them into memory
+            **params: Index parameters; BM25 parameters and the analyzer must
+                match the saved ones
+
+        Raises:
+            ValueError: If a file has another format version or the index was
+                built with different BM25 parameters or analyzer
+        """
+        header, columns = ColumnFile.read(directory / cls.STATE_FILE, mmap)
+        for name in ('k1', 'b', 'epsilon', 'analyzer'):
+            if name in params and params[name] != header.get(name):
+                raise ValueError(f"BM25 index was built with {name}={header.get(name)!r}, not {params[name]!r}")
+        _, table = ColumnFile.read(directory / header['vocab'], mmap)
+        vocab = TermVocabulary(table['terms'], table['term_offsets'], table['term_order'], header['extra_terms'])
+        vocab.name = header['vocab']
+        segments = [BM25Segment.load(directory / name, mmap) for name in header['segments']]
+        live: List[Optional[np.ndarray]] = []
+        start = 0
+        for segment in segments:
+            mask = columns['live'][start:start + len(segment)]
+            live.append(None if mask.all() else mask)
+            start += len(segment)
+        params = {**params, 'k1': header['k1'], 'b': header['b'], 'epsilon': header['epsilon'],
+                  'analyzer': header.get('analyzer', "")}
+        index = cls(vocab, segments, live, columns['df'], average_idf=header['average_idf'], **params)
+        index.generation = header['generation']
+        return index
+
+
+class ExcerptIndex:
+    """
+    Token positions of every document, for picking excerpts without rescanning text.
+    
+    An excerpt is the ``length``-character window, at a multiple of
+    ``step``, that contains the most distinct query terms. Each document's
+    tokens are stored at index time as a 32-bit term hash plus character
+    span. Selection is then a vectorized lookup: occurrences of the query
+    terms are found with ``np.isin``, and every occurrence marks the range
+    of windows that fully contain it. A per-term running sum over windows
+    counts the distinct terms each window covers.
+    
+    Terms are tokenized like keyword search (``Tokenizer``), so "fees?"
+    matches "fees" but "fee" no longer matches inside "coffee".
+    
+    Stored in one ``ColumnFile``; documents are sorted by id and looked up
+    by binary search, so a memory-mapped file needs no loading step.
+    
+    Attributes:
+        doc_ids (np.ndarray): Sorted document ids
+        doc_ptr (np.ndarray): Tokens of row ``r`` are ``doc_ptr[r]:doc_ptr[r + 1]``
+        hashes (np.ndarray): uint32 hash of each token (see ``term_hash``)
+        spans (np.ndarray): int32 ``(start, end)`` character span of each token
+    """
+    FILE = "excerpt_index.bin"
+
+    def __init__(self, doc_ids: np.ndarray, doc_ptr: np.ndarray, hashes: np.ndarray, spans: np.ndarray,
+                 analyzer: str = ""):
+        self.doc_ids = doc_ids
+        self.doc_ptr = doc_ptr
+        self.hashes = hashes
+        self.spans = spans
+        self.analyzer = analyzer
+
+    @staticmethod
+    def term_hash(term: str) -> int:
+        # Stable across processes, unlike hash(); a collision can only cost excerpt quality
+        return zlib.crc32(term.encode('utf-8'))
+
+    @classmethod
+    def build(cls, documents: Iterable[Document], tokenizer: Tokenizer) -> "ExcerptIndex":
+        rows: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for doc in documents:
+            rows[doc.id] = cls._tokenize(doc.content, tokenizer)
+        return cls._from_rows(rows, tokenizer.signature)
+
+    @classmethod
+    def _tokenize(cls, text: str, tokenizer: Tokenizer) -> Tuple[np.ndarray, np.ndarray]:
+        tokens, spans = tokenizer.tokenize_spans(text)
+        hashes = {token: cls.term_hash(token) for token in set(tokens)}
+        return np.array([hashes[token] for token in tokens], dtype=np.uint32), spans
 
-    def _load_index(self) -> None:
-        index_path = self.config.FAISS_DIR / "index.faiss"
-        if index_path.exists():
-            try:
-                self.index = faiss.read_index(str(index_path))
-                with open(self.config.FAISS_DIR / "doc_ids.pkl", 'rb') as f:
-                    self.doc_ids = pickle.load(f)
-            except Exception:
-                self.index = None
+    @classmethod
+    def _from_rows(cls, rows: Dict[str, Tuple[np.ndarray, np.ndarray]], analyzer: str) -> "ExcerptIndex":
+        doc_ids = sorted(rows)
+        lengths = [len(rows[doc_id][0]) for doc_id in doc_ids]
+        doc_ptr = np.zeros(len(doc_ids) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=doc_ptr[1:])
+        hashes = np.concatenate([rows[doc_id][0] for doc_id in doc_ids]) if doc_ids else np.zeros(0, np.uint32)
+        spans = (np.concatenate([rows[doc_id][1] for doc_id in doc_ids]) if doc_ids
+                 else np.zeros((0, 2), np.int32))
+        return cls(np.array(doc_ids, dtype=str), doc_ptr, hashes, spans, analyzer)
+
+    def updated(self, changed: List[Document], removed_ids: Iterable[str], tokenizer: Tokenizer) -> "ExcerptIndex":
+        """A new index with ``changed`` documents (re)tokenized and ``removed_ids`` dropped."""
+        drop = set(removed_ids) | {doc.id for doc in changed}
+        rows = {doc_id: (self.hashes[self.doc_ptr[row]:self.doc_ptr[row + 1]],
+                         self.spans[self.doc_ptr[row]:self.doc_ptr[row + 1]])
+                for row, doc_id in enumerate(self.doc_ids.tolist()) if doc_id not in drop}
+        for doc in changed:
+            rows[doc.id] = self._tokenize(doc.content, tokenizer)
+        return self._from_rows(rows, self.analyzer)
+
+    def best_window(self, doc_id: str, query_terms: Iterable[str], text_length: int,
+                    length: int = 400, step: int = 100) -> Optional[int]:
+        """
+        Start of the window covering the most distinct query terms (the first on ties, 0 if none).
+        
+        Args:
+            doc_id (str): Document to search
+            query_terms (Iterable[str]): Tokenized query
+            text_length (int): Length of the document's text
+            length (int): Window length in characters
+            step (int): Distance between window starts
+        
+        Returns:
+            Optional[int]: Window start, or None if the document is not indexed
+        """
+        row = int(np.searchsorted(self.doc_ids, doc_id))
+        if row >= len(self.doc_ids) or self.doc_ids[row] != doc_id:
+            return None
+        terms = np.unique(np.array([self.term_hash(term) for term in set(query_terms)], dtype=np.uint32))
+        lo, hi = self.doc_ptr[row], self.doc_ptr[row + 1]
+        hashes = self.hashes[lo:hi]
+        hits = np.flatnonzero(np.isin(hashes, terms))
+        if not len(hits):
+            return 0
+        windows = len(range(0, max(1, text_length - length), step))
+        starts, ends = self.spans[lo:hi][hits].T.astype(np.int64)
+        # Window k = [k * step, k * step + length) contains the token iff first <= k <= last
+        first = np.maximum(0, -((length - ends) // step))
+        last = np.minimum(windows - 1, starts // step)
+        inside = first <= last
+        # Per term, +1 where an occurrence's range of windows opens and -1 after it closes
+        row_start = np.searchsorted(terms, hashes[hits])[inside] * (windows + 1)
+        size = len(terms) * (windows + 1)
+        coverage = (np.bincount(row_start + first[inside], minlength=size)
+                    - np.bincount(row_start + last[inside] + 1, minlength=size))
+        coverage = coverage.reshape(len(terms), windows + 1)[:, :windows]
+        matches = (np.cumsum(coverage, axis=1) > 0).sum(axis=0)
+        return int(np.argmax(matches)) * step if matches.max() > 0 else 0
+
+    def save(self, path: Path) -> None:
+        ColumnFile.write(path, {'analyzer': self.analyzer}, {
+            'doc_ids': self.doc_ids, 'doc_ptr': self.doc_ptr, 'hashes': self.hashes, 'spans': self.spans,
+        })
 
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> "ExcerptIndex":
+        header, columns = ColumnFile.read(path, mmap)
+        return cls(analyzer=header.get('analyzer', ""), **columns)
 
-# ============================================================================
-# KEYWORD SEARCH
-# ============================================================================
 
 class KeywordSearch:
+    LEGACY_FILE = "bm25_index.pkl"
+
     def __init__(self, config: Config):
         self.config = config
-        self.bm25: Optional[BM25Okapi] = None
-        self.doc_ids: List[str] = []
+        self.index: Optional[BM25Index] = None
+        self.tokenizer = Tokenizer(stopwords=config.TOKENIZER_STOPWORDS, stem=config.TOKENIZER_STEMMING)
+        self.excerpts: Optional[ExcerptIndex] = None
 
     def build_index(self, documents: List[Document], progress_callback: Optional[Any] = None) -> None:
-        corpus: List[List[str]] = []
-        self.doc_ids = []
-        for doc in documents:
-            text = f"{doc.title} {doc.content}"
-            tokens = self._tokenize(text)
-            corpus.append(tokens)
-            self.doc_ids.append(doc.id)
-        self.bm25 = BM25Okapi(corpus)
+        # Streamed: each document's tokens are counted and interned, never the whole corpus held as strings
+        tokens = self.tokenizer.tokenize_batch(f"{doc.title} {doc.content}" for doc in documents)
+        self.index = BM25Index.from_term_counts((Counter(doc_tokens) for doc_tokens in tokens),
+                                                [doc.id for doc in documents], **self._params())
+        self.excerpts = ExcerptIndex.build(documents, self.tokenizer)
         self._save_index()
         if progress_callback:
             progress_callback(f"✅ Built BM25 index with {len(documents)} documents")
 
+    def update_documents(self, changed: List[Document], removed_ids: List[str],
+                         progress_callback: Optional[Any] = None) -> bool:
+        """
+        Apply a crawl delta, tokenizing only the changed documents.
+
+        Changed documents go into a new segment and replaced or removed ones
+        are tombstoned; document frequencies and avgdl are adjusted for just
+        those documents (see ``BM25Index.updated``).
+
+        Returns:
+            bool: False if there is no index to update (caller should rebuild)
+        """
+        if self.index is None:
+            self._load_index()
+        if self.index is None:
+            return False
+        tokens = self.tokenizer.tokenize_batch(f"{doc.title} {doc.content}" for doc in changed)
+        added = [(doc.id, Counter(doc_tokens)) for doc, doc_tokens in zip(changed, tokens)]
+        index = self.index.updated(removed_ids, added)
+        if not len(index):
+            return False
+        self.index = index
+        self.excerpts = self.excerpts.updated(changed, removed_ids, self.tokenizer)
+        self._save_index()
+        if progress_callback:
+            progress_callback(f"✅ Updated BM25 index ({len(changed)} changed, {len(removed_ids)} removed, "
+                              f"{len(self.index.segments)} segments)")
+        return True
+
     def search(self, query: str, top_k: int = 15) -> List[Tuple[str, float]]:
-        if self.bm25 is None:
+        if self.index is None:
             self._load_index()
-        if self.bm25 is None:
+        if self.index is None:
             return []
-        tokenized_query = self._tokenize(query)
-        scores = self.bm25.get_scores(tokenized_query)
-        top_indices = np.argsort(scores)[::-1][:top_k]
-        results: List[Tuple[str, float]] = []
-        for idx in top_indices:
-            if idx < len(self.doc_ids) and scores[idx] > 0:
-                results.append((self.doc_ids[idx], float(scores[idx])))
-        return results
+        index = self.index
+        tokenized_query = self.tokenizer.tokenize(query)
+        results = index.top_k(tokenized_query, top_k, prune=self.config.BM25_PRUNING)
+        return [(index.doc_id(position), score) for position, score in results]
 
-    def _tokenize(self, text: str) -> List[str]:
-        text = text.lower()
-        tokens = re.findall(r'\b\w+\b', text)
-        return [t for t in tokens if len(t) > 2]
+    def _params(self) -> Dict[str, Any]:
+        return {'k1': self.config.BM25_K1, 'b': self.config.BM25_B, 'epsilon': self.config.BM25_EPSILON,
+                'analyzer': self.tokenizer.signature, 'max_segments': self.config.BM25_MAX_SEGMENTS,
+                'max_deleted_fraction': self.config.BM25_MERGE_DELETED_FRACTION}
 
     def _save_index(self) -> None:
-        with open(self.config.BM25_DIR / "bm25_index.pkl", 'wb') as f:
-            pickle.dump({'bm25': self.bm25, 'doc_ids': self.doc_ids}, f)
+        self.index.save(self.config.BM25_DIR)
+        self.excerpts.save(self.config.BM25_DIR / ExcerptIndex.FILE)
+        # Superseded pickle from before the columnar format
+        (self.config.BM25_DIR / self.LEGACY_FILE).unlink(missing_ok=True)
 
     def _load_index(self) -> None:
-        path = self.config.BM25_DIR / "bm25_index.pkl"
-        if path.exists():
-            try:
-                with open(path, 'rb') as f:
-                    data = pickle.load(f)
-                    self.bm25 = data['bm25']
-                    self.doc_ids = data['doc_ids']
-            except Exception:
-                self.bm25 = None
+        try:
+            if (self.config.BM25_DIR / BM25Index.STATE_FILE).exists():
+                excerpts = ExcerptIndex.load(self.config.BM25_DIR / ExcerptIndex.FILE, mmap=self.config.INDEX_MMAP)
+                if excerpts.analyzer != self.tokenizer.signature:
+                    raise ValueError(f"Excerpt index was built with analyzer {excerpts.analyzer!r}")
+                self.index = BM25Index.load(self.config.BM25_DIR, mmap=self.config.INDEX_MMAP, **self._params())
+                self.excerpts = excerpts
+        except Exception:
+            self.index = None
+
+
+# ============================================================================
+# QUERY CACHE
+# ============================================================================
+
+class QueryCache:
+    """
+    In-memory LRU cache with per-entry expiry, tied to one version of the indexes.
+    
+    Keys are built from ``normalize``-d queries, so "What is the fee
+    structure for B.Tech?" and "what is the fee structure for b.tech" share
+    an entry. Every lookup passes the current index version (see
+    ``HybridSearch.index_version``); when it differs from the version the
+    entries were stored under, the whole cache is dropped, so a rebuild or
+    incremental update never serves results from the previous indexes.
+    
+    Safe to share between threads.
+    
+    Attributes:
+        max_entries (int): Capacity; the least recently used entry is evicted beyond it
+        ttl (float): Seconds an entry stays valid
+        version (Any): Index version the current entries belong to
+        stats (Dict[str, int]): Hits, misses, evictions, expirations and invalidations
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version: Any = None
+        self.stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0,
+                                      'invalidations': 0}
+        self._entries: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        """Case-, width- and whitespace-insensitive form of a query, without trailing punctuation."""
+        text = unicodedata.normalize("NFKC", query).casefold()
+        return " ".join(text.split()).strip(" ?!.")
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache (0.0 before the first lookup)."""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Any, version: Any) -> Optional[Any]:
+        """
+        Look up a live entry.
+        
+        Args:
+            key (Any): Hashable key (normalized query plus anything the value depends on)
+            version (Any): Current index version
+        
+        Returns:
+            Optional[Any]: Cached value, or None on a miss
+        """
+        with self._lock:
+            self._check_version(version)
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.stats['expirations'] += 1
+                entry = None
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[1]
+
+    def put(self, key: Any, version: Any, value: Any) -> None:
+        """Store ``value`` for ``key``, computed against index ``version``."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if self.version is None:
+                self.version = version
+            elif version != self.version:
+                # Computed against indexes that have been replaced since
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _check_version(self, version: Any) -> None:
+        if version != self.version:
+            if self._entries:
+                self.stats['invalidations'] += 1
+            self._entries.clear()
+            self.version = version
 
 
 # ============================================================================
@@ -610,18 +3098,94 @@ class KeywordSearch:
 # ============================================================================
 
 class HybridSearch:
+    """
+    Fuses semantic (FAISS) and keyword (BM25) retrieval with reciprocal rank fusion.
+    
+    With an executor the two legs run concurrently, so a query costs the
+    slower leg rather than both: query encoding, FAISS search and the BM25
+    numpy kernels spend most of their time outside the GIL. With
+    ``SEARCH_LEG_TIMEOUT`` set, a leg that has not finished in time is
+    left out and the answer is fused from the other leg alone. A leg that
+    has already started cannot be interrupted; its late result is dropped.
+    
+    Attributes:
+        executor (Optional[ThreadPoolExecutor]): Shared pool for the legs;
+            None runs them one after the other
+        cache (Optional[QueryCache]): Fused results of recent queries
+        version (int): Published index version the stores were loaded from
+            (see ``IndexVersions``)
+        stats (Dict[str, int]): Legs dropped for timing out, per leg
+    """
     def __init__(self, config: Config, vector_store: VectorStore,
-                 keyword_search: KeywordSearch, documents: List[Document]):
+                 keyword_search: KeywordSearch, documents: List[Document],
+                 executor: Optional[ThreadPoolExecutor] = None, cache: Optional[QueryCache] = None,
+                 version: int = 0):
         self.config = config
         self.vector_store = vector_store
         self.keyword_search = keyword_search
         self.documents = {doc.id: doc for doc in documents}
+        self.executor = executor
+        self.cache = cache
+        self.version = version
+        self.stats: Dict[str, int] = {'semantic_timeouts': 0, 'keyword_timeouts': 0}
+
+    @property
+    def index_version(self) -> Tuple[int, int, int]:
+        """Published version and saved FAISS and BM25 generations; changes with every rebuild or update."""
+        keyword_index = self.keyword_search.index
+        return (self.version, self.vector_store.version,
+                keyword_index.generation if keyword_index is not None else 0)
+
+    def search(self, query: str, top_k: Optional[int] = None, ef_search: Optional[int] = None,
+               nprobe: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self.search_with_status(query, top_k, ef_search=ef_search, nprobe=nprobe)[0]
+
+    def search_with_status(self, query: str, top_k: Optional[int] = None,
+                           query_embedding: Optional[np.ndarray] = None, ef_search: Optional[int] = None,
+                           nprobe: Optional[int] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Search, and tell whether both legs contributed to the results.
+
+        Results fused without a timed-out leg are partial: they are not
+        cached, so the next ask of the same query retries both legs.
+
+        Args:
+            query (str): Search query
+            top_k (Optional[int]): Results to return (default ``FINAL_TOP_K``)
+            query_embedding (Optional[np.ndarray]): ``VectorStore.encode_query(query)``,
+                if the caller already computed it
+            ef_search (Optional[int]): HNSW candidate list size for the semantic
+                leg (default ``HNSW_EF_SEARCH``)
+            nprobe (Optional[int]): IVF lists probed by the semantic leg (default ``IVF_NPROBE``)
 
-    def search(self, query: str, top_k: Optional[int] = None) -> List[Dict[str, Any]]:
+        Returns:
+            Tuple[List[Dict[str, Any]], bool]: Results, and False if partial
+        """
         if top_k is None:
             top_k = self.config.FINAL_TOP_K
-        faiss_results = self.vector_store.search(query, self.config.FAISS_TOP_K)
-        bm25_results = self.keyword_search.search(query, self.config.BM25_TOP_K)
+        # Passed on every query, so a changed setting applies without rebuilding the index
+        if ef_search is None:
+            ef_search = self.config.HNSW_EF_SEARCH
+        if nprobe is None:
+            nprobe = self.config.IVF_NPROBE
+        if self.cache is None:
+            return self._search(query, top_k, query_embedding, ef_search, nprobe)
+        key = (QueryCache.normalize(query), top_k, ef_search, nprobe)
+        version = self.index_version
+        results = self.cache.get(key, version)
+        if results is not None:
+            return list(results), True
+        results, complete = self._search(query, top_k, query_embedding, ef_search, nprobe)
+        if complete:
+            self.cache.put(key, version, results)
+        return list(results), complete
+
+    def _search(self, query: str, top_k: int, query_embedding: Optional[np.ndarray] = None,
+                ef_search: Optional[int] = None, nprobe: Optional[int] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        """Fused results, and whether both legs contributed to them."""
+        passage_results, bm25_results, complete = self._retrieve(query, query_embedding, ef_search, nprobe)
+        faiss_results = [(doc_id, score) for doc_id, score, _ in passage_results]
+        passages = {doc_id: span for doc_id, _, span in passage_results}
         combined_scores = self._reciprocal_rank_fusion(faiss_results, bm25_results)
         top_doc_ids = sorted(combined_scores.keys(),
                              key=lambda x: combined_scores[x],
@@ -633,9 +3197,39 @@ class HybridSearch:
                 results.append({
                     'document': doc, 'score': combined_scores[doc_id],
                     'url': doc.url, 'title': doc.title,
-                    'excerpt': self._get_excerpt(doc, query)
+                    'excerpt': (self._passage_excerpt(doc, passages[doc_id]) if doc_id in passages
+                                else self._get_excerpt(doc, query))
                 })
-        return results
+        return results, complete
+
+    def _retrieve(self, query: str, query_embedding: Optional[np.ndarray] = None, ef_search: Optional[int] = None,
+                  nprobe: Optional[int] = None
+                  ) -> Tuple[List[Tuple[str, float, Tuple[int, int]]], List[Tuple[str, float]], bool]:
+        """Run both retrieval legs; a leg dropped for timing out contributes no results and makes them partial."""
+        def semantic() -> List[Tuple[str, float, Tuple[int, int]]]:
+            return self.vector_store.search_passages(query, self.config.FAISS_TOP_K, ef_search, nprobe,
+                                                     query_embedding=query_embedding)
+
+        def keyword() -> List[Tuple[str, float]]:
+            return self.keyword_search.search(query, self.config.BM25_TOP_K)
+
+        if self.executor is None:
+            return semantic(), keyword(), True
+        legs = {'semantic': self.executor.submit(semantic), 'keyword': self.executor.submit(keyword)}
+        dropped: set = set()
+        timeout = self.config.SEARCH_LEG_TIMEOUT
+        if timeout is not None:
+            done, _ = wait(legs.values(), timeout=timeout)
+            if not done:
+                # Both legs are slow: answer from whichever finishes first rather than with nothing
+                done, _ = wait(legs.values(), return_when=FIRST_COMPLETED)
+            for name, future in legs.items():
+                if future not in done:
+                    future.cancel()
+                    dropped.add(name)
+                    self.stats[f'{name}_timeouts'] += 1
+        results = {name: [] if name in dropped else future.result() for name, future in legs.items()}
+        return results['semantic'], results['keyword'], not dropped
 
     def _reciprocal_rank_fusion(self, faiss_results: List[Tuple[str, float]],
                                  bm25_results: List[Tuple[str, float]], k: int = 60) -> Dict[str, float]:
@@ -646,17 +3240,25 @@ class HybridSearch:
             scores[doc_id] = scores.get(doc_id, 0) + 1 / (k + rank)
         return scores
 
+    def _passage_excerpt(self, doc: Document, span: Tuple[int, int]) -> str:
+        """Use the passage that matched semantically as the excerpt."""
+        start, end = span
+        excerpt = doc.content[start:end].strip()
+        if start > 0:
+            excerpt = "..." + excerpt
+        if end < len(doc.content):
+            excerpt = excerpt + "..."
+        return excerpt
+
     def _get_excerpt(self, doc: Document, query: str, length: int = 400) -> str:
-        content = doc.content.lower()
-        query_terms = query.lower().split()
-        best_pos = 0
-        max_matches = 0
-        for i in range(0, max(1, len(content) - length), 100):
-            chunk = content[i:i+length]
-            matches = sum(1 for term in query_terms if term in chunk)
-            if matches > max_matches:
-                max_matches = matches
-                best_pos = i
+        """Window of ``doc`` covering the most query terms (see ``ExcerptIndex``)."""
+        excerpts = self.keyword_search.excerpts
+        best_pos = None
+        if excerpts is not None:
+            best_pos = excerpts.best_window(doc.id, self.keyword_search.tokenizer.tokenize(query),
+                                            len(doc.content), length)
+        # A document indexed before its latest recrawl is shown from the top
+        best_pos = best_pos or 0
         excerpt = doc.content[best_pos:best_pos+length]
         if best_pos > 0:
             excerpt = "..." + excerpt
@@ -688,8 +3290,78 @@ class ResponseGenerator:
                 pass
 
     def generate_response(self, query: str, search_results: List[Dict[str, Any]]) -> str:
+        return self.answer(query, search_results)[0]
+
+    def answer(self, query: str, search_results: List[Dict[str, Any]]) -> Tuple[str, bool]:
+        """
+        Generate a response and tell whether it is the intended one.
+
+        Returns:
+            Tuple[str, bool]: The response, and False if it is the fallback for
+            a failed LLM call (worth retrying, so not worth caching)
+        """
+        stream = self.stream_answer(query, search_results)
+        parts: List[str] = []
+        while True:
+            try:
+                parts.append(next(stream))
+            except StopIteration as stop:
+                return ''.join(parts), stop.value
+
+    def stream_answer(self, query: str, search_results: List[Dict[str, Any]]) -> Generator[str, None, bool]:
+        """
+        Generate a response, yielding text as the LLM produces it.
+
+        The completion is requested in the provider's stream mode, so the
+        first words arrive after the model's first token rather than after
+        the whole answer. The sources follow as a last chunk. Without an
+        LLM, the fallback response comes as one chunk.
+
+        Returns:
+            bool: Once exhausted, False if the LLM call failed or broke off
+            (the answer is the fallback, or cut short, so not worth caching)
+        """
         if not self.client:
-            return self._generate_fallback_response(query, search_results)
+            yield self._generate_fallback_response(query, search_results)
+            return True
+        try:
+            response = self.client.chat.completions.create(
+                model=self.config.LLM_MODEL,
+                messages=self._messages(query, search_results),
+                temperature=self.config.LLM_TEMPERATURE,
+                max_tokens=self.config.LLM_MAX_TOKENS,
+                stream=True
+            )
+            chunks = iter(response)
+            first = self._next_text(chunks)
+        except Exception:
+            yield self._generate_fallback_response(query, search_results)
+            return False
+        final = True
+        if first:
+            yield first
+        try:
+            while True:
+                text = self._next_text(chunks)
+                if text is None:
+                    break
+                yield text
+        except Exception:
+            yield "\n\n⚠️ *The answer was interrupted; please ask again.*"
+            final = False
+        yield f"\n\n{self._format_sources(search_results)}"
+        return final
+
+    @staticmethod
+    def _next_text(chunks: Iterator[Any]) -> Optional[str]:
+        """Text of the next streamed chunk that has any, or None at the end of the stream."""
+        for chunk in chunks:
+            # Some chunks carry only the role, a finish reason or usage
+            if chunk.choices and chunk.choices[0].delta.content:
+                return chunk.choices[0].delta.content
+        return None
+
+    def _messages(self, query: str, search_results: List[Dict[str, Any]]) -> List[Dict[str, str]]:
         context = self._prepare_context(search_results)
         system_prompt = """You are an intelligent AI assistant for JIIT (Jaypee Institute of Information Technology).
 Answer questions accurately using ONLY the provided context. Be helpful, detailed, and professional.
@@ -701,21 +3373,10 @@ Context from JIIT official sources:
 {context}
 
 Provide a comprehensive answer with source citations."""
-        try:
-            response = self.client.chat.completions.create(
-                model=self.config.LLM_MODEL,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=self.config.LLM_TEMPERATURE,
-                max_tokens=self.config.LLM_MAX_TOKENS
-            )
-            answer = response.choices[0].message.content
-            sources = self._format_sources(search_results)
-            return f"{answer}\n\n{sources}"
-        except Exception:
-            return self._generate_fallback_response(query, search_results)
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
 
     def _prepare_context(self, search_results: List[Dict[str, Any]]) -> str:
         parts: List[str] = []
@@ -757,6 +3418,211 @@ I couldn't find specific information about "{query}" in the JIIT database."""
         return '\n'.join(parts)
 
 
+class AnswerStream:
+    """
+    A chatbot answer, delivered in chunks as it is generated.
+    
+    Iterating yields the chunks once; ``text`` accumulates what has been
+    yielded so far and ``read`` returns the whole answer. Answers taken
+    from a cache, and messages such as errors, come as a single chunk.
+    
+    Args:
+        chunks (Iterable[str]): The answer's text, in order
+        cached (bool): Whether the answer was reused from a cache rather than generated
+    """
+    def __init__(self, chunks: Iterable[str], cached: bool = False):
+        self._chunks = iter(chunks)
+        self.cached = cached
+        self.text = ""
+
+    def __iter__(self) -> Iterator[str]:
+        for chunk in self._chunks:
+            self.text += chunk
+            yield chunk
+
+    def read(self) -> str:
+        """Receive the rest of the answer and return all of it."""
+        for _ in self:
+            pass
+        return self.text
+
+
+class SemanticAnswerCache:
+    """
+    LLM answers of past questions, looked up by question embedding.
+    
+    Paraphrases ("hostel fees" / "fee for hostel accommodation") miss the
+    exact-text ``QueryCache`` but embed close together. Each answered
+    question's ``VectorStore.encode_query`` embedding goes into a small
+    flat inner-product FAISS index; a new question whose nearest past
+    question has cosine similarity of at least ``threshold`` gets that
+    answer, sources included, without calling the LLM.
+    
+    Similarity alone can't tell programmes, years or campuses apart ("B.Tech
+    fees" / "M.Tech fees" embed very close), so a past question is only
+    reused if it also has the same ``key_tokens``: the numbers and
+    ``key_terms`` it mentions.
+    
+    Like ``QueryCache``, entries belong to one index version and are all
+    dropped when it changes, expire after ``ttl`` seconds, and beyond
+    ``max_entries`` the least recently used one is evicted. The store is
+    saved to a single ``.npz`` file (replaced atomically) after each change
+    and reloaded on startup; a file written for another embedding model is
+    ignored.
+    
+    Safe to share between threads.
+    
+    Attributes:
+        threshold (float): Minimum cosine similarity for a hit
+        version (Any): Index version the current entries belong to
+        entries (Dict[int, Dict[str, Any]]): id -> question, answer, created and last-used times
+        stats (Dict[str, int]): Hits, misses (of which ``key_mismatches`` were
+            similar enough but named different key terms), evictions,
+            expirations and invalidations
+    """
+    # Past questions above the threshold checked for matching key terms, most similar first
+    CANDIDATES = 4
+
+    def __init__(self, path: Path, model_name: str, dim: int, threshold: float, max_entries: int, ttl: float,
+                 key_terms: Iterable[str] = ()):
+        self.path = path
+        self.model_name = model_name
+        self.dim = dim
+        self.threshold = threshold
+        self.key_terms = frozenset(term.lower() for term in key_terms)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.version: Any = None
+        self.entries: Dict[int, Dict[str, Any]] = {}
+        self.index = faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+        self.next_id = 0
+        self.stats: Dict[str, int] = {'hits': 0, 'misses': 0, 'key_mismatches': 0, 'evictions': 0,
+                                      'expirations': 0, 'invalidations': 0}
+        self._lock = threading.Lock()
+        self._load()
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of lookups answered from the cache (0.0 before the first lookup)."""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / lookups if lookups else 0.0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def key_tokens(self, question: str) -> frozenset:
+        """Numbers and ``key_terms`` in ``question``; two questions must share them exactly to share an answer."""
+        words = split_words(re.sub(r'(?<=\w)[.\-](?=\w)', '', question))
+        return frozenset(word for word in words if word in self.key_terms or any(c.isdigit() for c in word))
+
+    def lookup(self, question: str, embedding: np.ndarray, version: Any) -> Optional[str]:
+        """
+        Answer of the most similar past question, if similar enough and about the same key terms.
+        
+        Args:
+            question (str): The new question
+            embedding (np.ndarray): Unit-length question embedding, shape ``(1, dim)``
+            version (Any): Current index version
+        
+        Returns:
+            Optional[str]: Cached answer, or None on a miss
+        """
+        with self._lock:
+            self._check_version(version)
+            answer = None
+            if self.entries:
+                scores, ids = self.index.search(embedding, min(self.CANDIDATES, len(self.entries)))
+                keys, mismatched = None, False
+                for score, entry_id in zip(scores[0].tolist(), ids[0].tolist()):
+                    entry = self.entries.get(entry_id)
+                    if entry is None or score < self.threshold:
+                        break
+                    if keys is None:
+                        keys = self.key_tokens(question)
+                    if self.key_tokens(entry['question']) != keys:
+                        mismatched = True
+                        continue
+                    mismatched = False
+                    if entry['created'] + self.ttl <= time.time():
+                        self._remove([entry_id])
+                        self.stats['expirations'] += 1
+                        self._save()
+                    else:
+                        # Recency only matters within this process; not worth a write per hit
+                        entry['used'] = time.time()
+                        answer = entry['answer']
+                    break
+                if mismatched:
+                    self.stats['key_mismatches'] += 1
+            self.stats['hits' if answer is not None else 'misses'] += 1
+            return answer
+
+    def add(self, question: str, embedding: np.ndarray, version: Any, answer: str) -> None:
+        """Remember ``answer`` to ``question``, computed against index ``version``, and save."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            if self.version is None:
+                self.version = version
+            elif version != self.version:
+                return
+            now = time.time()
+            entry_id = self.next_id
+            self.next_id += 1
+            self.index.add_with_ids(embedding, np.array([entry_id], dtype=np.int64))
+            self.entries[entry_id] = {'question': question, 'answer': answer, 'created': now, 'used': now}
+            if len(self.entries) > self.max_entries:
+                by_use = sorted(self.entries, key=lambda i: self.entries[i]['used'])
+                evicted = by_use[:len(self.entries) - self.max_entries]
+                self._remove(evicted)
+                self.stats['evictions'] += len(evicted)
+            self._save()
+
+    def _check_version(self, version: Any) -> None:
+        if version != self.version:
+            self.version = version
+            if self.entries:
+                self.stats['invalidations'] += 1
+                self._remove(list(self.entries))
+                self._save()
+
+    def _remove(self, entry_ids: List[int]) -> None:
+        self.index.remove_ids(np.array(entry_ids, dtype=np.int64))
+        for entry_id in entry_ids:
+            del self.entries[entry_id]
+
+    def _save(self) -> None:
+        ids = np.array(sorted(self.entries), dtype=np.int64)
+        vectors = (self.index.reconstruct_batch(ids) if len(ids)
+                   else np.zeros((0, self.dim), dtype=np.float32))
+        meta = {'model': self.model_name, 'version': self.version, 'next_id': self.next_id,
+                'entries': [self.entries[entry_id] for entry_id in ids.tolist()]}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp.npz')
+        np.savez(tmp_path, ids=ids, vectors=vectors,
+                 meta=np.frombuffer(json.dumps(meta).encode('utf-8'), dtype=np.uint8))
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+        try:
+            with np.load(self.path) as data:
+                ids, vectors, meta = data['ids'], data['vectors'], json.loads(data['meta'].tobytes().decode('utf-8'))
+            if meta['model'] != self.model_name or vectors.shape[1] != self.dim:
+                return
+            # JSON turns the version tuple into a list
+            version = meta['version']
+            self.version = tuple(version) if isinstance(version, list) else version
+            self.next_id = meta['next_id']
+            self.entries = dict(zip(ids.tolist(), meta['entries']))
+            if len(ids):
+                self.index.add_with_ids(np.ascontiguousarray(vectors, dtype=np.float32), ids)
+        except Exception:
+            self.version, self.entries, self.next_id = None, {}, 0
+            self.index.reset()
+
+
 # ============================================================================
 # DOCUMENT MANAGER
 # ============================================================================
@@ -770,8 +3636,31 @@ class DocumentManager:
     def save_documents(self, documents: List[Document]) -> None:
         self.documents = {doc.id: doc for doc in documents}
         docs_data = [doc.to_dict() for doc in documents]
-        with open(self.config.DOCS_DIR / "documents.json", 'w', encoding='utf-8') as f:
+        path = self.config.DOCS_DIR / "documents.json"
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
             json.dump(docs_data, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def diff(self, documents: List[Document]) -> Tuple[List[Document], List[str]]:
+        """
+        Compare a new full document set against the stored one.
+        
+        Args:
+            documents (List[Document]): The complete new document set
+        
+        Returns:
+            Tuple[List[Document], List[str]]: Documents that are new or whose
+            title/content changed, and ids of stored documents not in the new set
+        """
+        changed = [
+            doc for doc in documents
+            if doc.id not in self.documents
+            or (self.documents[doc.id].title, self.documents[doc.id].content) != (doc.title, doc.content)
+        ]
+        new_ids = {doc.id for doc in documents}
+        removed_ids = [doc_id for doc_id in self.documents if doc_id not in new_ids]
+        return changed, removed_ids
 
     def _load_documents(self) -> None:
         path = self.config.DOCS_DIR / "documents.json"
@@ -779,15 +3668,7 @@ class DocumentManager:
             try:
                 with open(path, 'r', encoding='utf-8') as f:
                     docs_data = json.load(f)
-                documents = []
-                for data in docs_data:
-                    doc = Document(
-                        id=data['id'], url=data['url'], title=data['title'],
-                        content=data['content'], doc_type=data['doc_type'],
-                        metadata=data['metadata'],
-                        last_updated=datetime.fromisoformat(data['last_updated']) if data.get('last_updated') else None
-                    )
-                    documents.append(doc)
+                documents = [Document.from_dict(data) for data in docs_data]
                 self.documents = {doc.id: doc for doc in documents}
             except Exception:
                 self.documents = {}
@@ -796,24 +3677,182 @@ class DocumentManager:
         return list(self.documents.values())
 
 
+# ============================================================================
+# INDEX VERSIONS
+# ============================================================================
+
+class IndexVersions:
+    """
+    Blue/green storage of complete document + index sets.
+    
+    A rebuild or update never touches the live set: it writes a new version
+    directory under ``INDEX_DIR`` (``v<n>/`` holding ``documents/``,
+    ``faiss_index/`` and ``bm25_index/``) while queries keep being answered
+    from the old one. Atomically replacing ``current.json`` (``publish``)
+    is the commit point, so a crash mid-build leaves the previous version
+    live, and ``collect`` later deletes the partial one. ``current.json``
+    also lists the last published versions, which ``collect`` keeps.
+    
+    An incremental update starts its version as hard links to the live
+    version's files (``link_from``). That is safe because saved index files
+    are never modified in place: every save writes new generation files, or
+    a temporary file renamed over the old name.
+    
+    Until the first publish, the live set is the one in ``FAISS_DIR``,
+    ``BM25_DIR`` and ``DOCS_DIR`` themselves (version 0); it is left in
+    place afterwards.
+    """
+    MANIFEST = "current.json"
+
+    def __init__(self, config: Config):
+        self.config = config
+        self.root = config.INDEX_DIR
+
+    def _read_manifest(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.root / self.MANIFEST, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def current(self) -> Tuple[int, Config]:
+        """The live version number and the configuration that stores under it."""
+        manifest = self._read_manifest()
+        if not manifest:
+            return 0, self.config
+        return manifest['version'], self.config.for_index_version(self.root / manifest['directory'])
+
+    def _versions(self) -> Dict[int, Path]:
+        if not self.root.exists():
+            return {}
+        return {int(path.name[1:]): path for path in self.root.iterdir()
+                if path.is_dir() and re.fullmatch(r'v\d+', path.name)}
+
+    def create(self) -> Tuple[int, Config]:
+        """Make an empty directory for the next version; returns its number and configuration."""
+        version = max([self.current()[0], *self._versions()]) + 1
+        directory = self.root / f"v{version}"
+        config = self.config.for_index_version(directory)
+        for dir_path in (config.FAISS_DIR, config.BM25_DIR, config.DOCS_DIR):
+            dir_path.mkdir(parents=True, exist_ok=True)
+        return version, config
+
+    @staticmethod
+    def link_from(source: Config, target: Config) -> None:
+        """Fill ``target``'s index directories with hard links to ``source``'s files (copies where unsupported)."""
+        for name in ('FAISS_DIR', 'BM25_DIR'):
+            source_dir, target_dir = getattr(source, name), getattr(target, name)
+            if not source_dir.exists():
+                continue
+            for path in source_dir.iterdir():
+                if path.is_file() and not path.name.endswith(".tmp"):
+                    try:
+                        os.link(path, target_dir / path.name)
+                    except OSError:
+                        shutil.copy2(path, target_dir / path.name)
+
+    def publish(self, version: int) -> None:
+        """Make ``version`` the live one, atomically."""
+        manifest = self._read_manifest() or {}
+        history = [version] + [kept for kept in manifest.get('history', []) if kept != version]
+        tmp_path = self.root / f"{self.MANIFEST}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': version, 'directory': f"v{version}",
+                       'history': history[:max(1, self.config.INDEX_VERSIONS_KEPT)]}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.root / self.MANIFEST)
+
+    def collect(self) -> List[int]:
+        """
+        Delete every version but the last ``INDEX_VERSIONS_KEPT`` published
+        ones, including any left half-built by an interrupted build.
+        
+        Only call it while no version is being built. Queries still running
+        on a deleted version are unaffected where the OS keeps open and
+        mapped files alive until released (Linux, macOS).
+        
+        Returns:
+            List[int]: Versions deleted
+        """
+        manifest = self._read_manifest()
+        if not manifest:
+            return []
+        kept = set(manifest.get('history', [])) | {manifest['version']}
+        deleted = []
+        for version, path in self._versions().items():
+            if version not in kept:
+                shutil.rmtree(path, ignore_errors=True)
+                deleted.append(version)
+        return sorted(deleted)
+
+
 # ============================================================================
 # MAIN CHATBOT SYSTEM
 # ============================================================================
 
 class JIITAdvancedChatbot:
-    def __init__(self):
-        self.config = Config()
+    """
+    The chatbot engine: crawler, indexes, caches and response generator.
+    
+    One engine serves every Streamlit session of a process (see
+    ``get_engine``), so it is safe to share between threads:
+    
+    - ``initialize`` and ``update_database`` run one at a time
+      (``update_lock``); once initialized, ``initialize`` returns at once
+    - ``query`` only reads; it takes ``self.hybrid_search`` once, so an
+      index swap never shows it a mix of old and new indexes
+    - Rebuilds and incremental updates write a new index version beside the
+      live one (``IndexVersions``), publish it, then swap in a new
+      ``HybridSearch``; queries keep being answered from the old version
+      until then. ``start_refresh`` runs them in a background thread.
+    
+    Args:
+        config (Optional[Config]): Configuration (default ``Config()``)
+    """
+    def __init__(self, config: Optional[Config] = None):
+        self.config = config or Config()
         self.config.setup_directories()
         self.scraper = EnhancedWebScraper(self.config)
-        self.doc_manager = DocumentManager(self.config)
-        self.vector_store = VectorStore(self.config)
-        self.keyword_search = KeywordSearch(self.config)
+        self.deduplicator = DocumentDeduplicator(self.config)
+        self.index_versions = IndexVersions(self.config)
+        self.index_version, store_config = self.index_versions.current()
+        self.doc_manager = DocumentManager(store_config)
+        self.vector_store = VectorStore(store_config)
+        self.keyword_search = KeywordSearch(store_config)
+        # Created once and shared by every HybridSearch, which is replaced on each index rebuild
+        self.search_executor = (ThreadPoolExecutor(max_workers=max(2, self.config.SEARCH_WORKERS),
+                                                   thread_name_prefix="jiit-search")
+                                if self.config.PARALLEL_RETRIEVAL else None)
+        # Outlive HybridSearch too; entries from replaced indexes are dropped by version
+        self.search_cache = QueryCache(self.config.QUERY_CACHE_SIZE, self.config.QUERY_CACHE_TTL)
+        self.answer_cache = QueryCache(self.config.QUERY_CACHE_SIZE, self.config.QUERY_CACHE_TTL)
         self.hybrid_search: Optional[HybridSearch] = None
         self.response_generator = ResponseGenerator(self.config)
+        # Only LLM answers are worth reusing; the fallback is cheap and echoes the exact question
+        self.semantic_cache = (SemanticAnswerCache(self.config.SEMANTIC_CACHE_PATH, self.config.EMBEDDING_MODEL,
+                                                   self.config.EMBEDDING_DIM, self.config.SEMANTIC_CACHE_THRESHOLD,
+                                                   self.config.SEMANTIC_CACHE_SIZE, self.config.SEMANTIC_CACHE_TTL,
+                                                   self.config.SEMANTIC_CACHE_KEY_TERMS)
+                               if self.response_generator.client and self.config.SEMANTIC_CACHE_SIZE > 0 else None)
+        self.update_lock = threading.RLock()
         self.initialized = False
         self.initialization_error: Optional[str] = None
+        self.warmup = EngineWarmup(self)
+        # Background refresh started from the UI (see start_refresh)
+        self.refresh_thread: Optional[threading.Thread] = None
+        self.refresh_message = ""
+        self.refresh_result: Optional[bool] = None
+        self._refresh_lock = threading.Lock()
 
     def initialize(self, force_rebuild: bool = False, status_callback: Optional[Any] = None) -> bool:
+        with self.update_lock:
+            # Another session may have initialized the shared engine while this one waited
+            if self.initialized and not force_rebuild:
+                return True
+            return self._initialize(force_rebuild, status_callback)
+
+    def _initialize(self, force_rebuild: bool, status_callback: Optional[Any]) -> bool:
         try:
             documents = self.doc_manager.get_all_documents()
             if force_rebuild or not documents:
@@ -827,21 +3866,22 @@ class JIITAdvancedChatbot:
             if not documents:
                 self.initialization_error = "No documents available"
                 return False
-            if status_callback:
-                status_callback("🔧 Initializing search systems...")
-            self.vector_store._load_index()
-            self.keyword_search._load_index()
-            if self.vector_store.index is None:
-                if status_callback:
-                    status_callback("Building FAISS index...")
-                self.vector_store.build_index(documents, status_callback)
-            if self.keyword_search.bm25 is None:
+            if self.hybrid_search is None:
+                # Nothing is searching yet, so the stores can be loaded in place
                 if status_callback:
-                    status_callback("Building BM25 index...")
-                self.keyword_search.build_index(documents, status_callback)
-            self.hybrid_search = HybridSearch(
-                self.config, self.vector_store, self.keyword_search, documents
-            )
+                    status_callback("🔧 Initializing search systems...")
+                self.vector_store._load_index()
+                self.keyword_search._load_index()
+                if self.vector_store.index is None:
+                    if status_callback:
+                        status_callback("Building FAISS index...")
+                    self.vector_store.build_index(documents, status_callback)
+                if self.keyword_search.index is None:
+                    if status_callback:
+                        status_callback("Building BM25 index...")
+                    self.keyword_search.build_index(documents, status_callback)
+                self.hybrid_search = self._hybrid_search(self.vector_store, self.keyword_search, documents)
+            self.initialization_error = None
             self.initialized = True
             if status_callback:
                 status_callback(f"✅ System ready with {len(documents)} documents!")
@@ -852,46 +3892,326 @@ class JIITAdvancedChatbot:
                 status_callback(f"❌ Initialization error: {str(e)}")
             return False
 
-    def update_database(self, force_refresh: bool = False, status_callback: Optional[Any] = None) -> bool:
+    def update_database(self, force_refresh: bool = False, status_callback: Optional[Any] = None,
+                        incremental: bool = False) -> bool:
+        with self.update_lock:
+            return self._update_database(force_refresh, status_callback, incremental)
+
+    def _update_database(self, force_refresh: bool, status_callback: Optional[Any], incremental: bool) -> bool:
         try:
-            documents = self.scraper.scrape_website(force_refresh, status_callback)
+            if incremental and self.doc_manager.get_all_documents():
+                return self._update_incremental(status_callback)
+            documents, frontier_update = self.scraper.scrape_website(force_refresh, status_callback)
             if not documents:
                 if status_callback:
                     status_callback("⚠️ No documents scraped")
                 return False
-            self.doc_manager.save_documents(documents)
-            if status_callback:
-                status_callback("Building FAISS index...")
-            self.vector_store.build_index(documents, progress_callback=status_callback)
-            if status_callback:
-                status_callback("Building BM25 index...")
-            self.keyword_search.build_index(documents, progress_callback=status_callback)
-            self.hybrid_search = HybridSearch(
-                self.config, self.vector_store, self.keyword_search, documents
-            )
+            documents = self.deduplicator.deduplicate(documents, status_callback)
+            self._rebuild_indexes(documents, status_callback)
+            # Only now that they are live, so a failed build is recrawled next time
+            self.scraper.frontier.apply(frontier_update)
             return True
         except Exception as e:
             if status_callback:
                 status_callback(f"❌ Update error: {str(e)}")
             return False
 
+    @property
+    def refreshing(self) -> bool:
+        """Whether a refresh started by ``start_refresh`` is still running."""
+        return self.refresh_thread is not None and self.refresh_thread.is_alive()
+
+    def start_refresh(self, force_rebuild: bool = False) -> bool:
+        """
+        Update the knowledge base in a background thread, answering queries meanwhile.
+        
+        Progress is in ``refresh_message`` and the outcome in ``refresh_result``.
+        
+        Args:
+            force_rebuild (bool): Recrawl every page and rebuild the indexes
+                from scratch, instead of an incremental update (always done
+                when the engine is not initialized yet)
+        
+        Returns:
+            bool: False if a refresh is already running
+        """
+        with self._refresh_lock:
+            if self.refreshing:
+                return False
+            self.refresh_message, self.refresh_result = "Starting...", None
+            self.refresh_thread = threading.Thread(target=self._refresh, args=(force_rebuild,),
+                                                   name="jiit-refresh", daemon=True)
+            self.refresh_thread.start()
+            return True
+
+    def _refresh(self, force_rebuild: bool) -> None:
+        def status(message: str) -> None:
+            self.refresh_message = message
+
+        version = self.index_version
+        if force_rebuild or not self.initialized:
+            self.refresh_result = self.initialize(force_rebuild=True, status_callback=status)
+        else:
+            self.refresh_result = self.update_database(status_callback=status, incremental=True)
+        if self.refresh_result and self.index_version != version:
+            self.refresh_message = f"✅ Knowledge base updated (index version {self.index_version})"
+
+    def _hybrid_search(self, vector_store: VectorStore, keyword_search: KeywordSearch,
+                       documents: List[Document], version: Optional[int] = None) -> HybridSearch:
+        return HybridSearch(self.config, vector_store, keyword_search, documents, self.search_executor,
+                            self.search_cache, self.index_version if version is None else version)
+
+    def _rebuild_indexes(self, documents: List[Document], status_callback: Optional[Any] = None) -> None:
+        """Build every index from scratch into a new version, then publish and swap it in."""
+        version, config = self.index_versions.create()
+        doc_manager = DocumentManager(config)
+        doc_manager.save_documents(documents)
+        vector_store = VectorStore(config, shared=self.vector_store)
+        keyword_search = KeywordSearch(config)
+        if status_callback:
+            status_callback("Building FAISS index...")
+        vector_store.build_index(documents, progress_callback=status_callback)
+        if status_callback:
+            status_callback("Building BM25 index...")
+        keyword_search.build_index(documents, progress_callback=status_callback)
+        self._publish(version, doc_manager, vector_store, keyword_search, documents)
+
+    def _update_incremental(self, status_callback: Optional[Any] = None) -> bool:
+        """
+        Recrawl URLs whose sitemap lastmod moved and push only real changes into the indexes.
+        
+        The changes are applied to a new version that starts as hard links to
+        the live one's files: only changed documents are encoded, and keyword
+        index segments they don't touch are shared rather than copied.
+        """
+        recrawled, gone_ids, frontier_update = self.scraper.scrape_incremental(status_callback)
+        gone = set(gone_ids)
+        merged = {doc_id: doc for doc_id, doc in self.doc_manager.documents.items() if doc_id not in gone}
+        merged.update((doc.id, doc) for doc in recrawled)
+        documents = self.deduplicator.deduplicate(list(merged.values()), status_callback,
+                                                 frontier_update.removed)
+        changed, removed_ids = self.doc_manager.diff(documents)
+        if not changed and not removed_ids:
+            # Only metadata (aliases, crawl times) can differ; no index reads it
+            self.doc_manager.save_documents(documents)
+            self.scraper.frontier.apply(frontier_update)
+            if status_callback:
+                status_callback("✅ Knowledge base already up to date")
+            return True
+        if status_callback:
+            status_callback(f"Updating indexes: {len(changed)} changed, {len(removed_ids)} removed...")
+        version, config = self.index_versions.create()
+        self.index_versions.link_from(self.vector_store.config, config)
+        doc_manager = DocumentManager(config)
+        doc_manager.save_documents(documents)
+        vector_store = VectorStore(config, shared=self.vector_store)
+        keyword_search = KeywordSearch(config)
+        if not (vector_store.update_documents(changed, removed_ids, status_callback)
+                and keyword_search.update_documents(changed, removed_ids, status_callback)):
+            # No usable index to update in the live version; build this one from scratch
+            vector_store.build_index(documents, progress_callback=status_callback)
+            keyword_search.build_index(documents, progress_callback=status_callback)
+        self._publish(version, doc_manager, vector_store, keyword_search, documents)
+        self.scraper.frontier.apply(frontier_update)
+        return True
+
+    def _publish(self, version: int, doc_manager: 'DocumentManager', vector_store: VectorStore,
+                 keyword_search: KeywordSearch, documents: List[Document]) -> None:
+        """Make a fully written index version live on disk, then for queries, then delete old versions."""
+        hybrid_search = self._hybrid_search(vector_store, keyword_search, documents, version)
+        self.index_versions.publish(version)
+        self.doc_manager, self.vector_store, self.keyword_search = doc_manager, vector_store, keyword_search
+        self.index_version = version
+        self.hybrid_search = hybrid_search
+        self.index_versions.collect()
+
     def query(self, question: str) -> str:
+        return self.query_stream(question).read()
+
+    def query_stream(self, question: str) -> AnswerStream:
+        """
+        Answer ``question``, streaming a generated answer as the LLM writes it.
+        
+        Retrieval happens before this returns; the LLM is called as the stream
+        is read. A generated answer is cached once it has been read to the end.
+        """
         if not self.initialized:
             if self.initialization_error:
-                return f"❌ System not initialized: {self.initialization_error}"
-            return "❌ System not initialized. Please wait for initialization to complete."
+                return AnswerStream([f"❌ System not initialized: {self.initialization_error}"])
+            return AnswerStream(["❌ System not initialized. Please wait for initialization to complete."])
         if not question or not question.strip():
-            return "Please ask a question about JIIT."
+            return AnswerStream(["Please ask a question about JIIT."])
         try:
-            if self.hybrid_search is None:
-                return "❌ Search system not available"
-            search_results = self.hybrid_search.search(question)
+            hybrid_search = self.hybrid_search
+            if hybrid_search is None:
+                return AnswerStream(["❌ Search system not available"])
+            key = QueryCache.normalize(question)
+            version = hybrid_search.index_version
+            response = self.answer_cache.get(key, version)
+            if response is not None:
+                return AnswerStream([response], cached=True)
+            embedding = None
+            if self.semantic_cache is not None:
+                # Also serves the semantic search leg, so a miss costs no extra encoding
+                embedding = hybrid_search.vector_store.encode_query(question)
+                response = self.semantic_cache.lookup(question, embedding, version)
+                if response is not None:
+                    self.answer_cache.put(key, version, response)
+                    return AnswerStream([response], cached=True)
+            search_results, complete = hybrid_search.search_with_status(question, query_embedding=embedding)
             if not search_results:
-                return f"### ℹ️ No Information Found\n\nI couldn't find information about '{question}'."
-            response = self.response_generator.generate_response(question, search_results)
-            return response
+                return AnswerStream([
+                    f"### ℹ️ No Information Found\n\nI couldn't find information about '{question}'."
+                ])
+            return AnswerStream(self._generate(question, search_results, key, version, embedding, complete))
+        except Exception as e:
+            return AnswerStream([f"❌ Error processing query: {str(e)}"])
+
+    def _generate(self, question: str, search_results: List[Dict[str, Any]], key: str, version: Any,
+                  embedding: Optional[np.ndarray], complete: bool) -> Iterator[str]:
+        stream = self.response_generator.stream_answer(question, search_results)
+        parts: List[str] = []
+        try:
+            while True:
+                try:
+                    chunk = next(stream)
+                except StopIteration as stop:
+                    final = stop.value
+                    break
+                parts.append(chunk)
+                yield chunk
+        except Exception as e:
+            yield f"❌ Error processing query: {str(e)}"
+            return
+        if complete and final:
+            response = ''.join(parts)
+            self.answer_cache.put(key, version, response)
+            if self.semantic_cache is not None:
+                self.semantic_cache.add(question, embedding, version, response)
+
+    def cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hit rate, size and counters of the search result, answer and semantic answer caches."""
+        caches = [('search', self.search_cache), ('answers', self.answer_cache)]
+        if self.semantic_cache is not None:
+            caches.append(('semantic', self.semantic_cache))
+        return {name: {'hit_rate': cache.hit_rate, 'entries': len(cache), **cache.stats} for name, cache in caches}
+
+
+# ============================================================================
+# ENGINE WARM-UP
+# ============================================================================
+
+class EngineWarmup:
+    """
+    Gets an engine ready to answer in a background thread.
+    
+    Started when the server starts (see ``start_warmup``), so the work is
+    usually done before the first visitor opens the chat page:
+    
+    1. Load the embedding model and encode ``WARMUP_QUERY``; the first
+       encode also initializes the tokenizer and kernels and is several
+       times slower than later ones
+    2. ``initialize`` the engine: load the documents and map the saved
+       indexes (building them if there are none)
+    3. Ask the kernel to read the mapped index files ahead, then run one
+       search, so the first real query doesn't fault index pages in from disk
+    
+    The chat page polls ``state`` and ``message`` instead of blocking in
+    ``initialize``. Questions are answered as soon as the engine is
+    initialized; step 3 only speeds up the first few.
+    
+    Attributes:
+        state (str): ``PENDING``, ``RUNNING``, ``READY`` or ``FAILED``
+        message (str): Latest progress message
+        error (Optional[str]): Why warm-up failed
+        timings (Dict[str, float]): Seconds taken by each finished step
+    """
+    PENDING = "pending"
+    RUNNING = "running"
+    READY = "ready"
+    FAILED = "failed"
+
+    def __init__(self, engine: 'JIITAdvancedChatbot'):
+        self.engine = engine
+        self.state = self.PENDING
+        self.message = "Waiting to start..."
+        self.error: Optional[str] = None
+        self.timings: Dict[str, float] = {}
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+        self._embedding: Optional[np.ndarray] = None
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since warm-up started, or that it took once finished."""
+        if self._started is None:
+            return 0.0
+        return (self._finished or time.monotonic()) - self._started
+
+    def start(self) -> bool:
+        """Start warming up in a daemon thread unless already started; returns whether this call started it."""
+        with self._lock:
+            if self._thread is not None:
+                return False
+            self.state, self._started = self.RUNNING, time.monotonic()
+            self._thread = threading.Thread(target=self._run, name="jiit-warmup", daemon=True)
+            self._thread.start()
+            return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until warm-up finishes (or ``timeout`` seconds pass); returns whether the engine is ready."""
+        self._done.wait(timeout)
+        return self.state == self.READY
+
+    def _run(self) -> None:
+        try:
+            self._step('model', "🧠 Loading the embedding model...", self._load_model)
+            self._step('indexes', "🔧 Loading documents and search indexes...", self._initialize)
+            self._step('pages', "📄 Reading search indexes into memory...", self._touch_indexes)
+            self.message, self.state = "✅ Ready", self.READY
         except Exception as e:
-            return f"❌ Error processing query: {str(e)}"
+            self.error = str(e)
+            self.message, self.state = f"❌ {e}", self.FAILED
+        finally:
+            self._finished = time.monotonic()
+            self._done.set()
+
+    def _step(self, name: str, message: str, fn: Any) -> None:
+        self.message = message
+        start = time.perf_counter()
+        fn()
+        self.timings[name] = time.perf_counter() - start
+
+    def _load_model(self) -> None:
+        self._embedding = self.engine.vector_store.encode_query(self.engine.config.WARMUP_QUERY)
+
+    def _initialize(self) -> None:
+        # Progress of a first-run scrape and build shows up on the chat page
+        def status(message: str) -> None:
+            self.message = message
+
+        if not self.engine.initialize(status_callback=status):
+            raise RuntimeError(self.engine.initialization_error or "Initialization failed")
+
+    def _touch_indexes(self) -> None:
+        config = self.engine.config
+        if config.INDEX_MMAP and hasattr(os, 'posix_fadvise'):
+            # Only the current generation is left in these directories
+            for directory in (self.engine.vector_store.config.FAISS_DIR, self.engine.keyword_search.config.BM25_DIR):
+                for path in directory.iterdir():
+                    if path.is_file():
+                        fd = os.open(path, os.O_RDONLY)
+                        try:
+                            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                        finally:
+                            os.close(fd)
+        hybrid_search = self.engine.hybrid_search
+        if hybrid_search is not None:
+            # Below the query cache, so no answer for the warm-up query is kept
+            hybrid_search._search(config.WARMUP_QUERY, config.FINAL_TOP_K, self._embedding)
 
 
 # ============================================================================
@@ -899,7 +4219,7 @@ class JIITAdvancedChatbot:
 # ============================================================================
 
 def display_typing_effect(text: str, placeholder, speed: int = 25) -> None:
-    """Display text with typing effect"""
+    """Display text with typing effect (for answers that are already complete, e.g. cached ones)"""
     displayed_text = ""
     words = re.findall(r'\S+|\s+', text)
     for word in words:
@@ -913,18 +4233,52 @@ def display_typing_effect(text: str, placeholder, speed: int = 25) -> None:
     placeholder.markdown(text)
 
 
+def display_stream(chunks: Iterable[str], placeholder, interval: float = 0.05) -> str:
+    """
+    Display text as it arrives and return all of it.
+    
+    Each redraw sends the whole text so far, so redraws are limited to one
+    every ``interval`` seconds rather than one per token.
+    """
+    text = ""
+    last_draw = 0.0
+    for chunk in chunks:
+        text += chunk
+        now = time.monotonic()
+        if now - last_draw >= interval:
+            placeholder.markdown(text + "▌")
+            last_draw = now
+    placeholder.markdown(text)
+    return text
+
+
 # ============================================================================
 # STREAMLIT UI - CLEANED (NO TOGGLE BUTTON)
 # ============================================================================
 
+@st.cache_resource(show_spinner=False)
+def get_engine() -> JIITAdvancedChatbot:
+    """
+    The chatbot engine shared by every session of this server process.
+    
+    The embedding model, indexes, caches and thread pool are loaded once
+    rather than per browser session; sessions keep only their chat history.
+    """
+    return JIITAdvancedChatbot()
+
+
+def start_warmup() -> EngineWarmup:
+    """Start warming up the shared engine in the background (once per process) and return its warm-up."""
+    engine = get_engine()
+    engine.warmup.start()
+    return engine.warmup
+
+
 def show() -> None:
     """Main Streamlit UI with sidebar always visible"""
+    engine = get_engine()
 
-    # Initialize session state
-    if 'initialization_complete' not in st.session_state:
-        st.session_state.initialization_complete = False
-    if 'advanced_chatbot' not in st.session_state:
-        st.session_state.advanced_chatbot = JIITAdvancedChatbot()
+    # Per-session state is only the chat history; the engine is shared
     if 'advanced_messages' not in st.session_state:
         st.session_state.advanced_messages = [{
             "role": "assistant",
@@ -1044,28 +4398,24 @@ def show() -> None:
             st.markdown("🔄")
         with col2:
             if st.button("Update Database", key="update_db_btn", type="tertiary",
-                         disabled=not st.session_state.initialization_complete):
-                with st.spinner("Updating database..."):
-                    success = st.session_state.advanced_chatbot.update_database(force_refresh=True)
-                    if success:
-                        st.success("✅ Database updated!")
-                        st.session_state.advanced_chatbot.initialize(force_rebuild=False)
-                    else:
-                        st.error("❌ Update failed")
+                         disabled=not engine.initialized or engine.refreshing):
+                st.session_state.advanced_refresh_started = engine.start_refresh()
                 st.rerun()
 
         col1, col2 = st.columns([1, 9])
         with col1:
             st.markdown("⚡")
         with col2:
-            if st.button("Force Rebuild", key="rebuild_db_btn", type="tertiary"):
-                st.session_state.initialization_complete = False
-                with st.spinner("Rebuilding database..."):
-                    st.session_state.advanced_chatbot.initialize(force_rebuild=True)
-                    st.session_state.initialization_complete = True
-                st.success("✅ Rebuild complete!")
+            if st.button("Force Rebuild", key="rebuild_db_btn", type="tertiary", disabled=engine.refreshing):
+                st.session_state.advanced_refresh_started = engine.start_refresh(force_rebuild=True)
                 st.rerun()
 
+        # Runs in the background; the chat keeps answering from the live index version meanwhile
+        if engine.refreshing:
+            st.caption(f"⏳ {engine.refresh_message}")
+        elif engine.refresh_result is not None:
+            st.caption(engine.refresh_message)
+
         col1, col2 = st.columns([1, 9])
         with col1:
             st.markdown("🗑️")
@@ -1089,17 +4439,20 @@ def show() -> None:
     st.markdown("<h2 style='text-align: center;'>🎓 JIIT AI Assistant</h2>",
                 unsafe_allow_html=True)
 
-    # Initialize System
-    if not st.session_state.initialization_complete:
-        with st.spinner("🚀 Initializing AI system... (2-3 minutes)"):
-            success = st.session_state.advanced_chatbot.initialize()
-            if success:
-                st.session_state.initialization_complete = True
-                st.rerun()
-            else:
-                st.error(f"❌ Initialization failed: {st.session_state.advanced_chatbot.initialization_error}")
-                st.info("💡 Click 'Force Rebuild' in the sidebar.")
-                st.stop()
+    # Initialize System: started in the background at server start; poll it rather than wait here
+    if not engine.initialized:
+        if engine.refreshing:
+            st.info(f"🔄 Rebuilding the knowledge base: {engine.refresh_message}")
+            time.sleep(engine.config.STATUS_POLL_INTERVAL)
+            st.rerun()
+        warmup = start_warmup()
+        if warmup.state == EngineWarmup.FAILED:
+            st.error(f"❌ Initialization failed: {engine.initialization_error or warmup.error}")
+            st.info("💡 Click 'Force Rebuild' in the sidebar.")
+            st.stop()
+        st.info(f"🚀 Warming up the AI system ({warmup.elapsed:.0f}s): {warmup.message}")
+        time.sleep(engine.config.STATUS_POLL_INTERVAL)
+        st.rerun()
 
     # Display Chat History
     for message in st.session_state.advanced_messages:
@@ -1149,18 +4502,34 @@ def show() -> None:
             st.session_state.advanced_messages[-1]["role"] == "user"):
 
         with st.chat_message("assistant"):
+            placeholder = st.empty()
+            # The spinner covers retrieval and the wait for the first words
             with st.spinner("🤔 Thinking..."):
-                response = st.session_state.advanced_chatbot.query(
+                stream = engine.query_stream(
                     st.session_state.advanced_messages[-1]["content"]
                 )
-                placeholder = st.empty()
+                chunks = iter(stream)
+                first = next(chunks, "")
+            if stream.cached:
+                response = stream.read()
                 display_typing_effect(response, placeholder, speed=20)
+            else:
+                response = display_stream(itertools.chain([first], chunks), placeholder,
+                                          engine.config.STREAM_RENDER_INTERVAL)
 
         st.session_state.advanced_messages.append({
             "role": "assistant",
             "content": response
         })
 
+    # Keep the sidebar's refresh progress current in the session that started it (other
+    # sessions see it on their next rerun); a click or a new question interrupts the wait
+    if st.session_state.get('advanced_refresh_started'):
+        if engine.refreshing:
+            time.sleep(engine.config.STATUS_POLL_INTERVAL)
+            st.rerun()
+        st.session_state.advanced_refresh_started = False
+
 
 # ============================================================================
 # MAIN ENTRY POINT
@@ -52,13 +52,14 @@ import plotly.graph_objects as go
 from textblob import TextBlob
 import random
 
-# Page configuration
-st.set_page_config(
-    page_title="JIIT Live Information Portal",
-    page_icon="🏫",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+# Page configuration, only when run standalone; inside app.py the app's page config applies
+if __name__ == "__main__":
+    st.set_page_config(
+        page_title="JIIT Live Information Portal",
+        page_icon="🏫",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
 
 # Custom CSS
 st.markdown("""
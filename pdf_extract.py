@@ -0,0 +1,65 @@
+"""
+PDF Text Extraction Workers
+===========================
+
+Process-pool entry points used by ``chatbot.PdfExtractor``.
+
+PyPDF2 text extraction is pure Python and CPU-bound, so running it on the
+crawl threads serializes the whole crawl behind the GIL. These functions run
+in separate worker processes instead. They live in their own module so that
+spawned workers only import PyPDF2, not Streamlit, FAISS or torch.
+
+Functions:
+----------
+- count_pages(): Number of pages in a PDF
+- extract_pages(): Text of a contiguous page range
+"""
+
+import io
+from typing import List, Tuple
+
+try:
+    import PyPDF2
+    PDF_AVAILABLE = True
+except Exception:
+    PDF_AVAILABLE = False
+
+
+def count_pages(content: bytes) -> int:
+    """
+    Count the pages of a PDF.
+
+    Args:
+        content (bytes): Raw PDF file
+
+    Returns:
+        int: Page count
+    """
+    return len(PyPDF2.PdfReader(io.BytesIO(content)).pages)
+
+
+def extract_pages(content: bytes, start: int, stop: int) -> List[Tuple[int, str]]:
+    """
+    Extract text from pages ``start`` (inclusive) to ``stop`` (exclusive).
+
+    Pages whose text cannot be extracted are skipped rather than failing the
+    whole range.
+
+    Args:
+        content (bytes): Raw PDF file
+        start (int): First page number (0-based)
+        stop (int): Page number to stop before
+
+    Returns:
+        List[Tuple[int, str]]: ``(page_number, text)`` for non-empty pages
+    """
+    reader = PyPDF2.PdfReader(io.BytesIO(content))
+    pages: List[Tuple[int, str]] = []
+    for page_number in range(start, min(stop, len(reader.pages))):
+        try:
+            text = reader.pages[page_number].extract_text()
+        except Exception:
+            continue
+        if text:
+            pages.append((page_number, text))
+    return pages
@@ -0,0 +1,228 @@
+"""
+Text Tokenizer
+==============
+
+The one tokenizer behind keyword indexing, keyword queries, excerpt
+selection and near-duplicate detection in ``chatbot``, so that all of them
+agree on what a word is.
+
+A token is a run of word characters in the lowercased text. Keyword search
+keeps tokens of at least three characters, optionally drops English
+stopwords and reduces plurals with an S-stemmer. Normalized tokens are
+memoized per distinct token, which also interns them: every occurrence of
+a term refers to the same string object.
+
+``TokenInterner`` goes one step further and replaces terms by dense
+integer ids, so a tokenized corpus is a few flat int arrays instead of
+Python strings per document.
+
+Classes:
+--------
+- Tokenizer: Compiled-regex tokenizer with optional stopwords and stemming
+- TokenInterner: Token -> integer id table, in first-seen order
+
+Functions:
+----------
+- split_words(): Every lowercased word of a text, unfiltered
+- s_stem(): Harman's S-stemmer (plural reduction)
+"""
+
+import re
+from array import array
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import numpy as np
+
+WORD_PATTERN = re.compile(r'\w+')
+
+# Common English function words; only those of at least three letters matter to the default tokenizer
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further had has have
+having he her here hers herself him himself his how i if in into is it its itself just me more most my
+myself no nor not now of off on once only or other our ours ourselves out over own same she should so
+some such than that the their theirs them themselves then there these they this those through to too
+under until up very was we were what when where which while who whom why will with would you your
+yours yourself yourselves
+""".split())
+
+
+def split_words(text: str) -> List[str]:
+    """
+    Split text into lowercased words, keeping short words and stopwords.
+
+    Args:
+        text (str): Any text
+
+    Returns:
+        List[str]: Words in text order
+    """
+    return WORD_PATTERN.findall(text.lower())
+
+
+def s_stem(word: str) -> str:
+    """
+    Reduce an English plural to its singular (Harman's S-stemmer).
+
+    Only the first matching rule applies: "-ies" -> "-y" (not after "e"
+    or "a"), "-es" -> "-e" (not after "a", "e" or "o"), "-s" -> "" (not
+    after "u" or "s"). Conservative by design: it never merges unrelated
+    words the way aggressive stemmers can.
+
+    Args:
+        word (str): Lowercased word
+
+    Returns:
+        str: Stemmed word
+    """
+    if word.endswith("ies") and not word.endswith(("eies", "aies")):
+        return word[:-3] + "y"
+    if word.endswith("es") and not word.endswith(("aes", "ees", "oes")):
+        return word[:-1]
+    if word.endswith("s") and not word.endswith(("us", "ss")):
+        return word[:-1]
+    return word
+
+
+class Tokenizer:
+    """
+    Compiled-regex tokenizer for keyword search.
+
+    Attributes:
+        min_length (int): Shortest token kept
+        stopwords (bool): Drop ``STOPWORDS``
+        stem (bool): Apply ``s_stem``
+        signature (str): Identifies the settings; an index built with one
+            signature must be queried with the same one
+    """
+    # Memoized normalizations kept before the memo is reset, bounding its memory
+    MAX_CACHED_TOKENS = 1_000_000
+
+    def __init__(self, min_length: int = 3, stopwords: bool = False, stem: bool = False):
+        self.min_length = min_length
+        self.stopwords = stopwords
+        self.stem = stem
+        # Equivalent to matching \w+ and dropping short tokens, without building the dropped ones
+        self.pattern = re.compile(rf'\w{{{min_length},}}') if min_length > 1 else WORD_PATTERN
+        self.signature = f"w{min_length}" + ("+stop" if stopwords else "") + ("+stem" if stem else "")
+        self._normalized: Dict[str, str] = {}
+
+    def tokenize(self, text: str) -> List[str]:
+        """
+        Tokenize one text.
+
+        Args:
+            text (str): Document or query text
+
+        Returns:
+            List[str]: Tokens in text order, repeats kept
+        """
+        tokens = self.pattern.findall(text.lower())
+        if not (self.stopwords or self.stem):
+            return tokens
+        normalized = self._normalized
+        terms = [normalized[token] if token in normalized else self._normalize(token) for token in tokens]
+        return [term for term in terms if term]
+
+    def tokenize_spans(self, text: str) -> Tuple[List[str], np.ndarray]:
+        """
+        Tokenize one text and report where each token came from.
+
+        Args:
+            text (str): Document text
+
+        Returns:
+            Tuple[List[str], np.ndarray]: Tokens as ``tokenize`` returns them,
+            and an int32 ``(start, end)`` character span per token
+        """
+        tokens: List[str] = []
+        spans: List[Tuple[int, int]] = []
+        normalize = self.stopwords or self.stem
+        normalized = self._normalized
+        for match in self.pattern.finditer(text.lower()):
+            token = match.group()
+            if normalize:
+                token = normalized[token] if token in normalized else self._normalize(token)
+                if not token:
+                    continue
+            tokens.append(token)
+            spans.append(match.span())
+        return tokens, np.array(spans, dtype=np.int32).reshape(-1, 2)
+
+    def tokenize_batch(self, texts: Iterable[str]) -> Iterator[List[str]]:
+        """
+        Tokenize many texts with one compiled pattern and a shared normalization memo.
+
+        Texts are tokenized lazily, so a whole corpus never has to be held
+        as token lists at once.
+
+        Args:
+            texts (Iterable[str]): Texts to tokenize
+
+        Yields:
+            List[str]: Tokens of each text, in order
+        """
+        tokenize = self.tokenize
+        for text in texts:
+            yield tokenize(text)
+
+    def _normalize(self, token: str) -> str:
+        """Stopword-filtered, stemmed form of ``token`` ('' if dropped), memoized."""
+        if len(self._normalized) >= self.MAX_CACHED_TOKENS:
+            self._normalized = {}
+        term = token
+        if self.stopwords and term in STOPWORDS:
+            term = ''
+        elif self.stem:
+            term = s_stem(term)
+        self._normalized[token] = term
+        return term
+
+
+class TokenInterner:
+    """
+    Token -> dense integer id table; ids are assigned in first-seen order.
+
+    Attributes:
+        ids (Dict[str, int]): Token -> id
+    """
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+
+    @property
+    def tokens(self) -> List[str]:
+        """Tokens in id order."""
+        return list(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def encode(self, tokens: List[str]) -> np.ndarray:
+        """Ids of ``tokens``, adding unseen ones."""
+        ids = self.ids
+        return np.array([ids[token] if token in ids else ids.setdefault(token, len(ids)) for token in tokens],
+                        dtype=np.int32)
+
+    def encode_counts(self, term_counts: Iterable[Dict[str, int]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Encode bags of words (term -> frequency per document) as flat id arrays.
+
+        Args:
+            term_counts (Iterable[Dict[str, int]]): One dict per document; consumed lazily
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray, np.ndarray]: Offsets (document ``i``
+            is entries ``offsets[i]:offsets[i + 1]``), the int32 term id and the
+            int64 frequency of each entry, in each dict's iteration order
+        """
+        ids = self.ids
+        terms = array('i')
+        freqs = array('q')
+        offsets = array('q', [0])
+        for counts in term_counts:
+            terms.extend([ids[term] if term in ids else ids.setdefault(term, len(ids)) for term in counts])
+            freqs.extend(counts.values())
+            offsets.append(len(terms))
+        return (np.frombuffer(offsets, dtype=np.int64), np.frombuffer(terms, dtype=np.int32),
+                np.frombuffer(freqs, dtype=np.int64))